@@ -1,16 +1,35 @@
 import sys
+import time
+
+# Reference point for the startup timings, taken before the heavy imports
+STARTUP_T0 = time.perf_counter()
+
 import json
+import sqlite3
 import requests
 import webbrowser
 import subprocess
-from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QTableWidget, QTableWidgetItem,
-                             QCheckBox, QPushButton, QVBoxLayout, QHBoxLayout, QHeaderView,
+from PyQt5.QtWidgets import (QApplication, QMainWindow, QWidget, QTableView, QPushButton, QVBoxLayout, QHBoxLayout, QHeaderView,
                              QMessageBox, QAbstractItemView, QLabel, QLineEdit, QDialog,
                              QDialogButtonBox, QFormLayout, QComboBox, QProgressBar, QTextEdit,
-                             QSplitter, QTabWidget)
-from PyQt5.QtCore import Qt, QTimer, QThread, pyqtSignal
+                             QPlainTextEdit, QSplitter, QTabWidget, QCheckBox, QTableWidget, QTableWidgetItem)
+from PyQt5.QtCore import (Qt, QAbstractTableModel, QEvent, QModelIndex, QObject, QTimer, QThread,
+                          pyqtSignal)
 from PyQt5.QtGui import QFont, QColor
 
+from kamatera import (CONFIG_FILE, DEFAULT_BACKGROUND_CONCURRENCY, DEFAULT_BASE_URL, DEFAULT_CONVERGE_TIMEOUT,
+                      DEFAULT_DETAIL_CONCURRENCY, DEFAULT_LISTING_CHUNK, DEFAULT_LOG_BUFFER_SIZE,
+                      DEFAULT_LOG_FILE_BACKUPS, DEFAULT_LOG_FILE_MAX_BYTES, DEFAULT_MAX_IN_FLIGHT,
+                      DEFAULT_METRICS_TEXTFILE_INTERVAL, DEFAULT_POWER_CONCURRENCY, DEFAULT_REFRESH_MAX_INTERVAL,
+                      DEFAULT_REFRESH_MIN_INTERVAL, DEFAULT_WORKFLOW_CONCURRENCY, ActivityLog,
+                      ConvergenceSummary, InventoryCache, NetworkClassifier, PowerSummary, PriorityDetailFetcher,
+                      RefreshSchedule, ServerStore, account_fingerprint, build_classifier, build_client, build_fleet,
+                      fetch_server_details, network_is, power_is, read_config, refresh_inventory, run_network_switch,
+                      server_fingerprint, set_power_many, stream_inventory, wait_for_servers, write_config)
+from kamatera.listing import LISTED
+from kamatera.refresh import is_transitional
+from kamatera.workflow import DONE, FAILED, FINAL_STAGES, NEEDS_MANUAL, POWERING_OFF, POWERING_ON
+
 class LoginDialog(QDialog):
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -62,14 +81,15 @@ class NetworkWorkflowDialog(QDialog):
         auto_layout = QVBoxLayout(auto_tab)
         
         auto_info = QLabel("""
-<h3>🔄 Automated Power Management + Manual Network Switch</h3>
-<p>This workflow automates the tedious parts and guides you through the network change:</p>
+<h3>🔄 Per-Server Power Management + Network Switch</h3>
+<p>Each server moves through its own pipeline, without waiting for the others:</p>
 <ol>
-<li><b>Automatic:</b> Power off all selected servers</li>
-<li><b>Manual:</b> Change network in Kamatera console (we'll open it for you)</li>
-<li><b>Automatic:</b> Power on all servers</li>
-<li><b>Automatic:</b> Verify network changes</li>
+<li><b>Automatic:</b> Power off the server</li>
+<li><b>Automatic:</b> Change its network via the API (falls back to the Kamatera console)</li>
+<li><b>Automatic:</b> Power it back on</li>
+<li><b>Automatic:</b> Verify the network change</li>
 </ol>
+<p>Progress for every server is shown in the Workflow column.</p>
         """)
         auto_info.setWordWrap(True)
         auto_layout.addWidget(auto_info)
@@ -77,7 +97,7 @@ class NetworkWorkflowDialog(QDialog):
         # Server list
         auto_layout.addWidget(QLabel("Selected Servers:"))
         server_text = QTextEdit()
-        server_list = "\n".join([f"• {s['name']} ({s['id']}) - Current: {s.get('network', 'Unknown')}" for s in servers])
+        server_list = "\n".join([f"• {s.name} ({s.id}) - Current: {s.network or 'Unknown'}" for s in servers])
         server_text.setPlainText(server_list)
         server_text.setMaximumHeight(100)
         auto_layout.addWidget(server_text)
@@ -88,7 +108,7 @@ class NetworkWorkflowDialog(QDialog):
         self.network_combo.addItems(["Public", "Private"])
         
         # Auto-detect best option
-        current_networks = [s.get('network', '').lower() for s in servers]
+        current_networks = [(s.network or '').lower() for s in servers]
         if 'private' in current_networks:
             self.network_combo.setCurrentText("Public")
         else:
@@ -106,8 +126,32 @@ class NetworkWorkflowDialog(QDialog):
         
         tabs.addTab(auto_tab, "🔄 Smart Workflow")
         
-        # Tab 2: Manual Instructions
+        # Tabs 2 and 3 are rarely opened, so their contents are built on first view
         manual_tab = QWidget()
+        tabs.addTab(manual_tab, "📋 Manual Instructions")
+        cli_tab = QWidget()
+        tabs.addTab(cli_tab, "⚡ CLI Method")
+        self.tab_builders = {tabs.indexOf(manual_tab): self.build_manual_tab,
+                             tabs.indexOf(cli_tab): self.build_cli_tab}
+        tabs.currentChanged.connect(self.build_tab)
+        self.tabs = tabs
+        
+        layout.addWidget(tabs)
+        
+        # Main dialog buttons
+        buttons = QDialogButtonBox(QDialogButtonBox.Close)
+        buttons.rejected.connect(self.reject)
+        layout.addWidget(buttons)
+        
+        self.workflow_active = False
+    
+    def build_tab(self, index):
+        builder = self.tab_builders.pop(index, None)
+        if builder is not None:
+            builder(self.tabs.widget(index))
+    
+    def build_manual_tab(self, manual_tab):
+        """Tab 2: Manual Instructions"""
         manual_layout = QVBoxLayout(manual_tab)
         
         manual_info = QLabel("<h3>📋 Complete Manual Instructions</h3>")
@@ -123,11 +167,9 @@ class NetworkWorkflowDialog(QDialog):
         open_console_btn.clicked.connect(self.open_console)
         manual_buttons.addWidget(open_console_btn)
         manual_layout.addLayout(manual_buttons)
-        
-        tabs.addTab(manual_tab, "📋 Manual Instructions")
-        
-        # Tab 3: CLI Method (if available)
-        cli_tab = QWidget()
+    
+    def build_cli_tab(self, cli_tab):
+        """Tab 3: CLI Method (if available)"""
         cli_layout = QVBoxLayout(cli_tab)
         
         cli_info = QLabel("""
@@ -146,20 +188,9 @@ class NetworkWorkflowDialog(QDialog):
         try_cli_btn.clicked.connect(self.check_cli)
         cli_buttons.addWidget(try_cli_btn)
         cli_layout.addLayout(cli_buttons)
-        
-        tabs.addTab(cli_tab, "⚡ CLI Method")
-        
-        layout.addWidget(tabs)
-        
-        # Main dialog buttons
-        buttons = QDialogButtonBox(QDialogButtonBox.Close)
-        buttons.rejected.connect(self.reject)
-        layout.addWidget(buttons)
-        
-        self.workflow_active = False
     
     def get_manual_instructions(self):
-        target_network = "Public" if any(s.get('network', '').lower() == 'private' for s in self.servers) else "Private"
+        target_network = "Public" if any((s.network or '').lower() == 'private' for s in self.servers) else "Private"
         
         instructions = f"""COMPLETE MANUAL NETWORK SWITCHING GUIDE
 
@@ -177,7 +208,7 @@ STEP-BY-STEP PROCESS:
 """
         
         for server in self.servers:
-            instructions += f"   • {server['name']} ({server['id']})\n"
+            instructions += f"   • {server.name} ({server.id})\n"
         
         instructions += f"""
 3. NETWORK CONFIGURATION IN CONSOLE
@@ -219,7 +250,7 @@ TROUBLESHOOTING:
         return instructions
     
     def get_cli_commands(self):
-        target_network = "public" if any(s.get('network', '').lower() == 'private' for s in self.servers) else "private"
+        target_network = "public" if any((s.network or '').lower() == 'private' for s in self.servers) else "private"
         
         commands = f"""KAMATERA CLI COMMANDS (if CLI tools are available)
 
@@ -234,31 +265,31 @@ export KAMATERA_API_SECRET="your_api_secret"
 """
         
         for server in self.servers:
-            commands += f'kamatera server power --server-id "{server["id"]}" --power off\n'
+            commands += f'kamatera server power --server-id "{server.id}" --power off\n'
         
         commands += f"""
 # Wait for servers to shut down (check status)
 """
         for server in self.servers:
-            commands += f'kamatera server info --server-id "{server["id"]}"\n'
+            commands += f'kamatera server info --server-id "{server.id}"\n'
             
         commands += f"""
 # Modify network (if supported by CLI)
 """
         for server in self.servers:
-            commands += f'# kamatera server modify --server-id "{server["id"]}" --network {target_network}\n'
+            commands += f'# kamatera server modify --server-id "{server.id}" --network {target_network}\n'
             
         commands += f"""
 # Power on servers
 """
         for server in self.servers:
-            commands += f'kamatera server power --server-id "{server["id"]}" --power on\n'
+            commands += f'kamatera server power --server-id "{server.id}" --power on\n'
             
         commands += f"""
 # Verify changes
 """
         for server in self.servers:
-            commands += f'kamatera server info --server-id "{server["id"]}"\n'
+            commands += f'kamatera server info --server-id "{server.id}"\n'
             
         commands += """
 NOTE: CLI network modification commands may not be available.
@@ -275,8 +306,8 @@ If 'kamatera server modify --network' fails, use the manual console method.
             self, "Start Automated Workflow", 
             f"This will:\n"
             f"1. Power OFF all {len(self.servers)} selected servers\n"
-            f"2. Open Kamatera console for manual network changes\n"
-            f"3. Guide you through powering servers back ON\n\n"
+            f"2. Switch each one to the new network as soon as it is off\n"
+            f"3. Power each one back ON and verify it\n\n"
             f"Continue?",
             QMessageBox.Yes | QMessageBox.No
         )
@@ -314,7 +345,560 @@ If 'kamatera server modify --network' fails, use the manual console method.
     def get_target_network(self):
         return self.network_combo.currentText().lower()
 
+class ApiJob(QThread):
+    """Runs one unit of API work on a worker thread and reports back through signals"""
+    progress = pyqtSignal(int, int)
+    status = pyqtSignal(str)
+    result = pyqtSignal(object)
+    error = pyqtSignal(str)
+    completed = pyqtSignal(object)
+    
+    def __init__(self, task, *args, parent=None):
+        super().__init__(parent)
+        self.task = task
+        self.args = args
+        self.cancelled = False
+    
+    def cancel(self):
+        self.cancelled = True
+    
+    def run(self):
+        value = None
+        try:
+            value = self.task(self, *self.args)
+        except requests.exceptions.RequestException as e:
+            self.error.emit(f"API Error: {str(e)}")
+        except Exception as e:
+            self.error.emit(f"Unexpected error: {str(e)}")
+        self.completed.emit(value)
+
+
+class JobEngine(QObject):
+    """Starts ApiJobs, keeps them alive while running and reports when all are done"""
+    busy_changed = pyqtSignal(bool)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.jobs = set()
+    
+    @property
+    def busy(self):
+        return bool(self.jobs)
+    
+    def submit(self, task, *args, on_result=None, on_completed=None):
+        job = ApiJob(task, *args, parent=self)
+        if on_result:
+            job.result.connect(on_result)
+        if on_completed:
+            job.completed.connect(on_completed)
+        job.finished.connect(lambda: self._job_finished(job))
+        
+        was_busy = self.busy
+        self.jobs.add(job)
+        if not was_busy:
+            self.busy_changed.emit(True)
+        return job
+    
+    def _job_finished(self, job):
+        self.jobs.discard(job)
+        job.deleteLater()
+        if not self.jobs:
+            self.busy_changed.emit(False)
+    
+    def shutdown(self, timeout_ms=5000):
+        """Ask every running job to stop and wait for the worker threads to exit"""
+        for job in list(self.jobs):
+            job.cancel()
+        for job in list(self.jobs):
+            job.wait(timeout_ms)
+
+
+class AsyncBridge(QThread):
+    """Runs an asyncio event loop on its own thread and hands results to the Qt event loop
+    
+    asyncio is imported on first use, so a GUI that never turns on async_client does not pay for it.
+    """
+    delivered = pyqtSignal(object, object)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        import asyncio
+        self.loop = asyncio.new_event_loop()
+        # The bridge lives on the GUI thread, so this connection is queued from the loop thread
+        self.delivered.connect(self._deliver)
+    
+    def run(self):
+        import asyncio
+        asyncio.set_event_loop(self.loop)
+        self.loop.run_forever()
+        self.loop.close()
+    
+    def _deliver(self, callback, value):
+        callback(value)
+    
+    def post(self, callback, value):
+        """Call callback(value) on the GUI thread; safe to use from coroutines"""
+        self.delivered.emit(callback, value)
+    
+    def submit(self, coro, on_completed=None, on_error=None):
+        """Schedule a coroutine on the loop; callbacks run on the GUI thread"""
+        import asyncio
+        future = asyncio.run_coroutine_threadsafe(coro, self.loop)
+        
+        def done(f):
+            if f.cancelled():
+                return
+            error = f.exception()
+            if error is not None:
+                if on_error:
+                    self.post(on_error, error)
+            elif on_completed:
+                self.post(on_completed, f.result())
+        
+        future.add_done_callback(done)
+        return future
+    
+    def shutdown(self, cleanup=None, timeout=5.0):
+        """Run an optional cleanup coroutine, then stop the loop and join the thread"""
+        if self.isRunning():
+            if cleanup is not None:
+                import asyncio
+                try:
+                    asyncio.run_coroutine_threadsafe(cleanup, self.loop).result(timeout)
+                except Exception:
+                    pass
+            self.loop.call_soon_threadsafe(self.loop.stop)
+            self.wait()
+
+
+def inventory_task(job, client, concurrency, chunk_size, details):
+    """Worker-thread task: stream the listing chunk by chunk, fetching details as rows arrive
+
+    Emits (LISTED, records) for every chunk and (DETAIL, (server_id, detail))
+    for every detail, and returns all listed records once both are done.
+    """
+    listed = []
+    expected = done = 0
+    # A load is an explicit refresh: skip cached details but refill the cache
+    for kind, payload in stream_inventory(client, concurrency, chunk_size, use_cache=False, details=details,
+                                          stop=lambda: job.cancelled):
+        if job.cancelled:
+            # A partial listing must not be applied: it would drop the rows not read yet
+            return None
+        if kind == LISTED:
+            listed.extend(payload)
+            expected += sum(1 for server in payload if server.id)
+            job.result.emit((kind, payload))
+            continue
+        server_id, detailed_info, error = payload
+        if error is not None:
+            job.error.emit(f"API Error: {str(error)}")
+        job.result.emit((kind, (server_id, detailed_info)))
+        done += 1
+        job.progress.emit(done, expected)
+    return listed
+
+
+def detail_feed_task(job, fetcher):
+    """Worker-thread task: hand every detail the fetcher completes to the GUI until cancelled"""
+    for server_id, detailed_info, error in fetcher.results(stop=lambda: job.cancelled):
+        if error is not None:
+            job.error.emit(f"API Error: {str(error)}")
+        job.result.emit((server_id, detailed_info))
+
+
+def details_task(job, client, server_ids, concurrency, use_cache=True):
+    """Worker-thread task: fetch the details of servers the table has not loaded yet"""
+    done = 0
+    for server_id, detailed_info, error in fetch_server_details(client, server_ids, concurrency, use_cache):
+        if job.cancelled:
+            break
+        if error is not None:
+            job.error.emit(f"API Error: {str(error)}")
+        job.result.emit((server_id, detailed_info))
+        done += 1
+        job.progress.emit(done, len(server_ids))
+    return done
+
+
+def refresh_task(job, client, fingerprints, concurrency, details):
+    """Worker-thread task: poll the listing and fetch details only for servers that changed
+
+    Emits (LISTED, (records, changed_ids)) and (DETAIL, (server_id, detail))
+    like inventory_task, and returns (changed count, whether any server is
+    in a transitional state). details=False leaves the details to the caller.
+    """
+    changed = []
+    transitional = False
+    for kind, payload in refresh_inventory(client, fingerprints, concurrency, details, stop=lambda: job.cancelled):
+        if job.cancelled:
+            return None
+        if kind == LISTED:
+            servers, changed = payload
+            transitional = any(is_transitional(server) for server in servers)
+            job.result.emit((kind, payload))
+            continue
+        server_id, detailed_info, error = payload
+        if error is not None:
+            job.error.emit(f"API Error: {str(error)}")
+        job.result.emit((kind, (server_id, detailed_info)))
+    return len(changed), transitional
+
+
+def power_task(job, client, servers, action, label, concurrency):
+    """Worker-thread task: send a power action to every server on a bounded pool"""
+    by_id = {server.id: server for server in servers}
+    summary = PowerSummary(action, len(servers))
+    job.status.emit(f"{label}: {len(servers)} servers")
+    for server_id, result, error in set_power_many(client, by_id, action, concurrency):
+        if job.cancelled:
+            break
+        if error is not None:
+            job.error.emit(f"API Error: {str(error)}")
+        success = summary.record(server_id, result, error)
+        job.result.emit((by_id[server_id], success))
+        job.progress.emit(summary.done, len(servers))
+    return summary
+
+
+def converge_task(job, client, servers, predicate, label, timeout, concurrency):
+    """Worker-thread task: poll servers until predicate holds for each, or timeout"""
+    by_id = {server.id: server for server in servers}
+    summary = ConvergenceSummary(len(servers))
+    job.status.emit(f"{label}: {len(servers)} servers")
+    for server_id, converged, elapsed, detail in wait_for_servers(
+            client, by_id, predicate, timeout, concurrency, stop=lambda: job.cancelled):
+        if job.cancelled:
+            break
+        summary.record(server_id, converged, elapsed)
+        job.result.emit((by_id[server_id], converged, elapsed))
+        job.progress.emit(summary.done, len(servers))
+    return summary
+
+
+def workflow_task(job, client, servers, target_network, start, concurrency, timeout, verify):
+    """Worker-thread task: run each server through its own network switch pipeline"""
+    by_id = {server.id: server for server in servers}
+    counts = {}
+    for server_id, stage, info in run_network_switch(client, by_id, target_network, concurrency, start,
+                                                     verify, timeout, stop=lambda: job.cancelled):
+        job.result.emit((by_id[server_id], stage, info))
+        if stage in FINAL_STAGES:
+            counts[stage] = counts.get(stage, 0) + 1
+            job.progress.emit(sum(counts.values()), len(servers))
+    return counts
+
+
+def server_key(index, server):
+    """Stable table key for a server; servers without an id are keyed by position"""
+    return server.id or f"N/A#{index}"
+
+
+def keep_details(server, previous):
+    """Keep showing the last known details of a relisted server until the fresh ones arrive"""
+    if not server.id:
+        server.network = 'N/A'
+        server.ip = 'N/A'
+    elif previous is not None and previous.ip is not None and server.ip is None:
+        server.network = previous.network
+        server.ip = previous.ip
+
+
+# Shared brushes so painting thousands of rows does not allocate colors
+RUNNING_COLOR = QColor(220, 255, 220)
+STOPPED_COLOR = QColor(255, 220, 220)
+PENDING_COLOR = QColor(255, 255, 200)
+PUBLIC_COLOR = QColor(220, 220, 255)
+PRIVATE_COLOR = QColor(255, 220, 255)
+STALE_TEXT_COLOR = QColor(140, 140, 140)
+
+# The workflow log view is updated at most this often, however fast messages arrive
+LOG_FLUSH_INTERVAL_MS = 100
+# Rows above and below the viewport whose details are fetched ahead of scrolling
+DEFAULT_DETAIL_PREFETCH_ROWS = 20
+# Scrolling and resizing settle for this long before the wanted details are updated
+VIEWPORT_SETTLE_MS = 50
+# Details that arrive after a load are written to the inventory snapshot at most this often
+INVENTORY_SAVE_INTERVAL_MS = 5000
+
+METRICS_HEADERS = ["Method", "Endpoint", "Requests", "Deduplicated", "Failed", "Status codes", "Errors",
+                   "p50 ms", "p95 ms", "p99 ms"]
+
+
+def status_color(status):
+    status = status.lower()
+    if 'run' in status or 'on' in status:
+        return RUNNING_COLOR
+    elif 'stop' in status or 'off' in status:
+        return STOPPED_COLOR
+    elif 'pend' in status:
+        return PENDING_COLOR
+    return None
+
+
+def power_color(power):
+    power = power.lower()
+    if 'on' in power:
+        return RUNNING_COLOR
+    elif 'off' in power:
+        return STOPPED_COLOR
+    return None
+
+
+def network_color(network_type):
+    if network_type.lower() == 'public':
+        return PUBLIC_COLOR
+    elif network_type.lower() == 'private':
+        return PRIVATE_COLOR
+    return None
+
+
+def stage_color(stage):
+    if not stage:
+        return None
+    elif stage == DONE:
+        return RUNNING_COLOR
+    elif stage in FINAL_STAGES:
+        return STOPPED_COLOR
+    return PENDING_COLOR
+
+
+class ServerTableModel(QAbstractTableModel):
+    """Table model holding the server inventory once; the view only asks for visible cells"""
+    HEADERS = ["Select", "ID", "Account", "Name", "Status", "IP", "Power", "Network", "Workflow"]
+    (SELECT_COLUMN, ID_COLUMN, ACCOUNT_COLUMN, NAME_COLUMN, STATUS_COLUMN, IP_COLUMN, POWER_COLUMN, NETWORK_COLUMN,
+     WORKFLOW_COLUMN) = range(9)
+    
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.store = ServerStore()
+        # Latest workflow stage per server id
+        self.stages = {}
+        # Server id -> fetched_at for rows shown from the on-disk cache until fresh details arrive
+        self.stale = {}
+    
+    @property
+    def servers(self):
+        return self.store.servers
+    
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.store)
+    
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.HEADERS)
+    
+    def headerData(self, section, orientation, role=Qt.DisplayRole):
+        if role == Qt.DisplayRole and orientation == Qt.Horizontal:
+            return self.HEADERS[section]
+        return super().headerData(section, orientation, role)
+    
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.NoItemFlags
+        flags = Qt.ItemIsEnabled | Qt.ItemIsSelectable
+        if index.column() == self.SELECT_COLUMN:
+            flags |= Qt.ItemIsUserCheckable
+        return flags
+    
+    def display_value(self, server, column):
+        if column == self.ID_COLUMN:
+            return str(server.id or 'N/A')
+        elif column == self.ACCOUNT_COLUMN:
+            return server.account or ''
+        elif column == self.NAME_COLUMN:
+            return server.name
+        elif column == self.STATUS_COLUMN:
+            return server.status
+        elif column == self.IP_COLUMN:
+            return server.ip or 'Loading...'
+        elif column == self.POWER_COLUMN:
+            return server.power
+        elif column == self.NETWORK_COLUMN:
+            return server.network or 'Loading...'
+        elif column == self.WORKFLOW_COLUMN:
+            return self.stages.get(server.id, '')
+        return None
+    
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        
+        if column == self.SELECT_COLUMN:
+            if role == Qt.CheckStateRole:
+                return Qt.Checked if self.store.is_selected(self.store.keys[row]) else Qt.Unchecked
+            return None
+        
+        if role == Qt.DisplayRole:
+            return self.display_value(self.store.servers[row], column)
+        elif role == Qt.BackgroundRole:
+            # Status, power and network colors come straight from the row data
+            value = self.display_value(self.store.servers[row], column)
+            if column == self.STATUS_COLUMN:
+                return status_color(value)
+            elif column == self.POWER_COLUMN:
+                return power_color(value)
+            elif column == self.NETWORK_COLUMN:
+                return network_color(value)
+            elif column == self.WORKFLOW_COLUMN:
+                return stage_color(value)
+        elif role == Qt.ForegroundRole:
+            if self.store.keys[row] in self.stale:
+                return STALE_TEXT_COLOR
+        elif role == Qt.ToolTipRole:
+            fetched_at = self.stale.get(self.store.keys[row])
+            if fetched_at is not None:
+                return f"Cached {time.strftime('%Y-%m-%d %H:%M:%S', time.localtime(fetched_at))}, refreshing..."
+        return None
+    
+    def setData(self, index, value, role=Qt.EditRole):
+        if role != Qt.CheckStateRole or index.column() != self.SELECT_COLUMN:
+            return False
+        self.store.set_selected(self.store.keys[index.row()], value == Qt.Checked)
+        self.dataChanged.emit(index, index, [Qt.CheckStateRole])
+        return True
+    
+    def set_all_checked(self, checked):
+        """Check or uncheck every row with a single change notification"""
+        if checked:
+            self.store.select_all()
+        else:
+            self.store.clear_selection()
+        if len(self.store):
+            self.dataChanged.emit(self.index(0, self.SELECT_COLUMN),
+                                  self.index(len(self.store) - 1, self.SELECT_COLUMN), [Qt.CheckStateRole])
+    
+    def checked_servers(self):
+        return self.store.selected_servers()
+    
+    def row_of(self, key):
+        return self.store.row_of(key)
+    
+    def apply_inventory(self, servers):
+        """Diff the new inventory against the model by server id
+
+        Only rows that appeared or disappeared are inserted or removed and only
+        rows whose values changed are repainted, so check state survives.
+        """
+        store = self.store
+        new_keys = [server_key(i, server) for i, server in enumerate(servers)]
+        new_key_set = set(new_keys)
+        previous = dict(store.by_key)
+        for key, server in zip(new_keys, servers):
+            keep_details(server, previous.get(key))
+        
+        # Drop rows for servers that disappeared, bottom-up in contiguous runs
+        row = len(store) - 1
+        while row >= 0:
+            if store.keys[row] in new_key_set:
+                row -= 1
+                continue
+            last = row
+            while row >= 0 and store.keys[row] not in new_key_set:
+                row -= 1
+            self.beginRemoveRows(QModelIndex(), row + 1, last)
+            store.remove_rows(row + 1, last)
+            self.endRemoveRows()
+        
+        # The API reordered surviving servers: rearrange them without resetting the view
+        surviving = [key for key in new_keys if key in previous]
+        if surviving != store.keys:
+            self.layoutAboutToBeChanged.emit()
+            old_rows = {key: row for row, key in enumerate(store.keys)}
+            store.reorder(surviving)
+            new_rows = {old_rows[key]: new for new, key in enumerate(surviving)}
+            persistent = self.persistentIndexList()
+            self.changePersistentIndexList(
+                persistent, [self.index(new_rows[index.row()], index.column()) for index in persistent])
+            self.layoutChanged.emit()
+        
+        # Insert servers that appeared, in contiguous runs at their final position
+        row = 0
+        while row < len(new_keys):
+            if row < len(store) and store.keys[row] == new_keys[row]:
+                row += 1
+                continue
+            first = row
+            while row < len(new_keys) and new_keys[row] not in previous:
+                row += 1
+            self.beginInsertRows(QModelIndex(), first, row - 1)
+            store.insert_rows(first, new_keys[first:row], servers[first:row])
+            self.endInsertRows()
+        
+        # Swap in the fresh records and repaint only the rows whose values changed
+        columns = range(self.ID_COLUMN, len(self.HEADERS))
+        for row, server in enumerate(servers):
+            old = store.servers[row]
+            if old is server:
+                continue
+            store.replace(row, server)
+            if any(self.display_value(old, column) != self.display_value(server, column) for column in columns):
+                self.dataChanged.emit(self.index(row, self.ID_COLUMN), self.index(row, len(self.HEADERS) - 1))
+        
+        store.reindex()
+        if self.stale:
+            # Servers that are gone no longer wait for fresh details
+            self.stale = {key: fetched_at for key, fetched_at in self.stale.items() if key in store}
+    
+    def merge_servers(self, servers, first_index=0):
+        """Merge one chunk of a listing that is still being read
+
+        Rows already shown are updated in place and new servers are appended;
+        nothing is removed or reordered until the complete listing goes through
+        apply_inventory(). ``first_index`` is the chunk's position in the listing.
+        """
+        store = self.store
+        columns = range(self.ID_COLUMN, len(self.HEADERS))
+        appended = {}
+        for index, server in enumerate(servers, first_index):
+            key = server_key(index, server)
+            row = store.row_of(key)
+            if row is None:
+                keep_details(server, appended.get(key))
+                appended[key] = server
+                continue
+            old = store.servers[row]
+            if old is server:
+                continue
+            keep_details(server, old)
+            store.replace(row, server)
+            if any(self.display_value(old, column) != self.display_value(server, column) for column in columns):
+                self.dataChanged.emit(self.index(row, self.ID_COLUMN), self.index(row, len(self.HEADERS) - 1))
+        
+        if appended:
+            first = len(store)
+            self.beginInsertRows(QModelIndex(), first, first + len(appended) - 1)
+            store.append_rows(list(appended), list(appended.values()))
+            self.endInsertRows()
+    
+    def set_details(self, row, ip, network):
+        server = self.store.servers[row]
+        server.ip = ip
+        server.network = network
+        if self.stale.pop(self.store.keys[row], None) is not None:
+            # The whole row was greyed out as stale
+            self.dataChanged.emit(self.index(row, 0), self.index(row, len(self.HEADERS) - 1))
+        else:
+            self.dataChanged.emit(self.index(row, self.IP_COLUMN), self.index(row, self.NETWORK_COLUMN))
+    
+    def mark_stale(self, stale):
+        """Grey out rows restored from the on-disk cache; set_details clears each one"""
+        self.stale = dict(stale)
+        if len(self.store):
+            self.dataChanged.emit(self.index(0, 0), self.index(len(self.store) - 1, len(self.HEADERS) - 1))
+    
+    def set_stage(self, key, stage):
+        self.stages[key] = stage
+        row = self.store.row_of(key)
+        if row is not None:
+            index = self.index(row, self.WORKFLOW_COLUMN)
+            self.dataChanged.emit(index, index)
+
+
 class KamateraManager(QMainWindow):
+    # Emitted once with the startup timings (ms since STARTUP_T0) when the window becomes usable
+    startup_finished = pyqtSignal(dict)
+    
     def __init__(self):
         super().__init__()
         self.setWindowTitle("Smart Kamatera Server Manager")
@@ -323,21 +907,182 @@ class KamateraManager(QMainWindow):
         # Initialize variables
         self.api_key = None
         self.api_secret = None
-        self.base_url = "https://console.kamatera.com/service"
+        self.base_url = DEFAULT_BASE_URL
+        self.config = {}
         self.servers = []
-        self.workflow_state = None
+        self.load_job = None
+        self.listed_count = 0
+        self.async_bridge = None
+        self.async_client = None
+        self.async_pending = 0
+        # Set once the asyncio client turned out to be unusable (aiohttp missing)
+        self.async_unavailable = False
+        self.startup_times = {}
         
         # Set up the UI
         self.init_ui()
         
+        # Background workers for all API I/O
+        self.jobs = JobEngine(self)
+        self.jobs.busy_changed.connect(self.on_jobs_busy_changed)
+        # Background polls run apart from user actions so they never show the busy indicator
+        self.refresh_jobs = JobEngine(self)
+        
         # Try to load credentials from config
         self.load_config()
         
+        # Messages go to a bounded buffer; the log view catches up in batches
+        self.activity_log = self.create_activity_log()
+        self.workflow_log.setMaximumBlockCount(self.activity_log.max_entries + 1)
+        self.log_timer = QTimer(self)
+        self.log_timer.setSingleShot(True)
+        self.log_timer.setInterval(LOG_FLUSH_INTERVAL_MS)
+        self.log_timer.timeout.connect(self.flush_log)
+        
+        # CIDR tables for telling private from public addresses, built once
+        try:
+            self.classifier = build_classifier(self.config)
+        except ValueError as e:
+            self.classifier = NetworkClassifier()
+            self.log_message(f"⚠️ Ignoring private_cidrs/public_cidrs: {e}")
+        
+        # Long-lived API client shared by every request; with account profiles it routes to one client per account
+        self.client = self.create_client()
+        self.server_table.setColumnHidden(ServerTableModel.ACCOUNT_COLUMN, not self.multi_account)
+        
+        # Details are fetched for the rows in view first; the rest fill in at background priority
+        self.detail_fetcher = None
+        self.detail_jobs = JobEngine(self)
+        if self.config.get('lazy_details', True):
+            self.detail_fetcher = PriorityDetailFetcher(
+                self.client, self.detail_concurrency(),
+                self.config.get('detail_background_concurrency', DEFAULT_BACKGROUND_CONCURRENCY))
+            job = self.detail_jobs.submit(detail_feed_task, self.detail_fetcher, on_result=self.on_server_details)
+            job.error.connect(self.log_message)
+            job.start()
+            # The feed runs for the whole session; stop it even if the app quits without closing the window
+            QApplication.instance().aboutToQuit.connect(self.stop_detail_feed)
+        self.viewport_timer = QTimer(self)
+        self.viewport_timer.setSingleShot(True)
+        self.viewport_timer.setInterval(VIEWPORT_SETTLE_MS)
+        self.viewport_timer.timeout.connect(self.request_visible_details)
+        scroll_bar = self.server_table.verticalScrollBar()
+        scroll_bar.valueChanged.connect(self.on_viewport_changed)
+        # The page step changes when the window is resized
+        scroll_bar.rangeChanged.connect(self.on_viewport_changed)
+        
+        # Details filled in after a load are saved in batches, so the snapshot keeps IPs and networks
+        self.inventory_timer = QTimer(self)
+        self.inventory_timer.setSingleShot(True)
+        self.inventory_timer.setInterval(INVENTORY_SAVE_INTERVAL_MS)
+        self.inventory_timer.timeout.connect(self.save_inventory)
+        
+        # Show the last known inventory right away; load_servers revalidates it after the first paint
+        self.inventory = None
+        # Server id -> when its details were fetched, saved with the snapshot so restored rows keep their age
+        self.fetched_at = {}
+        if self.config.get('inventory_cache', True):
+            self.inventory = InventoryCache(account=self.inventory_account())
+            self.restore_inventory()
+        
+        # Queue depth and throttling change while requests wait, so poll the limiter
+        self.rate_timer = QTimer(self)
+        self.rate_timer.timeout.connect(self.update_rate_stats)
+        self.rate_timer.start(500)
+        
+        # Latency metrics: the panel refreshes while it is shown, the textfile on its own interval
+        self.metrics_timer = QTimer(self)
+        self.metrics_timer.timeout.connect(self.update_metrics_panel)
+        self.metrics_timer.start(1000)
+        self.metrics_file_timer = QTimer(self)
+        self.metrics_file_timer.timeout.connect(self.write_metrics_textfile)
+        if self.config.get('metrics_textfile'):
+            interval = self.config.get('metrics_textfile_interval', DEFAULT_METRICS_TEXTFILE_INTERVAL)
+            self.metrics_file_timer.start(int(interval * 1000))
+        
+        # Auto-refresh polls fast while servers change state and backs off while the fleet is stable;
+        # the first poll is scheduled once a full load has finished
+        self.refresh_schedule = None
+        if self.config.get('auto_refresh', True):
+            self.refresh_schedule = RefreshSchedule(
+                self.config.get('refresh_min_interval', DEFAULT_REFRESH_MIN_INTERVAL),
+                self.config.get('refresh_max_interval', DEFAULT_REFRESH_MAX_INTERVAL))
+        self.refresh_timer = QTimer(self)
+        self.refresh_timer.setSingleShot(True)
+        self.refresh_timer.timeout.connect(self.auto_refresh)
+        self.mark_startup('window_created')
+        # Logging in and loading servers wait for the first paint (see event())
+    
+    def event(self, event):
+        handled = super().event(event)
+        if event.type() == QEvent.Paint and 'first_paint' not in self.startup_times:
+            self.mark_startup('first_paint')
+            # Start talking to the API only once the window is on screen
+            QTimer.singleShot(0, self.start_session)
+        return handled
+    
+    def mark_startup(self, name):
+        if name not in self.startup_times:
+            self.startup_times[name] = (time.perf_counter() - STARTUP_T0) * 1000
+    
+    def finish_startup(self):
+        """Record time-to-interactive once the first inventory (or the login prompt) is up"""
+        if 'interactive' in self.startup_times:
+            return
+        self.mark_startup('interactive')
+        times = self.startup_times
+        self.log_message(f"⏱️ Startup: first paint {times['first_paint']:.0f} ms, "
+                         f"interactive {times['interactive']:.0f} ms")
+        self.startup_finished.emit(dict(times))
+    
+    def start_session(self):
         # If no config, show login dialog
-        if not self.api_key or not self.api_secret:
+        if not self.client.has_credentials:
+            self.finish_startup()
             self.show_login_dialog()
         else:
             self.load_servers()
+        if self.config.get('show_welcome', True):
+            self.show_welcome()
+    
+    def show_welcome(self):
+        """Non-blocking welcome message; can be turned off from its checkbox or config.json"""
+        msg = QMessageBox(self)
+        msg.setWindowTitle("🚀 Smart Kamatera Manager")
+        msg.setIcon(QMessageBox.Information)
+        msg.setText("Welcome to Smart Kamatera Server Manager!")
+        msg.setInformativeText("Network switching made easy with automated workflows")
+        msg.setDetailedText("""
+FEATURES:
+🔄 Automated power management
+🧠 Smart network switching workflows  
+📋 Step-by-step guidance
+🌐 Automatic console opening
+📊 Real-time workflow logging
+✅ Verification and validation
+
+WORKFLOW PROCESS:
+1. Select servers to switch networks
+2. Click "Smart Network Switch"  
+3. Choose automated workflow
+4. Each server is powered off, switched and powered on automatically
+5. Console opens for manual network config if the API refuses a change
+6. Progress for every server shows in the Workflow column
+7. Verification and completion
+
+This approach combines automation where possible with guided manual steps where needed,
+giving you the best of both worlds for reliable network switching!
+    """)
+        dont_show = QCheckBox("Don't show this again")
+        msg.setCheckBox(dont_show)
+        
+        def on_finished(result):
+            if dont_show.isChecked():
+                self.config['show_welcome'] = False
+                self.save_config()
+        
+        msg.finished.connect(on_finished)
+        msg.open()
     
     def init_ui(self):
         # Central widget with splitter
@@ -421,10 +1166,13 @@ class KamateraManager(QMainWindow):
         self.progress_bar.setVisible(False)
         
         # Server table
-        self.server_table = QTableWidget()
-        self.server_table.setColumnCount(7)
-        self.server_table.setHorizontalHeaderLabels(["Select", "ID", "Name", "Status", "IP", "Power", "Network"])
+        self.server_model = ServerTableModel(self)
+        self.server_table = QTableView()
+        self.server_table.setModel(self.server_model)
         self.server_table.horizontalHeader().setSectionResizeMode(QHeaderView.Stretch)
+        # Fixed row heights let the view skip measuring rows it never paints
+        self.server_table.verticalHeader().setSectionResizeMode(QHeaderView.Fixed)
+        self.server_table.verticalHeader().setDefaultSectionSize(26)
         self.server_table.setSelectionBehavior(QAbstractItemView.SelectRows)
         self.server_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
         
@@ -437,14 +1185,24 @@ class KamateraManager(QMainWindow):
         bottom_widget = QWidget()
         bottom_layout = QVBoxLayout(bottom_widget)
         
-        log_label = QLabel("📋 Workflow Log")
-        log_label.setFont(QFont("Arial", 12, QFont.Bold))
-        bottom_layout.addWidget(log_label)
+        # The workflow log and the API metrics share the bottom pane
+        self.bottom_tabs = QTabWidget()
+        self.bottom_tabs.setMaximumHeight(190)
+        bottom_layout.addWidget(self.bottom_tabs)
         
-        self.workflow_log = QTextEdit()
-        self.workflow_log.setMaximumHeight(150)
+        self.workflow_log = QPlainTextEdit()
+        self.workflow_log.setReadOnly(True)
         self.workflow_log.setPlainText("Ready to help with network switching! Select servers and click 'Smart Network Switch' to begin.")
-        bottom_layout.addWidget(self.workflow_log)
+        self.bottom_tabs.addTab(self.workflow_log, "📋 Workflow Log")
+        
+        self.metrics_table = QTableWidget(0, len(METRICS_HEADERS))
+        self.metrics_table.setHorizontalHeaderLabels(METRICS_HEADERS)
+        self.metrics_table.setEditTriggers(QAbstractItemView.NoEditTriggers)
+        self.metrics_table.verticalHeader().setVisible(False)
+        self.metrics_table.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeToContents)
+        self.metrics_table.horizontalHeader().setStretchLastSection(True)
+        self.bottom_tabs.addTab(self.metrics_table, "📈 API Metrics")
+        self.bottom_tabs.currentChanged.connect(self.update_metrics_panel)
         
         # Add widgets to splitter
         splitter.addWidget(top_widget)
@@ -454,6 +1212,10 @@ class KamateraManager(QMainWindow):
         # Status bar
         self.status_label = QLabel("Ready - Smart network switching available!")
         self.statusBar().addWidget(self.status_label)
+        self.cache_label = QLabel()
+        self.statusBar().addPermanentWidget(self.cache_label)
+        self.rate_label = QLabel()
+        self.statusBar().addPermanentWidget(self.rate_label)
         
         # Set style
         self.setStyleSheet("""
@@ -470,7 +1232,7 @@ class KamateraManager(QMainWindow):
             QPushButton:pressed {
                 background-color: #bdc3c7;
             }
-            QTableWidget {
+            QTableView {
                 gridline-color: #bdc3c7;
                 font-size: 12px;
                 border: 1px solid #bdc3c7;
@@ -484,392 +1246,483 @@ class KamateraManager(QMainWindow):
             }
         """)
     
+    def create_activity_log(self):
+        return ActivityLog(self.config.get('log_buffer_size', DEFAULT_LOG_BUFFER_SIZE),
+                           self.config.get('log_file'),
+                           self.config.get('log_file_max_bytes', DEFAULT_LOG_FILE_MAX_BYTES),
+                           self.config.get('log_file_backups', DEFAULT_LOG_FILE_BACKUPS))
+    
     def log_message(self, message):
-        """Add message to workflow log"""
-        self.workflow_log.append(f"[{QTimer().remainingTime()}] {message}")
-        QApplication.processEvents()
+        """Add message to workflow log; the view is updated by the next flush_log()"""
+        self.activity_log.append(message)
+        if not self.log_timer.isActive():
+            self.log_timer.start()
+    
+    def flush_log(self):
+        """Append every message logged since the last flush in one go"""
+        batch = self.activity_log.drain()
+        if batch:
+            self.workflow_log.appendPlainText("\n".join(entry.format() for entry in batch))
     
     def load_config(self):
         try:
-            with open('config.json', 'r') as f:
-                config = json.load(f)
-                self.api_key = config.get('api_key')
-                self.api_secret = config.get('api_secret')
+            config = read_config()
+            self.config = config
+            self.api_key = config.get('api_key')
+            self.api_secret = config.get('api_secret')
+            self.base_url = config.get('base_url', self.base_url)
         except FileNotFoundError:
             self.status_label.setText("Config file not found. Please login.")
         except json.JSONDecodeError:
             self.status_label.setText("Invalid config file. Please login.")
     
     def save_config(self):
-        config = {
-            'api_key': self.api_key,
-            'api_secret': self.api_secret
-        }
-        with open('config.json', 'w') as f:
-            json.dump(config, f)
+        # Keep any tuning options the user added by hand
+        config = dict(self.config)
+        config['api_key'] = self.api_key
+        config['api_secret'] = self.api_secret
+        self.config = config
+        write_config(config)
+    
+    def create_client(self):
+        """Build the pooled API client from config.json settings, or one client per account profile"""
+        client = None
+        if self.config.get('accounts'):
+            try:
+                client = build_fleet(self.config)
+            except ValueError as e:
+                self.log_message(f"⚠️ Ignoring the accounts in {CONFIG_FILE}: {e}")
+        if client is not None:
+            self.multi_account = True
+            self.rate_limiters = client.rate_limiters
+            self.rate_limiter = None
+            if self.config.get('async_client'):
+                self.log_message("ℹ️ async_client is not used with several accounts")
+        else:
+            self.multi_account = False
+            client = build_client(dict(self.config, base_url=self.base_url), self.api_key, self.api_secret)
+            # The asyncio client shares the cache and the request budget
+            self.rate_limiter = client.rate_limiter
+            self.rate_limiters = {'': client.rate_limiter} if client.rate_limiter is not None else {}
+        self.detail_cache = client.detail_cache
+        self.metrics = client.metrics
+        return client
+    
+    def inventory_account(self):
+        """Key of the on-disk snapshot: the API key and endpoint, or every configured account"""
+        if self.multi_account:
+            return self.client.fingerprint()
+        return account_fingerprint(self.base_url, self.api_key)
+    
+    def detail_concurrency(self):
+        """Parallel detail requests; each account gets the configured number"""
+        return self.config.get('detail_concurrency', DEFAULT_DETAIL_CONCURRENCY) * self.account_count()
+    
+    def account_count(self):
+        return len(self.client) if self.multi_account else 1
+    
+    def async_details(self):
+        return bool(self.config.get('async_client')) and not self.multi_account and not self.async_unavailable
+    
+    def account_breakdown(self, servers):
+        """Per-account counts like " (prod: 3, staging: 2)" for log lines; empty with a single account"""
+        if not self.multi_account:
+            return ''
+        counts = {}
+        for server in servers:
+            counts[server.account] = counts.get(server.account, 0) + 1
+        return " (" + ", ".join(f"{account or 'unknown'}: {count}" for account, count in counts.items()) + ")"
+    
+    def get_async_runtime(self):
+        """Start the asyncio loop thread and client on first use; None when aiohttp is missing"""
+        if self.async_bridge is None:
+            # Imported here: aiohttp adds a noticeable share to the GUI's import time
+            from kamatera.aio import AsyncKamateraClient
+            try:
+                self.async_client = AsyncKamateraClient(
+                    self.api_key, self.api_secret, base_url=self.base_url,
+                    max_in_flight=self.config.get('max_in_flight', DEFAULT_MAX_IN_FLIGHT),
+                    detail_cache=self.detail_cache, rate_limiter=self.rate_limiter, metrics=self.metrics,
+                    coalesce=self.config.get('coalesce_requests', True))
+            except ImportError as e:
+                self.async_unavailable = True
+                self.log_message(f"⚠️ async_client is on but unusable ({e}); loading details on worker threads")
+                return None
+            self.async_bridge = AsyncBridge(self)
+            self.async_bridge.start()
+        return self.async_bridge, self.async_client
     
     def show_login_dialog(self):
+        if self.multi_account:
+            # Profiles are edited in config.json; the dialog only knows a single key pair
+            QMessageBox.warning(self, "Missing Credentials",
+                                f"Add api_key and api_secret to these accounts in {CONFIG_FILE}: "
+                                f"{', '.join(self.client.missing_credentials())}")
+            return
         dialog = LoginDialog(self)
         if dialog.exec_() == QDialog.Accepted:
             self.api_key, self.api_secret = dialog.get_credentials()
             if self.api_key and self.api_secret:
+                self.client.set_credentials(self.api_key, self.api_secret)
+                if self.async_client is not None:
+                    self.async_client.set_credentials(self.api_key, self.api_secret)
+                if self.inventory is not None:
+                    self.inventory.account = self.inventory_account()
                 self.save_config()
                 self.load_servers()
             else:
                 QMessageBox.warning(self, "Error", "API key and secret are required.")
     
-    def make_api_request(self, endpoint, method="GET", data=None):
-        """Make authenticated API request to Kamatera"""
-        if not self.api_key or not self.api_secret:
-            self.show_login_dialog()
-            return None
-            
-        headers = {
-            "AuthClientId": self.api_key,
-            "AuthSecret": self.api_secret,
-            "Content-Type": "application/json"
-        }
-        
-        url = f"{self.base_url}{endpoint}"
-        
-        try:
-            if method == "GET":
-                response = requests.get(url, headers=headers, params=data)
-            elif method == "PUT":
-                response = requests.put(url, headers=headers, json=data)
-            elif method == "POST":
-                response = requests.post(url, headers=headers, json=data)
-            else:
-                return None
-            
-            response.raise_for_status()
-            
-            # Try to parse as JSON, if fails return text
-            try:
-                return response.json()
-            except:
-                return response.text
-                
-        except requests.exceptions.RequestException as e:
-            self.log_message(f"API Error: {str(e)}")
-            return None
-
-    # Add this new method to change network configuration
-    def change_server_network(self, server_id, network_type):
-        """Change server network configuration"""
-        self.log_message(f"Changing network for server {server_id} to {network_type}")
-        
-        # First get current server configuration
-        server_info = self.make_api_request(f"/server/{server_id}", "GET")
-        if not server_info:
-            self.log_message(f"❌ Failed to get server info for {server_id}")
-            return False
-            
-        # Prepare network change data
-        network_data = {
-            "networks": []
-        }
-        
-        # Add the appropriate network based on type
-        if network_type.lower() == "public":
-            network_data["networks"].append({"name": "internet"})
-        elif network_type.lower() == "private":
-            network_data["networks"].append({"name": "local"})
-        
-        # Make the API call to change network
-        result = self.make_api_request(f"/server/{server_id}", "PUT", network_data)
-        
-        if result:
-            self.log_message(f"✅ Successfully changed network for server {server_id}")
-            return True
-        else:
-            self.log_message(f"❌ Failed to change network for server {server_id}")
-            return False
-
-    # Update the workflow_step_2 method to include automatic network change
-    def workflow_step_2(self, servers, target_network):
-        """Step 2: Network switching (automatic or manual)"""
-        self.log_message("Step 2: Network configuration")
-        
-        # Try automatic network change first
-        auto_success = True
-        self.log_message("Attempting automatic network change via API...")
-        
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setRange(0, len(servers))
-        
-        for i, server in enumerate(servers):
-            server_id = server.get('id')
-            server_name = server.get('name', 'Unknown')
-            
-            self.log_message(f"Changing network for: {server_name}")
-            self.status_label.setText(f"Changing network: {server_name}")
-            
-            success = self.change_server_network(server_id, target_network)
-            if not success:
-                auto_success = False
-                self.log_message(f"❌ Automatic network change failed for {server_name}")
-            
-            self.progress_bar.setValue(i + 1)
-            QApplication.processEvents()
-        
-        self.progress_bar.setVisible(False)
-        
-        if auto_success:
-            self.log_message("✅ All network changes completed successfully!")
-            # Proceed to power on step
-            self.workflow_step_3(servers)
-        else:
-            self.log_message("⚠️ Automatic network change partially failed, switching to manual method")
-            # Fall back to manual method
-            self.workflow_step_2_manual(servers, target_network)
-
-    def workflow_step_2_manual(self, servers, target_network):
-        """Manual network switching fallback"""
-        self.log_message("Step 2: Manual network switching required")
-        
-        # Open Kamatera console
-        webbrowser.open("https://console.kamatera.com/")
-        self.log_message("🌐 Opened Kamatera console in browser")
-        
-        # Show guided instructions
-        server_list = "\n".join([f"• {s.get('name', 'Unknown')} ({s.get('id', 'Unknown')})" for s in servers])
-        
-        msg = QMessageBox(self)
-        msg.setWindowTitle("🔧 Manual Network Configuration")
-        msg.setIcon(QMessageBox.Information)
-        msg.setText(f"Console opened! Now configure networks for {len(servers)} servers.")
-        msg.setInformativeText(f"Switch each server to: {target_network.title()} Network")
-        msg.setDetailedText(f"""SERVERS TO CONFIGURE:
-{server_list}
-
-STEPS IN KAMATERA CONSOLE:
-1. Go to "Server Management" or "My Servers"
-2. For each server above:
-   • Click server name or "Manage"
-   • Find "Network" or "Networking" section  
-   • Click "Edit" or "Modify Network"
-   • Change to: {target_network.title()} Network
-   • Save changes
-
-3. When ALL servers are configured, click "Yes" below
-4. We'll automatically power them back on!
-
-IMPORTANT: Configure ALL servers before proceeding to power-on step.""")
-        
-        msg.setStandardButtons(QMessageBox.Yes | QMessageBox.Cancel)
-        msg.button(QMessageBox.Yes).setText("✅ All Networks Configured - Power On Servers")
-        msg.button(QMessageBox.Cancel).setText("❌ Cancel Workflow")
-        
-        reply = msg.exec_()
-        
-        if reply == QMessageBox.Yes:
-            self.log_message("✅ User confirmed network configuration complete")
-            self.workflow_step_3(servers)
+    def run_job(self, task, *args, on_result=None, on_completed=None):
+        """Run task(job, *args) on a worker thread wired to the progress bar, status label and log"""
+        job = self.jobs.submit(task, *args, on_result=on_result, on_completed=on_completed)
+        job.progress.connect(self.on_job_progress)
+        job.status.connect(self.status_label.setText)
+        job.error.connect(self.log_message)
+        job.start()
+        return job
+    
+    def on_jobs_busy_changed(self, busy):
+        self.progress_bar.setVisible(busy or self.async_pending > 0)
+        if busy:
+            self.progress_bar.setRange(0, 0)
         else:
-            self.log_message("❌ Workflow cancelled by user")
-            self.status_label.setText("Workflow cancelled")
-
-    # Update the start_automated_workflow method
-    def start_automated_workflow(self, servers, target_network):
-        """Execute the automated workflow"""
-        self.log_message(f"🔄 Starting automated workflow: {len(servers)} servers → {target_network}")
-        
-        # Step 1: Power off servers
-        self.log_message("Step 1: Powering off servers...")
-        self.power_off_servers_for_workflow(servers)
-        
-        # Step 2: Network change (automatic with manual fallback)
-        self.workflow_step_2(servers, target_network)
-    def extract_ip_and_network_info(self, detailed_info):
-        """Extract IP address and network type from detailed server information"""
-        ip_address = 'N/A'
-        network_type = 'Unknown'
-        
+            self.update_cache_stats()
+    
+    def update_cache_stats(self):
+        stats = self.detail_cache.stats()
+        self.cache_label.setText(f"Detail cache: {stats['hits']} hits / {stats['misses']} misses "
+                                 f"({stats['hit_rate']:.0%}), {stats['size']} entries")
+    
+    def update_rate_stats(self):
+        if not self.rate_limiters:
+            self.rate_label.setVisible(False)
+            return
+        # One budget per account; the queue and wait add up, 429 pauses are shown per account
+        stats = {name: limiter.stats() for name, limiter in self.rate_limiters.items()}
+        text = (f"Rate limit: {sum(s['queued'] for s in stats.values())} queued, "
+                f"{sum(s['throttle_time'] for s in stats.values()):.1f}s total wait")
+        for name, account_stats in stats.items():
+            if account_stats['paused_for']:
+                text += f", 429 pause {name + ' ' if name else ''}{account_stats['paused_for']:.0f}s"
+        self.rate_label.setText(text)
+    
+    def update_metrics_panel(self):
+        if self.bottom_tabs.currentWidget() is not self.metrics_table:
+            return
+        rows = self.metrics.snapshot()
+        self.metrics_table.setRowCount(len(rows))
+        for row, stats in enumerate(rows):
+            values = [
+                stats['method'],
+                stats['endpoint'],
+                str(stats['count']),
+                str(stats['deduplicated']),
+                str(stats['failed']),
+                ', '.join(f"{status}: {count}" for status, count in sorted(stats['statuses'].items())),
+                ', '.join(f"{error}: {count}" for error, count in sorted(stats['errors'].items())),
+            ] + [f"{stats[key] * 1000:.0f}" for key in ('p50', 'p95', 'p99')]
+            for column, value in enumerate(values):
+                item = self.metrics_table.item(row, column)
+                if item is None:
+                    self.metrics_table.setItem(row, column, QTableWidgetItem(value))
+                elif item.text() != value:
+                    item.setText(value)
+    
+    def write_metrics_textfile(self):
+        """Export the metrics for the node exporter's textfile collector"""
+        path = self.config.get('metrics_textfile')
+        if not path:
+            return
         try:
-            if 'networks' in detailed_info and isinstance(detailed_info['networks'], list) and detailed_info['networks']:
-                for network in detailed_info['networks']:
-                    if isinstance(network, dict) and 'ips' in network:
-                        if isinstance(network['ips'], list) and network['ips']:
-                            ip_address = network['ips'][0]
-                            
-                            if 'name' in network:
-                                network_name = network['name'].lower()
-                                if 'private' in network_name or 'local' in network_name:
-                                    network_type = 'Private'
-                                elif 'public' in network_name or 'internet' in network_name:
-                                    network_type = 'Public'
-                            
-                            if network_type == 'Unknown' and ip_address != 'N/A':
-                                if (ip_address.startswith('10.') or 
-                                    ip_address.startswith('172.') or 
-                                    ip_address.startswith('192.168.')):
-                                    network_type = 'Private'
-                                else:
-                                    network_type = 'Public'
-                            break
-            
-            if ip_address == 'N/A':
-                ip_fields = ['ip', 'ipAddress', 'primaryIP', 'publicIP', 'privateIP']
-                for field in ip_fields:
-                    if field in detailed_info and detailed_info[field]:
-                        ip_address = detailed_info[field]
-                        if 'private' in field.lower():
-                            network_type = 'Private'
-                        elif 'public' in field.lower():
-                            network_type = 'Public'
-                        break
-                        
-        except (KeyError, IndexError, TypeError, AttributeError) as e:
-            self.log_message(f"Error extracting IP and network info: {e}")
-        
-        return ip_address, network_type
+            self.metrics.write_textfile(path)
+        except OSError as e:
+            self.metrics_file_timer.stop()
+            self.log_message(f"⚠️ Could not write the metrics textfile, export stopped: {e}")
+    
+    def on_job_progress(self, done, total):
+        self.progress_bar.setRange(0, total)
+        self.progress_bar.setValue(done)
 
     def load_servers(self):
         """Load servers from Kamatera API"""
+        if not self.client.has_credentials:
+            self.show_login_dialog()
+            return
+        
+        if self.load_job is not None:
+            # A load is already running; its results will refresh the table
+            return
+        
+        # A full load supersedes any background poll
+        self.refresh_timer.stop()
+        if self.inventory_timer.isActive():
+            # Save pending details now; a snapshot taken mid-load would miss the rows not yet listed
+            self.save_inventory()
+        for job in list(self.refresh_jobs.jobs):
+            job.cancel()
         self.log_message("Loading servers...")
         self.status_label.setText("Loading servers...")
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setRange(0, 0)
-        QApplication.processEvents()
-        
-        servers = self.make_api_request("/servers", "GET")
+        # Rows are merged chunk by chunk as the listing is parsed and each chunk's
+        # details are requested right away; the asyncio client fetches them after the listing.
+        # Several accounts are listed at the same time and their chunks interleave.
+        self.listed_count = 0
+        concurrency = self.detail_concurrency()
+        chunk_size = self.config.get('listing_chunk_size', DEFAULT_LISTING_CHUNK)
+        details = self.detail_fetcher is None and not self.async_details()
+        if self.detail_fetcher is not None:
+            # An explicit load refetches every detail as its row comes into view
+            self.detail_fetcher.reset()
+            self.detail_cache.clear()
+        self.load_job = self.run_job(inventory_task, self.client, concurrency, chunk_size, details,
+                                     on_result=self.on_inventory_result, on_completed=self.on_servers_listed)
+    
+    def on_inventory_result(self, result):
+        kind, payload = result
+        if kind != LISTED:
+            self.on_server_details(payload)
+            return
+        self.server_model.merge_servers(payload, self.listed_count)
+        self.listed_count += len(payload)
+        self.servers = self.server_model.servers
+        self.on_viewport_changed()
+        self.status_label.setText(f"Loading servers... {self.listed_count} listed")
+        # The first rows on screen make the window usable
+        self.finish_startup()
+    
+    def on_servers_listed(self, servers):
+        """Reconcile the table with the complete listing once it and its details are in"""
+        self.load_job = None
         
         if servers is None:
-            self.progress_bar.setVisible(False)
             self.status_label.setText("Failed to load servers")
             self.log_message("❌ Failed to load servers")
+            self.finish_startup()
+            self.schedule_refresh()
             return
-            
-        if isinstance(servers, dict):
-            if 'servers' in servers:
-                servers = servers['servers']
-            elif 'items' in servers:
-                servers = servers['items']
-            elif 'data' in servers:
-                servers = servers['data']
+        
+        # Drops servers that are gone and restores the API order; the rows themselves are already merged
+        self.apply_inventory(servers)
+        self.finish_startup()
         
         if not servers:
-            self.progress_bar.setVisible(False)
             self.status_label.setText("No servers found")
             self.log_message("ℹ️ No servers found")
             return
-            
-        self.servers = servers
-        self.server_table.setRowCount(len(servers))
         
-        # Load server information
-        self.progress_bar.setRange(0, len(servers))
-        for row, server in enumerate(servers):
-            server_id = server.get('id') or 'N/A'
-            server_name = server.get('name') or 'Unnamed'
-            server_status = server.get('status') or 'unknown'
-            server_power = server.get('power') or 'unknown'
-            
-            # Checkbox for selection
-            checkbox = QCheckBox()
-            checkbox_widget = QWidget()
-            checkbox_layout = QVBoxLayout(checkbox_widget)
-            checkbox_layout.addWidget(checkbox)
-            checkbox_layout.setAlignment(Qt.AlignCenter)
-            checkbox_layout.setContentsMargins(0, 0, 0, 0)
-            self.server_table.setCellWidget(row, 0, checkbox_widget)
-            
-            # Server details
-            self.server_table.setItem(row, 1, QTableWidgetItem(str(server_id)))
-            self.server_table.setItem(row, 2, QTableWidgetItem(server_name))
-            
-            # Status with color coding
-            status_item = QTableWidgetItem(server_status)
-            status = server_status.lower()
-            if 'run' in status or 'on' in status:
-                status_item.setBackground(QColor(220, 255, 220))
-            elif 'stop' in status or 'off' in status:
-                status_item.setBackground(QColor(255, 220, 220))
-            elif 'pend' in status:
-                status_item.setBackground(QColor(255, 255, 200))
-            self.server_table.setItem(row, 3, status_item)
-            
-            # Get detailed info for IP and network
-            if server_id != 'N/A':
-                detailed_info = self.make_api_request(f"/server/{server_id}", "GET")
-                if detailed_info and isinstance(detailed_info, dict):
-                    server_ip, network_type = self.extract_ip_and_network_info(detailed_info)
-                    self.server_table.setItem(row, 4, QTableWidgetItem(server_ip))
-                    
-                    # Store network info in server dict for workflow
-                    server['network'] = network_type
-                    server['ip'] = server_ip
-                    
-                    # Network type with color coding
-                    network_item = QTableWidgetItem(network_type)
-                    if network_type.lower() == 'public':
-                        network_item.setBackground(QColor(220, 220, 255))
-                    elif network_type.lower() == 'private':
-                        network_item.setBackground(QColor(255, 220, 255))
-                    self.server_table.setItem(row, 6, network_item)
-                else:
-                    self.server_table.setItem(row, 4, QTableWidgetItem("Error"))
-                    self.server_table.setItem(row, 6, QTableWidgetItem("Error"))
-                    server['network'] = 'Error'
-                    server['ip'] = 'Error'
-            else:
-                self.server_table.setItem(row, 4, QTableWidgetItem("N/A"))
-                self.server_table.setItem(row, 6, QTableWidgetItem("N/A"))
-                server['network'] = 'N/A'
-                server['ip'] = 'N/A'
-            
-            # Power status
-            power_item = QTableWidgetItem(server_power)
-            power = server_power.lower()
-            if 'on' in power:
-                power_item.setBackground(QColor(220, 255, 220))
-            elif 'off' in power:
-                power_item.setBackground(QColor(255, 220, 220))
-            self.server_table.setItem(row, 5, power_item)
-            
-            # Update progress
-            self.progress_bar.setValue(row + 1)
-            QApplication.processEvents()
+        if self.detail_fetcher is not None:
+            # The rows in view are already on their way; the rest fill in at background priority
+            self.on_viewport_changed()
+            self.detail_fetcher.fill(server.id for server in servers if server.id)
+        elif self.async_details():
+            self.load_details_async([server.id for server in servers if server.id])
+            return
+        self.on_servers_loaded(len(servers))
+    
+    def apply_inventory(self, servers):
+        """Merge a fresh listing into the table model"""
+        if self.multi_account:
+            servers = self.client.sort(servers)
+        self.server_model.apply_inventory(servers)
+        self.servers = self.server_model.servers
+    
+    def load_details_async(self, server_ids):
+        """Fetch every detail from one asyncio loop instead of a thread pool"""
+        runtime = self.get_async_runtime()
+        if runtime is None:
+            self.load_job = self.run_job(details_task, self.client, server_ids, self.detail_concurrency(), False,
+                                         on_result=self.on_server_details, on_completed=self.on_servers_loaded)
+            return
+        bridge, client = runtime
+        self.async_pending += 1
+        self.progress_bar.setVisible(True)
+        self.progress_bar.setRange(0, len(server_ids))
+        self.progress_bar.setValue(0)
+        
+        def on_detail(result):
+            server_id, detailed_info, error = result
+            if error is not None:
+                self.log_message(f"API Error: {str(error)}")
+            self.on_server_details((server_id, detailed_info))
+            self.progress_bar.setValue(self.progress_bar.value() + 1)
+        
+        def on_done(count):
+            self.async_pending -= 1
+            self.on_jobs_busy_changed(self.jobs.busy)
+            self.on_servers_loaded(count)
+        
+        def on_error(error):
+            self.async_pending -= 1
+            self.on_jobs_busy_changed(self.jobs.busy)
+            self.load_job = None
+            self.log_message(f"❌ Failed to load server details: {error}")
+        
+        async def fetch_all():
+            count = 0
+            async for result in client.iter_server_details(server_ids, use_cache=False):
+                bridge.post(on_detail, result)
+                count += 1
+            return count
+        
+        self.load_job = bridge.submit(fetch_all(), on_completed=on_done, on_error=on_error)
+    
+    def on_server_details(self, result):
+        server_id, detailed_info = result
+        row = self.server_model.row_of(server_id)
+        if row is not None:
+            self.fill_server_details(row, detailed_info)
+            self.fetched_at[server_id] = time.time()
+            # A load saves the snapshot when it completes; later details (the lazy fill, refreshes) are batched
+            if self.inventory is not None and self.load_job is None and not self.inventory_timer.isActive():
+                self.inventory_timer.start()
+    
+    def stop_detail_feed(self):
+        if self.detail_fetcher is not None:
+            self.detail_fetcher.close()
+        self.detail_jobs.shutdown()
+    
+    def on_viewport_changed(self):
+        if self.detail_fetcher is not None:
+            self.viewport_timer.start()
+    
+    def request_visible_details(self):
+        """Ask for the details of the rows in view, then the prefetch margin below and above them"""
+        store = self.server_model.store
+        if not len(store):
+            return
+        view = self.server_table
+        first = max(0, view.rowAt(0))
+        last = view.rowAt(view.viewport().height() - 1)
+        if last < 0:
+            last = len(store) - 1
+        margin = self.config.get('detail_prefetch_rows', DEFAULT_DETAIL_PREFETCH_ROWS)
+        rows = list(range(first, last + 1))
+        rows += range(last + 1, min(len(store), last + 1 + margin))
+        rows += range(first - 1, max(0, first - margin) - 1, -1)
+        self.detail_fetcher.want(store.servers[row].id for row in rows if store.servers[row].id)
+    
+    def on_servers_loaded(self, count):
+        self.load_job = None
+        self.status_label.setText(f"✅ Loaded {len(self.servers)} servers - Ready for smart network switching!")
+        self.log_message(f"✅ Loaded {len(self.servers)} servers successfully{self.account_breakdown(self.servers)}")
+        self.save_inventory()
+        if self.refresh_schedule is not None:
+            self.refresh_schedule.reset()
+        self.schedule_refresh()
+    
+    def schedule_refresh(self, delay=None):
+        """Arm the next background poll, after the schedule's current interval by default"""
+        if self.refresh_schedule is None:
+            return
+        if delay is None:
+            delay = self.refresh_schedule.interval
+        self.refresh_timer.start(int(delay * 1000))
+        self.refresh_btn.setToolTip(f"Reload every server now (auto-refresh in {delay:.0f}s)")
+    
+    def auto_refresh(self):
+        """Poll the listing in the background, fetching details only for servers that changed"""
+        if self.jobs.busy or self.load_job is not None or not self.client.has_credentials:
+            # User actions and full loads come first; look again shortly
+            self.schedule_refresh(self.refresh_schedule.min_interval)
+            return
+        if self.detail_fetcher is not None:
+            # The viewport decides which details are fetched; the poll only has to spot the changes
+            known = [server for server in self.servers if server.id]
+        else:
+            # Servers without known details, or still shown from the cache, always get a fresh detail
+            stale = self.server_model.stale
+            known = [server for server in self.servers
+                     if server.id and server.ip is not None and server.id not in stale]
+        fingerprints = {server.id: server_fingerprint(server) for server in known}
+        concurrency = self.detail_concurrency()
+        job = self.refresh_jobs.submit(refresh_task, self.client, fingerprints, concurrency,
+                                       self.detail_fetcher is None,
+                                       on_result=self.on_refresh_result, on_completed=self.on_refresh_completed)
+        job.error.connect(self.log_message)
+        job.start()
+    
+    def on_refresh_result(self, result):
+        if self.load_job is not None:
+            # A full load started meanwhile and reconciles everything itself
+            return
+        kind, payload = result
+        if kind == LISTED:
+            servers, changed = payload
+            # Unchanged servers keep their details; only rows whose values differ are repainted
+            self.apply_inventory(servers)
+            if changed:
+                self.log_message(f"🔄 Auto-refresh: {len(changed)} server(s) changed")
+                if self.detail_fetcher is not None:
+                    # Refetch their details when they come into view, or in the background fill
+                    for server_id in changed:
+                        self.client.invalidate_server(server_id)
+                    self.detail_fetcher.forget(changed)
+                    self.detail_fetcher.fill(changed)
+            self.on_viewport_changed()
+            return
+        self.on_server_details(payload)
+    
+    def on_refresh_completed(self, outcome):
+        if self.load_job is not None:
+            return
+        if outcome is None:
+            # The poll failed: back off as if nothing had changed
+            self.schedule_refresh(self.refresh_schedule.update(False, False))
+            return
+        changed, transitional = outcome
+        if changed:
+            self.save_inventory()
+        self.schedule_refresh(self.refresh_schedule.update(changed, transitional))
+    
+    def restore_inventory(self):
+        """Fill the table from the on-disk snapshot, with every row marked stale"""
+        cached = self.inventory.load()
+        if not cached:
+            return
+        if self.multi_account:
+            # Actions on cached rows go to the right account before the first listing is in
+            self.client.learn(server for server, fetched_at in cached)
+        self.apply_inventory([server for server, fetched_at in cached])
+        self.fetched_at = {server.id: fetched_at for server, fetched_at in cached}
+        self.server_model.mark_stale(self.fetched_at)
+        age = time.time() - min(fetched_at for server, fetched_at in cached)
+        self.status_label.setText(f"Showing {len(cached)} cached servers ({age / 60:.0f} min old) - refreshing...")
+        self.log_message(f"📦 Restored {len(cached)} servers from the inventory cache")
+    
+    def save_inventory(self):
+        self.inventory_timer.stop()
+        if self.inventory is None:
+            return
+        try:
+            self.inventory.save(self.servers, self.fetched_at)
+        except sqlite3.Error as e:
+            self.log_message(f"⚠️ Could not save the inventory cache: {e}")
+
+    def fill_server_details(self, row, detailed_info):
+        """Store the IP and network type for one row from its detail payload"""
+        if detailed_info and isinstance(detailed_info, dict):
+            server_ip, network_type = self.classifier.classify(detailed_info)
+        else:
+            server_ip, network_type = 'Error', 'Error'
         
-        self.progress_bar.setVisible(False)
-        self.status_label.setText(f"✅ Loaded {len(servers)} servers - Ready for smart network switching!")
-        self.log_message(f"✅ Loaded {len(servers)} servers successfully")
+        # Network info lives on the server record for the workflow
+        self.server_model.set_details(row, server_ip, network_type)
     
     def get_selected_servers(self):
         """Get list of selected server data"""
         selected_servers = []
-        for row in range(self.server_table.rowCount()):
-            checkbox_widget = self.server_table.cellWidget(row, 0)
-            checkbox = checkbox_widget.findChild(QCheckBox)
-            if checkbox and checkbox.isChecked():
-                # Find the server data by ID
-                server_id = self.server_table.item(row, 1).text()
-                for server in self.servers:
-                    if server.get('id') == server_id:
-                        # Enhance with current table data
-                        server['name'] = self.server_table.item(row, 2).text()
-                        server['current_status'] = self.server_table.item(row, 3).text()
-                        server['current_power'] = self.server_table.item(row, 5).text()
-                        selected_servers.append(server)
-                        break
+        for server in self.server_model.checked_servers():
+            if server.id:
+                selected_servers.append(server)
         return selected_servers
     
     def select_all_servers(self):
         """Select all servers in the table"""
-        for row in range(self.server_table.rowCount()):
-            checkbox_widget = self.server_table.cellWidget(row, 0)
-            checkbox = checkbox_widget.findChild(QCheckBox)
-            if checkbox:
-                checkbox.setChecked(True)
+        self.server_model.set_all_checked(True)
     
     def deselect_all_servers(self):
         """Deselect all servers in the table"""
-        for row in range(self.server_table.rowCount()):
-            checkbox_widget = self.server_table.cellWidget(row, 0)
-            checkbox = checkbox_widget.findChild(QCheckBox)
-            if checkbox:
-                checkbox.setChecked(False)
+        self.server_model.set_all_checked(False)
     
     def smart_network_switch(self):
         """Launch smart network switching workflow"""
@@ -879,8 +1732,20 @@ IMPORTANT: Configure ALL servers before proceeding to power-on step.""")
             QMessageBox.warning(self, "No Selection", "Please select at least one server for network switching.")
             return
         
-        self.log_message(f"🚀 Starting smart network switch for {len(selected_servers)} servers")
+        self.log_message(f"🚀 Starting smart network switch for {len(selected_servers)} servers"
+                         f"{self.account_breakdown(selected_servers)}")
         
+        # The dialog works from each server's current network, which lazy loading may not have fetched yet
+        missing = [server.id for server in selected_servers if server.ip is None]
+        if missing:
+            self.log_message(f"Fetching details for {len(missing)} servers first...")
+            concurrency = self.detail_concurrency()
+            self.run_job(details_task, self.client, missing, concurrency, on_result=self.on_server_details,
+                         on_completed=lambda count: self.open_network_workflow(selected_servers))
+            return
+        self.open_network_workflow(selected_servers)
+    
+    def open_network_workflow(self, selected_servers):
         # Launch the workflow dialog
         dialog = NetworkWorkflowDialog(selected_servers, self)
         if dialog.exec_() == QDialog.Accepted:
@@ -888,61 +1753,73 @@ IMPORTANT: Configure ALL servers before proceeding to power-on step.""")
             target_network = dialog.get_target_network()
             self.start_automated_workflow(selected_servers, target_network)
     
-    def start_automated_workflow(self, servers, target_network):
-        """Execute the automated workflow"""
-        self.log_message(f"🔄 Starting automated workflow: {len(servers)} servers → {target_network}")
-        
-        # Step 1: Power off servers
-        self.log_message("Step 1: Powering off servers...")
-        self.power_off_servers_for_workflow(servers)
-        
-        # Step 2: Wait a moment, then open console and show manual instructions
-        QTimer.singleShot(5000, lambda: self.workflow_step_2(servers, target_network))
-    
-    def power_off_servers_for_workflow(self, servers):
-        """Power off servers as part of workflow"""
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setRange(0, len(servers))
-        
-        success_count = 0
-        for i, server in enumerate(servers):
-            server_id = server.get('id')
-            server_name = server.get('name', 'Unknown')
-            
-            self.log_message(f"Powering off: {server_name}")
-            self.status_label.setText(f"Powering off: {server_name}")
-            
-            result = self.make_api_request(f"/server/{server_id}/power", "PUT", {"power": "off"})
-            
-            if result:
-                success_count += 1
-                self.log_message(f"✅ {server_name} power off initiated")
+    def start_automated_workflow(self, servers, target_network, start=POWERING_OFF, previous=None):
+        """Run every server through its own off → network → on → verify pipeline
+        
+        ``previous`` is (servers, counts) of the pass a resumed run continues, so the report covers both.
+        """
+        self.log_message(f"🔄 Starting workflow: {len(servers)} servers → {target_network}")
+        self.status_label.setText("Network switching workflow running...")
+        manual = []
+        
+        def on_result(result):
+            server, stage, info = result
+            self.server_model.set_stage(server.id, stage)
+            if stage == DONE:
+                row = self.server_model.row_of(server.id)
+                if row is not None:
+                    self.fill_server_details(row, info)
+                # Verification already waited for the detail to report the target network
+                self.log_message(f"✅ {server.name} switched to {target_network}")
+            elif stage == FAILED:
+                self.log_message(f"❌ {server.name}: {info}")
+            elif stage == NEEDS_MANUAL:
+                manual.append(server)
+                self.log_message(f"⚠️ {server.name}: automatic network change failed ({info}), left powered off")
+        
+        def on_completed(counts):
+            counts = dict(counts or {})
+            all_servers = servers
+            if previous is not None:
+                # The servers that needed a manual change are this run; the rest finished in the first pass
+                all_servers, earlier = previous
+                for stage, count in earlier.items():
+                    if stage != NEEDS_MANUAL:
+                        counts[stage] = counts.get(stage, 0) + count
+            self.log_message(f"Workflow finished: {counts.get(DONE, 0)} done, {counts.get(FAILED, 0)} failed, "
+                             f"{len(manual)} need a manual network change")
+            if manual:
+                self.workflow_manual_network(manual, target_network, (all_servers, counts))
             else:
-                self.log_message(f"❌ Failed to power off {server_name}")
-            
-            self.progress_bar.setValue(i + 1)
-            QApplication.processEvents()
-        
-        self.progress_bar.setVisible(False)
-        self.log_message(f"Power off completed: {success_count}/{len(servers)} servers")
+                self.finish_workflow(all_servers, counts)
+        
+        concurrency = self.config.get('workflow_concurrency', DEFAULT_WORKFLOW_CONCURRENCY)
+        timeout = self.config.get('converge_timeout', DEFAULT_CONVERGE_TIMEOUT)
+        # Same check as the CLI: the server is only done once it classifies as the target network
+        verify = network_is(target_network, self.classifier)
+        self.run_job(workflow_task, self.client, servers, target_network, start, concurrency, timeout, verify,
+                     on_result=on_result, on_completed=on_completed)
     
-    def workflow_step_2(self, servers, target_network):
-        """Step 2: Manual network switching with guidance"""
-        self.log_message("Step 2: Manual network switching required")
+    def workflow_manual_network(self, servers, target_network, previous):
+        """Guide the user through the network change the API refused, then resume the pipelines
+        
+        ``previous`` is (servers, counts) of the whole workflow so far, carried into the resumed run.
+        """
+        self.log_message("Manual network switching required")
         
         # Open Kamatera console
         webbrowser.open("https://console.kamatera.com/")
         self.log_message("🌐 Opened Kamatera console in browser")
         
         # Show guided instructions
-        server_list = "\n".join([f"• {s.get('name', 'Unknown')} ({s.get('id', 'Unknown')})" for s in servers])
+        server_list = "\n".join([f"• {s.name} ({s.id})" for s in servers])
         
         msg = QMessageBox(self)
         msg.setWindowTitle("🔧 Manual Network Configuration")
         msg.setIcon(QMessageBox.Information)
         msg.setText(f"Console opened! Now configure networks for {len(servers)} servers.")
         msg.setInformativeText(f"Switch each server to: {target_network.title()} Network")
-        msg.setDetailedText(f"""SERVERS TO CONFIGURE:
+        msg.setDetailedText(f"""SERVERS TO CONFIGURE (already powered off):
 {server_list}
 
 STEPS IN KAMATERA CONSOLE:
@@ -967,64 +1844,48 @@ IMPORTANT: Configure ALL servers before proceeding to power-on step.""")
         
         if reply == QMessageBox.Yes:
             self.log_message("✅ User confirmed network configuration complete")
-            self.workflow_step_3(servers)
+            self.start_automated_workflow(servers, target_network, start=POWERING_ON, previous=previous)
         else:
-            self.log_message("❌ Workflow cancelled by user")
+            self.log_message(f"❌ Workflow cancelled by user; {len(servers)} servers are still powered off")
             self.status_label.setText("Workflow cancelled")
     
-    def workflow_step_3(self, servers):
-        """Step 3: Power on servers"""
-        self.log_message("Step 3: Powering on servers...")
-        
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setRange(0, len(servers))
-        
-        success_count = 0
-        for i, server in enumerate(servers):
-            server_id = server.get('id')
-            server_name = server.get('name', 'Unknown')
-            
-            self.log_message(f"Powering on: {server_name}")
-            self.status_label.setText(f"Powering on: {server_name}")
-            
-            result = self.make_api_request(f"/server/{server_id}/power", "PUT", {"power": "on"})
-            
-            if result:
-                success_count += 1
-                self.log_message(f"✅ {server_name} power on initiated")
+    def wait_for_power_state(self, servers, state, on_done):
+        """Poll the servers until they all report the power state (or time out), then call on_done"""
+        self.log_message(f"⏳ Waiting for {len(servers)} servers to power {state}...")
+        
+        def on_result(result):
+            server, converged, elapsed = result
+            if converged:
+                self.log_message(f"✅ {server.name} is {state} after {elapsed:.1f}s")
             else:
-                self.log_message(f"❌ Failed to power on {server_name}")
-            
-            self.progress_bar.setValue(i + 1)
-            QApplication.processEvents()
-        
-        self.progress_bar.setVisible(False)
-        self.log_message(f"Power on completed: {success_count}/{len(servers)} servers")
-        
-        # Step 4: Final verification
-        QTimer.singleShot(10000, lambda: self.workflow_step_4(servers))
+                self.log_message(f"⚠️ {server.name} did not power {state} within {elapsed:.0f}s")
+        
+        def on_completed(summary):
+            if summary is not None and summary.converged:
+                self.log_message(f"Power {state}: {len(summary.converged)}/{summary.total} servers converged "
+                                 f"(p50 {summary.percentile(0.5):.1f}s, max {summary.percentile(1.0):.1f}s)")
+            on_done(summary)
+        
+        timeout = self.config.get('converge_timeout', DEFAULT_CONVERGE_TIMEOUT)
+        concurrency = self.detail_concurrency()
+        self.run_job(converge_task, self.client, servers, power_is(state), f"Waiting for power {state}",
+                     timeout, concurrency, on_result=on_result, on_completed=on_completed)
     
-    def workflow_step_4(self, servers):
-        """Step 4: Verify changes and refresh"""
-        self.log_message("Step 4: Verifying network changes...")
-        self.status_label.setText("Verifying network changes...")
-        
-        # Refresh server data
+    def finish_workflow(self, servers, counts):
+        """Refresh the table and report the workflow outcome"""
         self.load_servers()
         
-        # Show completion dialog
         QMessageBox.information(
             self, "🎉 Workflow Complete!", 
             f"Smart network switching workflow completed!\n\n"
-            f"✅ Powered off {len(servers)} servers\n"
-            f"✅ Guided manual network configuration\n"
-            f"✅ Powered on {len(servers)} servers\n"
+            f"✅ Switched {counts.get(DONE, 0)} of {len(servers)} servers\n"
+            f"❌ Failed: {counts.get(FAILED, 0)}\n"
             f"✅ Refreshed server data\n\n"
             f"Please verify the network changes in the server table.\n"
             f"IP addresses may have changed - update DNS/firewall rules as needed."
         )
         
-        self.log_message("🎉 Smart network switching workflow completed successfully!")
+        self.log_message("🎉 Smart network switching workflow completed!")
         self.status_label.setText("✅ Network switching workflow completed!")
     
     def perform_power_action(self, action):
@@ -1036,45 +1897,67 @@ IMPORTANT: Configure ALL servers before proceeding to power-on step.""")
             return
         
         action_names = {"on": "Power On", "off": "Power Off", "reboot": "Reboot"}
+        action_name = action_names.get(action, action)
         reply = QMessageBox.question(
             self, "Confirm Action", 
-            f"Are you sure you want to {action_names.get(action, action)} {len(selected_servers)} server(s)?",
+            f"Are you sure you want to {action_name} {len(selected_servers)} server(s)?",
             QMessageBox.Yes | QMessageBox.No
         )
         
         if reply != QMessageBox.Yes:
             return
         
-        self.log_message(f"🔄 {action_names.get(action, action)} initiated for {len(selected_servers)} servers")
+        # The fleet client sends each server's request through its own account
+        self.log_message(f"🔄 {action_name} initiated for {len(selected_servers)} servers"
+                         f"{self.account_breakdown(selected_servers)}")
         
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setRange(0, len(selected_servers))
-        
-        success_count = 0
-        for i, server in enumerate(selected_servers):
-            server_id = server.get('id')
-            server_name = server.get('name', 'Unknown')
-            
-            self.status_label.setText(f"{action_names.get(action, action)}: {server_name}")
-            
-            result = self.make_api_request(f"/server/{server_id}/power", "PUT", {"power": action})
-            
-            if result:
-                success_count += 1
+        def on_result(result):
+            server, success = result
+            server_name = server.name
+            if success:
                 self.log_message(f"✅ {server_name}: {action} successful")
             else:
                 self.log_message(f"❌ {server_name}: {action} failed")
-            
-            self.progress_bar.setValue(i + 1)
-            QApplication.processEvents()
         
-        self.progress_bar.setVisible(False)
-        
-        if success_count > 0:
-            self.log_message(f"✅ {action_names.get(action, action)} completed: {success_count}/{len(selected_servers)} servers")
-            QTimer.singleShot(3000, self.load_servers)
+        def on_completed(summary):
+            self.log_power_summary(action_name, summary)
+            if summary is not None and summary.success_count:
+                # Refresh once the servers actually report their new power state
+                accepted = set(summary.succeeded)
+                servers = [server for server in selected_servers if server.id in accepted]
+                self.wait_for_power_state(servers, "off" if action == "off" else "on",
+                                          lambda convergence: self.load_servers())
+            
+            self.status_label.setText(f"{action_name} completed")
         
-        self.status_label.setText(f"{action_names.get(action, action)} completed")
+        self.run_job(power_task, self.client, selected_servers, action, action_name, self.power_concurrency(),
+                     on_result=on_result, on_completed=on_completed)
+    
+    def power_concurrency(self):
+        return self.config.get('power_concurrency', DEFAULT_POWER_CONCURRENCY) * self.account_count()
+    
+    def log_power_summary(self, label, summary):
+        """Log the outcome of a bulk power job"""
+        if summary is None:
+            self.log_message(f"❌ {label} failed")
+            return
+        self.log_message(f"{label} completed: {summary.success_count}/{summary.total} servers, "
+                         f"{len(summary.failed)} failed in {summary.elapsed:.1f}s")
+    
+    def closeEvent(self, event):
+        self.refresh_timer.stop()
+        self.refresh_jobs.shutdown()
+        self.stop_detail_feed()
+        self.jobs.shutdown()
+        if self.async_bridge is not None:
+            self.async_bridge.shutdown(cleanup=self.async_client.close())
+        if self.inventory_timer.isActive():
+            # Details that arrived since the last save are kept for the next launch
+            self.save_inventory()
+        self.client.close()
+        self.write_metrics_textfile()
+        self.activity_log.close()
+        super().closeEvent(event)
     
     def show_server_info(self):
         """Show information about selected server"""
@@ -1089,15 +1972,11 @@ IMPORTANT: Configure ALL servers before proceeding to power-on step.""")
             return
         
         server = selected_servers[0]
-        server_id = server.get('id')
-        
-        self.progress_bar.setVisible(True)
-        self.progress_bar.setRange(0, 0)
-        QApplication.processEvents()
-        
-        result = self.make_api_request(f"/server/{server_id}", "GET")
-        
-        self.progress_bar.setVisible(False)
+        self.run_job(lambda job: server.detail(self.client),
+                     on_completed=lambda result: self.on_server_info(server, result))
+    
+    def on_server_info(self, server, result):
+        server_id = server.id
         
         if result:
             info_text = f"Server {server_id} Information:\n\n"
@@ -1122,12 +2001,12 @@ IMPORTANT: Configure ALL servers before proceeding to power-on step.""")
             
             msg = QMessageBox(self)
             msg.setWindowTitle("Server Information")
-            msg.setText(f"Detailed information for server {server.get('name', 'Unknown')}")
+            msg.setText(f"Detailed information for server {server.name}")
             msg.setDetailedText(info_text)
             msg.setIcon(QMessageBox.Information)
             msg.exec_()
             
-            self.log_message(f"ℹ️ Showed info for server: {server.get('name', 'Unknown')}")
+            self.log_message(f"ℹ️ Showed info for server: {server.name}")
         else:
             QMessageBox.warning(self, "Error", f"Failed to get information for server {server_id}")
 
@@ -1136,35 +2015,6 @@ def main():
     app = QApplication(sys.argv)
     app.setStyle('Fusion')
     
-    # Show welcome message
-    msg = QMessageBox()
-    msg.setWindowTitle("🚀 Smart Kamatera Manager")
-    msg.setIcon(QMessageBox.Information)
-    msg.setText("Welcome to Smart Kamatera Server Manager!")
-    msg.setInformativeText("Network switching made easy with automated workflows")
-    msg.setDetailedText("""
-FEATURES:
-🔄 Automated power management
-🧠 Smart network switching workflows  
-📋 Step-by-step guidance
-🌐 Automatic console opening
-📊 Real-time workflow logging
-✅ Verification and validation
-
-WORKFLOW PROCESS:
-1. Select servers to switch networks
-2. Click "Smart Network Switch"  
-3. Choose automated workflow
-4. We handle power off automatically
-5. Console opens for manual network config
-6. We handle power on automatically
-7. Verification and completion
-
-This approach combines automation where possible with guided manual steps where needed,
-giving you the best of both worlds for reliable network switching!
-    """)
-    msg.exec_()
-    
     window = KamateraManager()
     window.show()
     
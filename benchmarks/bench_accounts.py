@@ -0,0 +1,71 @@
+"""Loading several accounts one after another vs all at once through FleetClient
+
+    python -m benchmarks.bench_accounts --sizes 2000 500 100 --latency 0.2 0.1 0.05 --page-size 500 --details
+"""
+
+import argparse
+import time
+
+from kamatera import DEFAULT_DETAIL_CONCURRENCY, build_client, build_fleet, stream_inventory
+from kamatera.listing import LISTED
+
+from .fake_api import FakeKamateraAPI
+
+
+def load(client, concurrency, details):
+    """Seconds until the listing and, with details, every detail of ``client`` are in"""
+    started = time.perf_counter()
+    servers = 0
+    for kind, payload in stream_inventory(client, concurrency, details=details):
+        if kind == LISTED:
+            servers += len(payload)
+    return time.perf_counter() - started, servers
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[2000, 500, 100], help="servers per account")
+    parser.add_argument("--latency", type=float, nargs="+", default=[0.2, 0.1, 0.05],
+                        help="seconds per request, per account (the last one repeats)")
+    parser.add_argument("--page-size", type=int, default=500, help="paginate each listing")
+    parser.add_argument("--details", action="store_true", help="also fetch every server's detail")
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_DETAIL_CONCURRENCY,
+                        help="detail requests in flight per account")
+    args = parser.parse_args()
+
+    latencies = args.latency + args.latency[-1:] * (len(args.sizes) - len(args.latency))
+    apis = [FakeKamateraAPI(size, latency, args.page_size, id_prefix=f"acct{i}")
+            for i, (size, latency) in enumerate(zip(args.sizes, latencies))]
+    for api in apis:
+        api.__enter__()
+    try:
+        config = {"rate_limit_rps": 0, "pool_size": 50, "accounts": [
+            {"name": f"acct{i}", "api_key": "bench", "api_secret": "bench", "base_url": api.base_url}
+            for i, api in enumerate(apis)]}
+
+        print(f"accounts={len(apis)} page_size={args.page_size} details={args.details} "
+              f"concurrency={args.concurrency}/account")
+        sequential = 0.0
+        for profile, size, latency in zip(config["accounts"], args.sizes, latencies):
+            client = build_client(dict(config, **profile))
+            try:
+                elapsed, servers = load(client, args.concurrency, args.details)
+            finally:
+                client.close()
+            sequential += elapsed
+            print(f"  {profile['name']}: {servers:>6} servers at {latency * 1000:.0f}ms  {elapsed:6.2f}s")
+
+        fleet = build_fleet(config)
+        try:
+            concurrent, servers = load(fleet, args.concurrency * len(fleet), args.details)
+        finally:
+            fleet.close()
+        print(f"one after another: {sequential:6.2f}s")
+        print(f"all at once:       {concurrent:6.2f}s  ({servers} servers, {sequential / concurrent:.1f}x)")
+    finally:
+        for api in apis:
+            api.__exit__(None, None, None)
+
+
+if __name__ == "__main__":
+    main()
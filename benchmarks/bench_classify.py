@@ -0,0 +1,138 @@
+"""Network classification over synthetic detail payloads: startswith checks vs CIDR tables
+
+The legacy path is the old extract_ip_and_network_info, which looks at the
+first address of the first NIC and treats all of 172.* as private.
+
+    python -m benchmarks.bench_classify --payloads 100000 --private-cidrs 203.0.113.0/24
+"""
+
+import argparse
+import random
+import time
+
+from kamatera import NetworkClassifier
+
+
+def legacy_extract(detailed_info):
+    """The old extract_ip_and_network_info: first IP of the first NIC, startswith checks"""
+    ip_address = "N/A"
+    network_type = "Unknown"
+
+    try:
+        if "networks" in detailed_info and isinstance(detailed_info["networks"], list) and detailed_info["networks"]:
+            for network in detailed_info["networks"]:
+                if isinstance(network, dict) and "ips" in network:
+                    if isinstance(network["ips"], list) and network["ips"]:
+                        ip_address = network["ips"][0]
+
+                        if "name" in network:
+                            network_name = network["name"].lower()
+                            if "private" in network_name or "local" in network_name:
+                                network_type = "Private"
+                            elif "public" in network_name or "internet" in network_name:
+                                network_type = "Public"
+
+                        if network_type == "Unknown" and ip_address != "N/A":
+                            if (ip_address.startswith("10.") or
+                                    ip_address.startswith("172.") or
+                                    ip_address.startswith("192.168.")):
+                                network_type = "Private"
+                            else:
+                                network_type = "Public"
+                        break
+
+        if ip_address == "N/A":
+            ip_fields = ["ip", "ipAddress", "primaryIP", "publicIP", "privateIP"]
+            for field in ip_fields:
+                if field in detailed_info and detailed_info[field]:
+                    ip_address = detailed_info[field]
+                    if "private" in field.lower():
+                        network_type = "Private"
+                    elif "public" in field.lower():
+                        network_type = "Public"
+                    break
+
+    except (KeyError, IndexError, TypeError, AttributeError):
+        # Malformed payloads keep whatever was found so far
+        pass
+
+    return ip_address, network_type
+
+
+def random_ip(rng, kind):
+    if kind == "rfc1918":
+        return rng.choice([f"10.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}",
+                           f"172.{rng.randrange(16, 32)}.{rng.randrange(256)}.{rng.randrange(1, 255)}",
+                           f"192.168.{rng.randrange(256)}.{rng.randrange(1, 255)}"])
+    if kind == "cgnat":
+        return f"100.{rng.randrange(64, 128)}.{rng.randrange(256)}.{rng.randrange(1, 255)}"
+    if kind == "172-public":
+        return f"172.{rng.randrange(32, 256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}"
+    if kind == "ipv6":
+        return f"2a00:{rng.randrange(65536):x}::{rng.randrange(65536):x}"
+    return f"{rng.choice([45, 82, 185, 212])}.{rng.randrange(256)}.{rng.randrange(256)}.{rng.randrange(1, 255)}"
+
+
+def make_payloads(count, seed=0):
+    """Details shaped like GET /server/{id}: one or more NICs, sometimes several addresses each"""
+    rng = random.Random(seed)
+    payloads = []
+    for i in range(count):
+        shape = rng.random()
+        if shape < 0.4:
+            networks = [{"name": "wan-eu", "ips": [random_ip(rng, "public")]}]
+        elif shape < 0.6:
+            networks = [{"name": "lan-eu", "ips": [random_ip(rng, "rfc1918")]}]
+        elif shape < 0.75:
+            # Private NIC listed before the public one
+            networks = [{"name": "lan-eu", "ips": [random_ip(rng, "rfc1918")]},
+                        {"name": "wan-eu", "ips": [random_ip(rng, "public"), random_ip(rng, "ipv6")]}]
+        elif shape < 0.85:
+            networks = [{"name": "wan-eu", "ips": [random_ip(rng, "172-public")]}]
+        elif shape < 0.95:
+            networks = [{"name": "lan-eu", "ips": [random_ip(rng, "cgnat")]}]
+        else:
+            payloads.append({"id": f"srv-{i}", "primaryIP": random_ip(rng, "public")})
+            continue
+        payloads.append({"id": f"srv-{i}", "networks": networks})
+    return payloads
+
+
+def timed(function, payloads):
+    started = time.perf_counter()
+    results = [function(payload) for payload in payloads]
+    return time.perf_counter() - started, results
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--payloads", type=int, default=100000)
+    parser.add_argument("--private-cidrs", nargs="*", default=[], help="extra private ranges, as in config.json")
+    parser.add_argument("--seed", type=int, default=0)
+    args = parser.parse_args()
+
+    payloads = make_payloads(args.payloads, args.seed)
+    started = time.perf_counter()
+    classifier = NetworkClassifier(args.private_cidrs, memo_size=4 * args.payloads)
+    build = time.perf_counter() - started
+
+    legacy_time, legacy = timed(legacy_extract, payloads)
+    cold_time, cold = timed(classifier.classify, payloads)
+    warm_time, _ = timed(classifier.classify, payloads)
+    started = time.perf_counter()
+    batch = classifier.classify_many((payload["id"], payload) for payload in payloads)
+    batch_time = time.perf_counter() - started
+    assert list(batch.values()) == cold
+
+    disagree = sum(1 for old, new in zip(legacy, cold) if old[1] != new[1])
+    print(f"payloads={args.payloads} tables built in {build * 1000:.2f} ms")
+    print(f"{'path':<28} {'total (s)':>10} {'per payload (us)':>17}")
+    for label, seconds in (("legacy startswith", legacy_time), ("classifier, cold memo", cold_time),
+                           ("classifier, warm memo", warm_time), ("classify_many, warm memo", batch_time)):
+        print(f"{label:<28} {seconds:>10.3f} {seconds / args.payloads * 1e6:>17.2f}")
+    print(f"network type differs from legacy for {disagree} payloads ({disagree / args.payloads:.0%}): "
+          f"172.32-255.x.x, private NIC listed first, IPv6")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,52 @@
+"""Cold-start time of the headless CLI vs the GUI module
+
+Each command runs in a fresh interpreter, so imports are paid every time. The
+GUI figure only covers importing app.py and creating the QApplication, which
+is a lower bound for opening the window.
+
+    python -m benchmarks.bench_cold_start --runs 5
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+import time
+
+COMMANDS = [
+    ("python (baseline)", [sys.executable, "-c", "pass"]),
+    ("python -m kamatera --help", [sys.executable, "-m", "kamatera", "--help"]),
+    ("import app + QApplication", [sys.executable, "-c", "import app; app.QApplication([])"]),
+]
+
+
+def cold_start(command, runs, env):
+    times = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        subprocess.run(command, check=True, stdout=subprocess.DEVNULL, env=env)
+        times.append(time.perf_counter() - start)
+    return statistics.median(times), min(times)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    for module in ("PyQt5", "asyncio"):
+        loaded = subprocess.run([sys.executable, "-c", f"import sys, kamatera.cli; print({module!r} in sys.modules)"],
+                                check=True, capture_output=True, text=True).stdout.strip()
+        print(f"CLI imports {module}: {loaded}")
+
+    print(f"{'command':>26} {'median (ms)':>12} {'best (ms)':>10}")
+    for name, command in COMMANDS:
+        median, best = cold_start(command, args.runs, env)
+        print(f"{name:>26} {median * 1000:>12.0f} {best * 1000:>10.0f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,84 @@
+"""Time until the visible rows have details: fetch every detail vs only the viewport's
+
+    python -m benchmarks.bench_lazy_details --sizes 1000 10000 --visible 30 --latency 0.05
+"""
+
+import argparse
+import time
+
+from kamatera import DEFAULT_DETAIL_CONCURRENCY, PriorityDetailFetcher, build_client, stream_inventory
+from kamatera.listing import DETAIL, LISTED
+
+from .fake_api import FakeKamateraAPI
+
+
+def eager(client, visible, concurrency):
+    """What load_servers used to do: request every detail as the listing arrives"""
+    started = time.perf_counter()
+    wanted = None
+    visible_at = None
+    for kind, payload in stream_inventory(client, concurrency):
+        if kind == LISTED and wanted is None:
+            wanted = {record.id for record in payload[:visible]}
+        elif kind == DETAIL:
+            wanted.discard(payload[0])
+            if not wanted and visible_at is None:
+                visible_at = time.perf_counter() - started
+    return visible_at, time.perf_counter() - started
+
+
+def lazy(client, visible, margin, concurrency):
+    """List, then fetch the viewport and its prefetch margin at foreground priority (no background fill)"""
+    started = time.perf_counter()
+    ids = [server["id"] for server in client.list_servers()]
+    fetcher = PriorityDetailFetcher(client, concurrency, background_workers=0)
+    fetcher.want(ids[:visible + margin])
+    wanted = set(ids[:visible])
+    visible_at = None
+    received = 0
+    for server_id, _, _ in fetcher.results():
+        received += 1
+        wanted.discard(server_id)
+        if not wanted and visible_at is None:
+            visible_at = time.perf_counter() - started
+        if received == visible + margin:
+            break
+    fetcher.close()
+    return visible_at, time.perf_counter() - started
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--visible", type=int, default=30, help="rows in view")
+    parser.add_argument("--margin", type=int, default=20, help="prefetch rows beyond the view")
+    parser.add_argument("--latency", type=float, default=0.05)
+    parser.add_argument("--concurrency", type=int, default=DEFAULT_DETAIL_CONCURRENCY)
+    args = parser.parse_args()
+
+    print(f"latency={args.latency * 1000:.0f}ms concurrency={args.concurrency} visible={args.visible} "
+          f"margin={args.margin}")
+    print(f"{'servers':>8} {'eager visible (s)':>18} {'eager all (s)':>14} {'requests':>9} "
+          f"{'lazy visible (s)':>17} {'requests':>9}")
+    for size in args.sizes:
+        row = []
+        for mode in ("eager", "lazy"):
+            with FakeKamateraAPI(size, args.latency) as api:
+                config = {"base_url": api.base_url, "api_key": "bench", "api_secret": "bench",
+                          "rate_limit_rps": 0, "pool_size": 50}
+                client = build_client(config)
+                try:
+                    if mode == "eager":
+                        row += eager(client, args.visible, args.concurrency)
+                    else:
+                        row.append(lazy(client, args.visible, args.margin, args.concurrency)[0])
+                finally:
+                    client.close()
+                row.append(api.request_count)
+        eager_visible, eager_all, eager_requests, lazy_visible, lazy_requests = row
+        print(f"{size:>8} {eager_visible:>18.2f} {eager_all:>14.2f} {eager_requests:>9} "
+              f"{lazy_visible:>17.2f} {lazy_requests:>9}")
+
+
+if __name__ == "__main__":
+    main()
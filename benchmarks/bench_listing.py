@@ -0,0 +1,70 @@
+"""Time-to-first-row and peak memory of the whole vs streamed /servers listing
+
+Run from the repository root:
+
+    python -m benchmarks.bench_listing --sizes 1000 20000 --page-size 500
+"""
+
+import argparse
+import time
+import tracemalloc
+
+from kamatera import KamateraClient
+
+from .fake_api import FakeKamateraAPI
+
+
+def whole_listing(client):
+    """Nothing is shown until every page is in memory, as load_servers used to do"""
+    started = time.perf_counter()
+    servers = client.list_servers()
+    return time.perf_counter() - started, len(servers)
+
+
+def streamed(client):
+    started = time.perf_counter()
+    first_row = None
+    count = 0
+    for chunk in client.iter_servers():
+        if first_row is None:
+            first_row = time.perf_counter() - started
+        # Rows are handed over and dropped, as a consumer rendering them would
+        count += len(chunk)
+    return first_row, count
+
+
+def measure(fn, client):
+    tracemalloc.start()
+    try:
+        first_row, count = fn(client)
+        peak = tracemalloc.get_traced_memory()[1]
+    finally:
+        tracemalloc.stop()
+    return first_row, count, peak
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 20000])
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated per-request latency (s)")
+    parser.add_argument("--page-size", type=int, default=500, help="page size of the paginated run")
+    args = parser.parse_args()
+
+    print(f"latency={args.latency * 1000:.0f}ms page_size={args.page_size}")
+    print(f"{'servers':>8} {'pages':>6} {'first row whole (s)':>20} {'streamed (s)':>13} "
+          f"{'peak whole (MB)':>16} {'streamed (MB)':>14}")
+    for size in args.sizes:
+        for page_size in (None, args.page_size):
+            with FakeKamateraAPI(size, args.latency, page_size=page_size) as api:
+                client = KamateraClient("bench", "bench", base_url=api.base_url)
+                whole_first, _, whole_peak = measure(whole_listing, client)
+                first_row, count, peak = measure(streamed, client)
+                client.close()
+            assert count == size
+            pages = "no" if page_size is None else str(-(-size // page_size))
+            print(f"{size:>8} {pages:>6} {whole_first:>20.3f} {first_row:>13.3f} "
+                  f"{whole_peak / 1e6:>16.1f} {peak / 1e6:>14.1f}")
+
+
+if __name__ == "__main__":
+    main()
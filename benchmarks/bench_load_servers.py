@@ -0,0 +1,68 @@
+"""Wall-clock comparison of serial vs concurrent detail fetching in load_servers
+
+Run from the repository root:
+
+    python -m benchmarks.bench_load_servers --latency 0.02 --concurrency 10
+"""
+
+import argparse
+import asyncio
+import time
+
+from kamatera import AsyncKamateraClient, KamateraClient, fetch_server_details
+from kamatera.aio import aiohttp
+
+from .fake_api import FakeKamateraAPI
+
+
+def load_serial(client):
+    servers = client.list_servers()
+    return [client.get_server(server["id"]) for server in servers]
+
+
+def load_concurrent(client, concurrency):
+    servers = client.list_servers()
+    return [detail for _, detail, _ in fetch_server_details(client, [s["id"] for s in servers], concurrency)]
+
+
+def load_async(base_url, max_in_flight):
+    async def run():
+        async with AsyncKamateraClient("bench", "bench", base_url=base_url, max_in_flight=max_in_flight) as client:
+            servers = await client.list_servers()
+            return [detail async for _, detail, _ in client.iter_server_details(s["id"] for s in servers)]
+    return asyncio.run(run())
+
+
+def timed(fn, *args):
+    start = time.perf_counter()
+    result = fn(*args)
+    return time.perf_counter() - start, len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--latency", type=float, default=0.02, help="simulated per-request latency (s)")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--max-in-flight", type=int, default=100, help="asyncio client cap (needs aiohttp)")
+    args = parser.parse_args()
+
+    print(f"latency={args.latency * 1000:.0f}ms concurrency={args.concurrency} max_in_flight={args.max_in_flight}")
+    print(f"{'servers':>8} {'serial (s)':>11} {'concurrent (s)':>15} {'speedup':>8} {'asyncio (s)':>12}")
+    for size in args.sizes:
+        with FakeKamateraAPI(size, args.latency) as api:
+            client = KamateraClient("bench", "bench", base_url=api.base_url, pool_size=args.concurrency)
+            serial, count = timed(load_serial, client)
+            concurrent, concurrent_count = timed(load_concurrent, client, args.concurrency)
+            client.close()
+            async_column = "n/a"
+            if aiohttp is not None:
+                elapsed, async_count = timed(load_async, api.base_url, args.max_in_flight)
+                assert async_count == size
+                async_column = f"{elapsed:.2f}"
+        assert count == concurrent_count == size
+        print(f"{size:>8} {serial:>11.2f} {concurrent:>15.2f} {serial / concurrent:>7.1f}x {async_column:>12}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,74 @@
+"""Workflow log throughput: per-message append + processEvents vs the batched ring buffer
+
+Runs offscreen unless QT_QPA_PLATFORM is set:
+
+    python -m benchmarks.bench_log --messages 1000 10000 --buffer 5000
+"""
+
+import argparse
+import os
+import time
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+
+from PyQt5.QtWidgets import QApplication, QPlainTextEdit, QTextEdit
+
+from kamatera import ActivityLog
+
+
+def log_per_message(app, count):
+    """What log_message used to do: grow a QTextEdit and re-enter the event loop every time"""
+    view = QTextEdit()
+    view.show()
+    started = time.perf_counter()
+    for i in range(count):
+        view.append(f"[0] message {i}")
+        app.processEvents()
+    elapsed = time.perf_counter() - started
+    blocks = view.document().blockCount()
+    view.close()
+    return elapsed, blocks
+
+
+def log_batched(app, count, buffer_size, batch):
+    """Append to the ring buffer and flush into a block-limited QPlainTextEdit every ``batch`` messages
+
+    In the app the flush runs on a 100 ms timer; flushing every ``batch``
+    messages stands in for a workflow producing that many messages per tick.
+    """
+    view = QPlainTextEdit()
+    view.setMaximumBlockCount(buffer_size + 1)
+    view.show()
+    log = ActivityLog(buffer_size)
+    started = time.perf_counter()
+    for i in range(count):
+        log.append(f"message {i}")
+        if (i + 1) % batch == 0 or i + 1 == count:
+            entries = log.drain()
+            if entries:
+                view.appendPlainText("\n".join(entry.format() for entry in entries))
+            app.processEvents()
+    elapsed = time.perf_counter() - started
+    blocks = view.blockCount()
+    view.close()
+    return elapsed, blocks
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--messages", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--buffer", type=int, default=5000, help="ring buffer and view block limit")
+    parser.add_argument("--batch", type=int, default=200, help="messages per flush")
+    args = parser.parse_args()
+
+    app = QApplication([])
+    print(f"buffer={args.buffer} batch={args.batch}")
+    print(f"{'messages':>9} {'per-message (s)':>16} {'blocks':>7} {'batched (s)':>12} {'blocks':>7} {'speedup':>8}")
+    for count in args.messages:
+        old, old_blocks = log_per_message(app, count)
+        new, new_blocks = log_batched(app, count, args.buffer, args.batch)
+        print(f"{count:>9} {old:>16.3f} {old_blocks:>7} {new:>12.3f} {new_blocks:>7} {old / new:>7.1f}x")
+
+
+if __name__ == "__main__":
+    main()
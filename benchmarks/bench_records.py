@@ -0,0 +1,64 @@
+"""tracemalloc comparison of the server representation: listing dicts vs ServerRecord
+
+The dict path mirrors the old app: the decoded /servers entries kept as-is and
+mutated in place with ip, network, current_status and current_power.
+
+    python -m benchmarks.bench_records --sizes 1000 10000 100000
+"""
+
+import argparse
+import json
+import tracemalloc
+
+from kamatera import ServerRecord
+
+from .fake_api import make_fleet
+
+
+def build_dicts(payload):
+    servers = json.loads(payload)
+    for server in servers:
+        server['ip'] = "45.0.0.1"
+        server['network'] = "Public"
+        server['current_status'] = server.get('status') or 'unknown'
+        server['current_power'] = server.get('power') or 'unknown'
+    return servers
+
+
+def build_records(payload):
+    servers = [ServerRecord.from_listing(server) for server in json.loads(payload)]
+    for server in servers:
+        server.ip = "45.0.0.1"
+        server.network = "Public"
+    return servers
+
+
+def retained(fn, payload):
+    """Bytes still allocated by fn's result once it returns"""
+    tracemalloc.start()
+    try:
+        result = fn(payload)
+        current, _ = tracemalloc.get_traced_memory()
+    finally:
+        tracemalloc.stop()
+    return current, len(result)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000, 100000])
+    args = parser.parse_args()
+
+    print(f"{'servers':>8} {'dicts (KiB)':>12} {'records (KiB)':>14} {'B/server':>15} {'saving':>7}")
+    for size in args.sizes:
+        payload = json.dumps(make_fleet(size))
+        dict_bytes, count = retained(build_dicts, payload)
+        record_bytes, record_count = retained(build_records, payload)
+        assert count == record_count == size
+        per_server = f"{dict_bytes // size} -> {record_bytes // size}"
+        print(f"{size:>8} {dict_bytes / 1024:>12.0f} {record_bytes / 1024:>14.0f} {per_server:>15} "
+              f"{1 - record_bytes / dict_bytes:>6.0%}")
+
+
+if __name__ == "__main__":
+    main()
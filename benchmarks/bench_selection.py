@@ -0,0 +1,85 @@
+"""Micro-benchmark of selection lookups: legacy row walk vs ServerStore
+
+The legacy path mirrors the old get_selected_servers/select_all_servers: walk
+every row, read its checkbox, then linearly scan the server list for the id.
+
+    python -m benchmarks.bench_selection --sizes 1000 10000 --selected 10 100
+"""
+
+import argparse
+import random
+import timeit
+
+from kamatera import ServerStore
+
+from .fake_api import make_fleet
+
+
+def legacy_selected(rows, servers):
+    selected = []
+    for row_id, checked in rows:
+        if checked:
+            for server in servers:
+                if server.get('id') == row_id:
+                    selected.append(server)
+                    break
+    return selected
+
+
+def legacy_select_all(rows):
+    for row in range(len(rows)):
+        rows[row] = (rows[row][0], True)
+
+
+def legacy_lookup(servers, server_id):
+    for server in servers:
+        if server.get('id') == server_id:
+            return server
+    return None
+
+
+def best_of(fn, number):
+    return min(timeit.repeat(fn, number=number, repeat=5)) / number * 1e6
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--sizes", type=int, nargs="+", default=[1000, 10000])
+    parser.add_argument("--selected", type=int, nargs="+", default=[10, 100])
+    args = parser.parse_args()
+
+    print(f"{'servers':>8} {'selected':>9} {'operation':>14} {'legacy (us)':>12} {'store (us)':>11}")
+    for size in args.sizes:
+        servers = make_fleet(size)
+        ids = [server["id"] for server in servers]
+
+        store = ServerStore()
+        store.insert_rows(0, ids, servers)
+        store.reindex()
+
+        for count in args.selected:
+            picked = set(random.sample(ids, count))
+            rows = [(server_id, server_id in picked) for server_id in ids]
+            store.clear_selection()
+            for server_id in picked:
+                store.set_selected(server_id, True)
+            assert [s["id"] for s in legacy_selected(rows, servers)] == store.selected_keys()
+
+            number = 3 if size * count > 100000 else 20
+            results = [
+                ("get selection", best_of(lambda: legacy_selected(rows, servers), number),
+                 best_of(store.selected_servers, 1000)),
+            ]
+            for name, legacy, indexed in results:
+                print(f"{size:>8} {count:>9} {name:>14} {legacy:>12.1f} {indexed:>11.2f}")
+
+        target = ids[-1]
+        rows = [(server_id, False) for server_id in ids]
+        print(f"{size:>8} {'-':>9} {'select all':>14} {best_of(lambda: legacy_select_all(rows), 20):>12.1f} "
+              f"{best_of(store.select_all, 1000):>11.2f}")
+        print(f"{size:>8} {'-':>9} {'lookup by id':>14} {best_of(lambda: legacy_lookup(servers, target), 20):>12.1f} "
+              f"{best_of(lambda: store.get(target), 1000):>11.2f}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,69 @@
+"""GUI startup timings: time-to-first-paint and time-to-interactive
+
+Each run starts the real KamateraManager in a fresh interpreter (offscreen
+unless QT_QPA_PLATFORM is set) against the local fake API. Times are in ms
+from the start of app.py's imports. "interactive" is when the first
+inventory is in the table.
+
+    python -m benchmarks.bench_startup --runs 5 --servers 100 --latency 0.05
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+
+from .fake_api import FakeKamateraAPI
+
+REPO_ROOT = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+CHILD = """
+import json, sys
+sys.path.insert(0, {root!r})
+import app
+qt_app = app.QApplication(sys.argv)
+window = app.KamateraManager()
+# Closing the window stops the load that is still streaming in before the app quits
+window.startup_finished.connect(lambda times: (print(json.dumps(times), flush=True), window.close(), qt_app.quit()))
+window.show()
+qt_app.exec_()
+"""
+
+
+def run_once(workdir, env):
+    start = time.perf_counter()
+    result = subprocess.run([sys.executable, "-c", CHILD.format(root=REPO_ROOT)], cwd=workdir, env=env,
+                            check=True, capture_output=True, text=True, timeout=60)
+    wall = (time.perf_counter() - start) * 1000
+    times = json.loads(result.stdout.strip().splitlines()[-1])
+    times["process"] = wall
+    return times
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument("--servers", type=int, default=100)
+    parser.add_argument("--latency", type=float, default=0.05, help="simulated per-request latency (s)")
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    env.setdefault("QT_QPA_PLATFORM", "offscreen")
+    columns = ("window_created", "first_paint", "interactive", "process")
+    with FakeKamateraAPI(args.servers, args.latency) as api, tempfile.TemporaryDirectory() as workdir:
+        with open(os.path.join(workdir, "config.json"), "w") as f:
+            json.dump({"api_key": "bench", "api_secret": "bench", "base_url": api.base_url,
+                       "show_welcome": False}, f)
+        runs = [run_once(workdir, env) for _ in range(args.runs)]
+
+    print(f"servers={args.servers} latency={args.latency * 1000:.0f}ms runs={args.runs} (median ms)")
+    print(" ".join(f"{name:>15}" for name in columns))
+    print(" ".join(f"{statistics.median(run[name] for run in runs):>15.0f}" for name in columns))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,197 @@
+"""End-to-end benchmark suite against the mock API, with a history of results
+
+Runs the same core code paths as the GUI against benchmarks.fake_api:
+the streamed load (listing + details), a bulk power off waited to
+convergence, and the full network-switch workflow. Every run is appended to
+a JSON Lines history and compared with the previous run of the same
+parameters:
+
+    python -m benchmarks.bench_suite --servers 500 --latency 0.05 --power-delay 1
+    python -m benchmarks.bench_suite --servers 500 --error-rate 0.02 --rate-limit 200
+"""
+
+import argparse
+import datetime
+import json
+import os
+import subprocess
+import time
+
+from kamatera import (DEFAULT_DETAIL_CONCURRENCY, DEFAULT_POWER_CONCURRENCY, DEFAULT_WORKFLOW_CONCURRENCY,
+                      ConvergenceSummary, PowerSummary, build_client, extract_ip_and_network_info, power_is,
+                      run_network_switch, set_power_many, stream_inventory, wait_for_servers)
+from kamatera.listing import DETAIL, LISTED
+from kamatera.workflow import DONE, FINAL_STAGES
+
+from .fake_api import FakeKamateraAPI
+
+RESULTS_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), "results.jsonl")
+
+
+def latency_ms(metrics, method, endpoint, name):
+    """{name}_p50_ms/_p95_ms/_p99_ms of one endpoint from the client's ApiMetrics"""
+    for row in metrics.snapshot():
+        if row["method"] == method and row["endpoint"] == endpoint:
+            return {f"{name}_{key}_ms": round(row[key] * 1000, 1) for key in ("p50", "p95", "p99")}
+    return {}
+
+
+def bench_load(client, concurrency):
+    started = time.perf_counter()
+    first_row = None
+    servers = details = errors = 0
+    for kind, payload in stream_inventory(client, concurrency):
+        if kind == LISTED:
+            if first_row is None:
+                first_row = time.perf_counter() - started
+            servers += len(payload)
+        elif kind == DETAIL:
+            details += 1
+            errors += payload[2] is not None
+    elapsed = time.perf_counter() - started
+    return {
+        "servers": servers,
+        "errors": errors,
+        "first_row_s": round(first_row or 0.0, 3),
+        "elapsed_s": round(elapsed, 3),
+        "servers_per_s": round(details / elapsed, 1),
+        **latency_ms(client.metrics, "GET", "/server/{id}", "detail"),
+    }
+
+
+def bench_power(client, server_ids, concurrency, timeout):
+    started = time.perf_counter()
+    summary = PowerSummary("off", len(server_ids))
+    for server_id, result, error in set_power_many(client, server_ids, "off", concurrency):
+        summary.record(server_id, result, error)
+    accepted = time.perf_counter() - started
+    convergence = ConvergenceSummary(len(summary.succeeded))
+    for server_id, converged, elapsed, _ in wait_for_servers(client, summary.succeeded, power_is("off"), timeout,
+                                                             concurrency):
+        convergence.record(server_id, converged, elapsed)
+    elapsed = time.perf_counter() - started
+    return {
+        "servers": len(server_ids),
+        "failed": len(summary.failed),
+        "timed_out": len(convergence.timed_out),
+        "accepted_s": round(accepted, 3),
+        "elapsed_s": round(elapsed, 3),
+        "servers_per_s": round(len(convergence.converged) / elapsed, 1),
+        "converge_p50_s": round(convergence.percentile(0.5) or 0.0, 3),
+        "converge_p95_s": round(convergence.percentile(0.95) or 0.0, 3),
+        **latency_ms(client.metrics, "PUT", "/server/{id}/power", "power"),
+    }
+
+
+def bench_workflow(client, server_ids, concurrency, timeout):
+    verify = lambda detail: extract_ip_and_network_info(detail)[1].lower() == "private"
+    started = time.perf_counter()
+    finished = {}
+    for server_id, stage, _ in run_network_switch(client, server_ids, "private", concurrency, verify=verify,
+                                                  timeout=timeout):
+        if stage in FINAL_STAGES:
+            finished[server_id] = (stage, time.perf_counter() - started)
+    elapsed = time.perf_counter() - started
+    done = sorted(seconds for stage, seconds in finished.values() if stage == DONE)
+    return {
+        "servers": len(server_ids),
+        "done": len(done),
+        "elapsed_s": round(elapsed, 3),
+        "servers_per_min": round(len(done) / elapsed * 60, 1),
+        "done_p50_s": round(done[len(done) // 2], 3) if done else None,
+        **latency_ms(client.metrics, "PUT", "/server/{id}", "network"),
+    }
+
+
+def git_commit():
+    try:
+        return subprocess.run(["git", "rev-parse", "--short", "HEAD"], capture_output=True, text=True,
+                              check=True, cwd=os.path.dirname(os.path.abspath(__file__))).stdout.strip()
+    except (OSError, subprocess.CalledProcessError):
+        return None
+
+
+def previous_run(path, params):
+    if not os.path.exists(path):
+        return None
+    previous = None
+    with open(path) as f:
+        for line in f:
+            record = json.loads(line)
+            if record.get("params") == params:
+                previous = record
+    return previous
+
+
+def print_results(results, previous):
+    for scenario, values in results.items():
+        print(f"{scenario}:")
+        before = (previous or {}).get("results", {}).get(scenario, {})
+        for key, value in values.items():
+            change = ""
+            old = before.get(key)
+            if isinstance(value, (int, float)) and isinstance(old, (int, float)) and old:
+                change = f"  ({(value - old) / old:+.0%} vs {previous['commit'] or 'previous'})"
+            print(f"  {key:<20} {value}{change}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--servers", type=int, default=200)
+    parser.add_argument("--latency", type=float, default=0.05, help="mock latency per request (s)")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random mock latency (s)")
+    parser.add_argument("--page-size", type=int, help="paginate the mock /servers listing")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of mock 500 responses")
+    parser.add_argument("--rate-limit", type=int, help="mock requests per second before 429s")
+    parser.add_argument("--power-delay", type=float, default=1.0, help="mock power transition time (s)")
+    parser.add_argument("--workflow-servers", type=int, default=20, help="servers put through the workflow")
+    parser.add_argument("--rate-limit-rps", type=float, default=0,
+                        help="client-side rate_limit_rps (0 = off, the app default is 10)")
+    parser.add_argument("--timeout", type=float, default=120.0, help="convergence timeout (s)")
+    parser.add_argument("--results", default=RESULTS_FILE, help="JSON Lines history (default: %(default)s)")
+    parser.add_argument("--no-record", action="store_true", help="do not append this run to the history")
+    args = parser.parse_args()
+
+    params = {key: getattr(args, key) for key in ("servers", "latency", "jitter", "page_size", "error_rate",
+                                                  "rate_limit", "power_delay", "workflow_servers",
+                                                  "rate_limit_rps")}
+    results = {}
+    with FakeKamateraAPI(args.servers, args.latency, args.page_size, args.jitter, args.error_rate,
+                         args.rate_limit, power_delay=args.power_delay, seed=0) as api:
+        config = {"base_url": api.base_url, "api_key": "bench", "api_secret": "bench",
+                  "rate_limit_rps": args.rate_limit_rps, "pool_size": 50}
+        server_ids = [server["id"] for server in api.fleet]
+        for scenario in ("load", "power", "workflow"):
+            # A fresh client per scenario keeps the metrics and the detail cache apart
+            client = build_client(config)
+            try:
+                if scenario == "load":
+                    results[scenario] = bench_load(client, DEFAULT_DETAIL_CONCURRENCY)
+                elif scenario == "power":
+                    results[scenario] = bench_power(client, server_ids, DEFAULT_POWER_CONCURRENCY, args.timeout)
+                else:
+                    # The power scenario left every server off; the workflow expects them on
+                    workflow_ids = server_ids[:args.workflow_servers]
+                    list(set_power_many(client, workflow_ids, "on", DEFAULT_POWER_CONCURRENCY))
+                    list(wait_for_servers(client, workflow_ids, power_is("on"), args.timeout))
+                    client.metrics.reset()
+                    results[scenario] = bench_workflow(client, workflow_ids, DEFAULT_WORKFLOW_CONCURRENCY,
+                                                       args.timeout)
+            finally:
+                client.close()
+        results["mock"] = {"requests": api.request_count,
+                           **{f"status_{status}": count for status, count in sorted(api.statuses.items())}}
+
+    record = {"time": datetime.datetime.now().isoformat(timespec="seconds"), "commit": git_commit(),
+              "params": params, "results": results}
+    print(f"servers={args.servers} latency={args.latency * 1000:.0f}ms error_rate={args.error_rate} "
+          f"rate_limit={args.rate_limit} power_delay={args.power_delay}s")
+    print_results(results, previous_run(args.results, params))
+    if not args.no_record:
+        with open(args.results, "a") as f:
+            f.write(json.dumps(record) + "\n")
+        print(f"Appended to {args.results}")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,256 @@
+"""Local stand-in for the Kamatera API used by the benchmarks
+
+It serves a synthetic fleet over real HTTP so the client, the GUI and the CLI
+can be measured without the console. Latency, random failures, 429s and power
+transitions are all configurable. Run it on its own and point ``base_url`` in
+config.json at it:
+
+    python -m benchmarks.fake_api --servers 1000 --latency 0.05 --port 8081
+"""
+
+import argparse
+import json
+import random
+import threading
+import time
+from collections import Counter
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import parse_qs
+
+
+def make_fleet(size, id_prefix="srv"):
+    return [
+        {"id": f"{id_prefix}-{i:05d}", "name": f"server-{i}", "status": "running", "power": "on"}
+        for i in range(size)
+    ]
+
+
+def public_network(index):
+    return {"name": "wan-eu", "ips": [f"45.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}"]}
+
+
+def private_network(index):
+    return {"name": "lan-eu", "ips": [f"10.{index // 65536 % 256}.{index // 256 % 256}.{index % 256}"]}
+
+
+def make_detail(server, index):
+    return {**server, "networks": [public_network(index)]}
+
+
+class FakeKamateraAPI:
+    """Serves /servers, /server/{id}, /server/{id}/power and the network PUT for a synthetic fleet
+
+    - ``latency`` (+ up to ``jitter``) seconds are spent on every request.
+    - ``page_size`` turns /servers into {"servers", "page", "total_pages"}
+      envelopes taking a ``page`` query parameter.
+    - ``error_rate`` is the fraction of requests answered with a 500.
+    - ``rate_limit`` caps requests per second; the excess gets a 429 with
+      ``Retry-After: retry_after``.
+    - Power actions complete ``power_delay`` seconds after they are accepted,
+      until then the server reports status "pending". A network change is
+      refused with a 409 while the server is powered on, like a console that
+      needs the server off; ``allow_network_change=False`` refuses it always.
+
+    ``id_prefix`` starts every server id, so several instances can stand in
+    for separate accounts. ``fleet`` and ``details`` hold the live state; ``statuses`` counts the
+    responses sent by status code.
+    """
+
+    def __init__(self, fleet_size=10, latency=0.02, page_size=None, jitter=0.0, error_rate=0.0,
+                 rate_limit=None, retry_after=1, power_delay=0.0, allow_network_change=True, seed=None,
+                 port=0, id_prefix="srv"):
+        self.fleet = make_fleet(fleet_size, id_prefix)
+        self.page_size = page_size
+        self.details = {server["id"]: make_detail(server, i) for i, server in enumerate(self.fleet)}
+        self.latency = latency
+        self.jitter = jitter
+        self.error_rate = error_rate
+        self.rate_limit = rate_limit
+        self.retry_after = retry_after
+        self.power_delay = power_delay
+        self.allow_network_change = allow_network_change
+        self.request_count = 0
+        self.statuses = Counter()
+        self._index = {server["id"]: i for i, server in enumerate(self.fleet)}
+        # Listing entries by id, so power changes reach them even after tests edit ``fleet``
+        self._listed = {server["id"]: server for server in self.fleet}
+        # server id -> (target power, time the action completes)
+        self._transitions = {}
+        self._window = (0, 0)
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+            disable_nagle_algorithm = True
+
+            def log_message(self, format, *args):
+                pass
+
+            def do_GET(self):
+                status, payload, headers = api.handle("GET", self.path, None)
+                self._reply(status, payload, headers)
+
+            def do_PUT(self):
+                length = int(self.headers.get("Content-Length") or 0)
+                body = self.rfile.read(length)
+                try:
+                    data = json.loads(body) if body else {}
+                except ValueError:
+                    self._reply(400, {"message": "invalid JSON"}, {})
+                    return
+                status, payload, headers = api.handle("PUT", self.path, data)
+                self._reply(status, payload, headers)
+
+            def _reply(self, status, payload, headers):
+                with api._lock:
+                    api.statuses[status] += 1
+                body = json.dumps(payload).encode()
+                self.send_response(status)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                for name, value in headers.items():
+                    self.send_header(name, value)
+                self.end_headers()
+                self.wfile.write(body)
+
+        class Server(ThreadingHTTPServer):
+            daemon_threads = True
+            request_queue_size = 256
+
+        self.httpd = Server(("127.0.0.1", port), Handler)
+        self._thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+
+    def handle(self, method, raw_path, data):
+        """Route one request and return (status, payload, extra headers)"""
+        with self._lock:
+            self.request_count += 1
+            limited = self._over_rate_limit()
+            failed = not limited and self.error_rate and self._random.random() < self.error_rate
+            delay = self.latency + (self._random.uniform(0, self.jitter) if self.jitter else 0.0)
+        time.sleep(delay)
+        if limited:
+            return 429, {"message": "too many requests"}, {"Retry-After": str(self.retry_after)}
+        if failed:
+            return 500, {"message": "injected failure"}, {}
+
+        path, _, query = raw_path.partition("?")
+        parts = path.rstrip("/").split("/")
+        if method == "GET" and parts[-1] == "servers":
+            return 200, self.servers_page(int(parse_qs(query).get("page", ["1"])[0])), {}
+        if len(parts) >= 2 and parts[-2] == "server" and parts[-1] in self.details:
+            server_id = parts[-1]
+            if method == "GET":
+                return 200, self.server_detail(server_id), {}
+            return self.change_network(server_id, data)
+        if len(parts) >= 3 and parts[-1] == "power" and parts[-3] == "server" and parts[-2] in self.details:
+            if method == "PUT":
+                return self.set_power(parts[-2], (data or {}).get("power"))
+        return 404, {"message": "not found"}, {}
+
+    def _over_rate_limit(self):
+        if not self.rate_limit:
+            return False
+        second = int(time.monotonic())
+        window, count = self._window
+        if window != second:
+            window, count = second, 0
+        self._window = (window, count + 1)
+        return count >= self.rate_limit
+
+    def _settle(self, server_id):
+        """Finish a power transition whose time has come"""
+        transition = self._transitions.get(server_id)
+        if transition is None or transition[1] > time.monotonic():
+            return
+        del self._transitions[server_id]
+        self._set_state(server_id, "running" if transition[0] == "on" else "stopped", transition[0])
+
+    def _set_state(self, server_id, status, power):
+        for record in (self._listed[server_id], self.details[server_id]):
+            record["status"] = status
+            record["power"] = power
+
+    def servers_page(self, page):
+        with self._lock:
+            for server_id in list(self._transitions):
+                self._settle(server_id)
+            if not self.page_size:
+                return list(self.fleet)
+            total_pages = max(1, -(-len(self.fleet) // self.page_size))
+            start = (page - 1) * self.page_size
+            return {"servers": self.fleet[start:start + self.page_size], "page": page,
+                    "total_pages": total_pages}
+
+    def server_detail(self, server_id):
+        with self._lock:
+            self._settle(server_id)
+            return dict(self.details[server_id])
+
+    def set_power(self, server_id, action):
+        if action not in ("on", "off", "restart", "reboot"):
+            return 400, {"message": f"unknown power action {action!r}"}, {}
+        target = "off" if action == "off" else "on"
+        with self._lock:
+            self._settle(server_id)
+            if self.power_delay:
+                self._transitions[server_id] = (target, time.monotonic() + self.power_delay)
+                self._set_state(server_id, "pending", self.details[server_id]["power"])
+            else:
+                self._set_state(server_id, "running" if target == "on" else "stopped", target)
+            return 200, {"commandId": self.request_count}, {}
+
+    def change_network(self, server_id, data):
+        names = [network.get("name") for network in (data or {}).get("networks", []) if isinstance(network, dict)]
+        if names not in (["internet"], ["local"]):
+            return 400, {"message": "expected one network named internet or local"}, {}
+        with self._lock:
+            self._settle(server_id)
+            detail = self.details[server_id]
+            if not self.allow_network_change or detail["power"] != "off":
+                return 409, {"message": "power the server off before changing its network"}, {}
+            index = self._index[server_id]
+            detail["networks"] = [public_network(index) if names == ["internet"] else private_network(index)]
+            return 200, {"commandId": self.request_count}, {}
+
+    @property
+    def base_url(self):
+        return f"http://127.0.0.1:{self.httpd.server_port}/service"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Serve a synthetic Kamatera API on localhost")
+    parser.add_argument("--servers", type=int, default=100)
+    parser.add_argument("--port", type=int, default=8081)
+    parser.add_argument("--latency", type=float, default=0.05, help="seconds per request")
+    parser.add_argument("--jitter", type=float, default=0.0, help="extra random latency, up to this many seconds")
+    parser.add_argument("--page-size", type=int, help="paginate /servers")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="fraction of requests answered with a 500")
+    parser.add_argument("--rate-limit", type=int, help="requests per second before answering 429")
+    parser.add_argument("--power-delay", type=float, default=5.0, help="seconds a power action takes")
+    parser.add_argument("--id-prefix", default="srv", help="server ids start with this; vary it per account")
+    args = parser.parse_args()
+
+    api = FakeKamateraAPI(args.servers, args.latency, args.page_size, args.jitter, args.error_rate,
+                          args.rate_limit, power_delay=args.power_delay, port=args.port, id_prefix=args.id_prefix)
+    with api:
+        print(f"Serving {args.servers} servers at {api.base_url} (Ctrl+C to stop)")
+        try:
+            while True:
+                time.sleep(3600)
+        except KeyboardInterrupt:
+            pass
+
+
+if __name__ == "__main__":
+    main()
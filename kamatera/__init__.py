@@ -0,0 +1,97 @@
+"""Qt-free core of the Smart Kamatera Server Manager"""
+
+from .accounts import AccountError, FleetClient, UnknownServerError
+from .activity import (DEFAULT_LOG_BUFFER_SIZE, DEFAULT_LOG_FILE_BACKUPS, DEFAULT_LOG_FILE_MAX_BYTES, ActivityLog,
+                       LogEntry)
+from .cache import DEFAULT_DETAIL_CACHE_SIZE, DEFAULT_DETAIL_TTL, TTLCache
+from .client import DEFAULT_BASE_URL, DEFAULT_MAX_IN_FLIGHT, KamateraClient
+from .config import (CONFIG_FILE, account_profiles, build_classifier, build_client, build_fleet, read_config,
+                     write_config)
+from .converge import DEFAULT_CONVERGE_TIMEOUT, ConvergenceSummary, poll_server, power_is, wait_for_servers
+from .details import (DEFAULT_BACKGROUND_CONCURRENCY, DEFAULT_DETAIL_CONCURRENCY, PriorityDetailFetcher,
+                      extract_ip_and_network_info, fetch_server_details)
+from .inventory import INVENTORY_FILE, InventoryCache, account_fingerprint
+from .listing import DEFAULT_LISTING_CHUNK, iter_json_array, stream_inventory
+from .metrics import DEFAULT_METRICS_TEXTFILE_INTERVAL, ApiMetrics, endpoint_template
+from .networks import PRIVATE_CIDRS, NetworkClassifier
+from .power import DEFAULT_POWER_CONCURRENCY, PowerSummary, set_power_many
+from .ratelimit import DEFAULT_RATE_LIMIT_BURST, DEFAULT_RATE_LIMIT_RPS, TokenBucket
+from .records import ServerRecord
+from .refresh import (DEFAULT_REFRESH_MAX_INTERVAL, DEFAULT_REFRESH_MIN_INTERVAL, RefreshSchedule, refresh_inventory,
+                      server_fingerprint)
+from .singleflight import SingleFlight
+from .store import ServerStore
+from .workflow import DEFAULT_WORKFLOW_CONCURRENCY, WorkflowError, network_is, run_network_switch
+
+__all__ = [
+    "AccountError",
+    "ActivityLog",
+    "ApiMetrics",
+    "AsyncKamateraClient",
+    "CONFIG_FILE",
+    "ConvergenceSummary",
+    "DEFAULT_BACKGROUND_CONCURRENCY",
+    "DEFAULT_BASE_URL",
+    "DEFAULT_CONVERGE_TIMEOUT",
+    "DEFAULT_DETAIL_CACHE_SIZE",
+    "DEFAULT_DETAIL_CONCURRENCY",
+    "DEFAULT_DETAIL_TTL",
+    "DEFAULT_LISTING_CHUNK",
+    "DEFAULT_LOG_BUFFER_SIZE",
+    "DEFAULT_LOG_FILE_BACKUPS",
+    "DEFAULT_LOG_FILE_MAX_BYTES",
+    "DEFAULT_MAX_IN_FLIGHT",
+    "DEFAULT_METRICS_TEXTFILE_INTERVAL",
+    "DEFAULT_POWER_CONCURRENCY",
+    "DEFAULT_RATE_LIMIT_BURST",
+    "DEFAULT_RATE_LIMIT_RPS",
+    "DEFAULT_REFRESH_MAX_INTERVAL",
+    "DEFAULT_REFRESH_MIN_INTERVAL",
+    "DEFAULT_WORKFLOW_CONCURRENCY",
+    "FleetClient",
+    "INVENTORY_FILE",
+    "InventoryCache",
+    "KamateraClient",
+    "LogEntry",
+    "NetworkClassifier",
+    "PRIVATE_CIDRS",
+    "PowerSummary",
+    "PriorityDetailFetcher",
+    "RefreshSchedule",
+    "ServerRecord",
+    "ServerStore",
+    "SingleFlight",
+    "TTLCache",
+    "TokenBucket",
+    "UnknownServerError",
+    "WorkflowError",
+    "account_fingerprint",
+    "account_profiles",
+    "build_classifier",
+    "build_client",
+    "build_fleet",
+    "endpoint_template",
+    "extract_ip_and_network_info",
+    "fetch_server_details",
+    "iter_json_array",
+    "network_is",
+    "poll_server",
+    "power_is",
+    "read_config",
+    "refresh_inventory",
+    "run_network_switch",
+    "server_fingerprint",
+    "set_power_many",
+    "stream_inventory",
+    "wait_for_servers",
+    "write_config",
+]
+
+
+def __getattr__(name):
+    # aiohttp takes longer to import than the rest of the core, so the asyncio
+    # client is only loaded when something asks for it
+    if name == "AsyncKamateraClient":
+        from . import aio
+        return getattr(aio, name)
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
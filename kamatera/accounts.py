@@ -0,0 +1,184 @@
+"""Several Kamatera accounts behind the interface of one client"""
+
+import hashlib
+import queue
+import threading
+
+import requests
+
+from .inventory import account_fingerprint
+from .listing import DEFAULT_LISTING_CHUNK
+from .records import ACCOUNT_KEY
+
+_DONE = object()
+
+
+class AccountError(requests.exceptions.RequestException):
+    """The listing of one or more accounts failed; the message names them"""
+
+
+class UnknownServerError(requests.exceptions.RequestException):
+    """A server id that none of the accounts lists"""
+
+
+class FleetClient:
+    """KamateraClient stand-in that spreads the work over one client per account
+
+    ``clients`` maps account names to KamateraClients, each with its own
+    credentials, connection pool and request budget. The listings of all
+    accounts are read at the same time, so listing the fleet takes as long as
+    the slowest account, and each entry is tagged with its account
+    (ServerRecord.account). Calls for one server go to the client of the
+    account that listed it. A server no listing has shown yet makes the fleet
+    list every account once to find it; UnknownServerError if it is still
+    missing. ``detail_cache`` and ``metrics`` are the ones the clients share.
+    """
+
+    def __init__(self, clients, detail_cache=None, metrics=None):
+        if not clients:
+            raise ValueError("FleetClient needs at least one account")
+        self.clients = dict(clients)
+        self.detail_cache = detail_cache
+        self.metrics = metrics
+        # Server id -> account name, learned from every listing
+        self._routes = {}
+        self._listings = 0
+        self._locate_lock = threading.Lock()
+
+    def __len__(self):
+        return len(self.clients)
+
+    @property
+    def accounts(self):
+        return list(self.clients)
+
+    @property
+    def has_credentials(self):
+        return all(client.has_credentials for client in self.clients.values())
+
+    def missing_credentials(self):
+        """Names of the accounts without an API key or secret"""
+        return [name for name, client in self.clients.items() if not client.has_credentials]
+
+    @property
+    def rate_limiters(self):
+        return {name: client.rate_limiter for name, client in self.clients.items() if client.rate_limiter is not None}
+
+    def fingerprint(self):
+        """Identify this set of accounts, like account_fingerprint() does for one"""
+        parts = sorted(f"{name}={account_fingerprint(client.base_url, client.api_key)}"
+                       for name, client in self.clients.items())
+        return hashlib.sha256("\n".join(parts).encode()).hexdigest()
+
+    def close(self):
+        for client in self.clients.values():
+            client.close()
+
+    def learn(self, servers):
+        """Remember the account of ServerRecords that did not come from a listing, e.g. a cached inventory"""
+        for server in servers:
+            if server.id and server.account in self.clients:
+                self._routes[server.id] = server.account
+
+    def account_of(self, server_id):
+        return self._routes.get(server_id)
+
+    def sort(self, servers):
+        """ServerRecords ordered by account as configured, each account's in its listing order
+
+        Listings arrive interleaved in whatever order the accounts answer; this
+        keeps a table from reshuffling on every load.
+        """
+        rank = {name: position for position, name in enumerate(self.clients)}
+        return sorted(servers, key=lambda server: rank.get(server.account, len(rank)))
+
+    def client_for(self, server_id):
+        """The client of the account that owns ``server_id``"""
+        account = self._routes.get(server_id)
+        if account is None:
+            self._locate(server_id)
+            account = self._routes.get(server_id)
+            if account is None:
+                raise UnknownServerError(f"Server {server_id} is in none of the accounts {', '.join(self.clients)}")
+        return self.clients[account]
+
+    def _locate(self, server_id):
+        listings = self._listings
+        with self._locate_lock:
+            # Callers that queued up behind a listing reuse what it found
+            if server_id in self._routes or self._listings != listings:
+                return
+            for _ in self.iter_servers():
+                pass
+
+    def iter_servers(self, chunk_size=DEFAULT_LISTING_CHUNK):
+        """Yield every account's listing in chunks as they arrive, read from all accounts at once
+
+        Entries are copies tagged with ACCOUNT_KEY. When an account's listing
+        fails, the other accounts are still read to the end, then AccountError
+        is raised.
+        """
+        events = queue.Queue()
+        closed = threading.Event()
+
+        def read(name, client):
+            try:
+                for chunk in client.iter_servers(chunk_size):
+                    if closed.is_set():
+                        break
+                    events.put((name, chunk))
+            except requests.exceptions.RequestException as e:
+                events.put((name, e))
+            finally:
+                events.put((name, _DONE))
+
+        for name, client in self.clients.items():
+            threading.Thread(target=read, args=(name, client), name=f"kamatera-listing-{name}", daemon=True).start()
+        errors = []
+        try:
+            running = len(self.clients)
+            while running:
+                name, payload = events.get()
+                if payload is _DONE:
+                    running -= 1
+                elif isinstance(payload, Exception):
+                    errors.append((name, payload))
+                else:
+                    chunk = []
+                    for server in payload:
+                        server = dict(server)
+                        server[ACCOUNT_KEY] = name
+                        if server.get("id"):
+                            self._routes[server["id"]] = name
+                        chunk.append(server)
+                    yield chunk
+        finally:
+            closed.set()
+        self._listings += 1
+        if errors:
+            raise AccountError("; ".join(f"account {name}: {error}" for name, error in errors)) from errors[0][1]
+
+    def list_servers(self):
+        """Every account's servers, tagged with ACCOUNT_KEY, in the order the accounts are configured"""
+        by_account = {name: [] for name in self.clients}
+        for chunk in self.iter_servers():
+            if chunk:
+                by_account[chunk[0][ACCOUNT_KEY]].extend(chunk)
+        return [server for servers in by_account.values() for server in servers]
+
+    def get_server(self, server_id, use_cache=True):
+        return self.client_for(server_id).get_server(server_id, use_cache)
+
+    def invalidate_server(self, server_id):
+        account = self._routes.get(server_id)
+        if account is not None:
+            self.clients[account].invalidate_server(server_id)
+
+    def set_power(self, server_id, action):
+        return self.client_for(server_id).set_power(server_id, action)
+
+    def update_server(self, server_id, data):
+        return self.client_for(server_id).update_server(server_id, data)
+
+    def change_network(self, server_id, network_type):
+        return self.client_for(server_id).change_network(server_id, network_type)
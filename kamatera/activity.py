@@ -0,0 +1,76 @@
+"""Bounded, timestamped activity log with an optional rotating file"""
+
+import collections
+import logging
+import threading
+import time
+from logging.handlers import RotatingFileHandler
+
+DEFAULT_LOG_BUFFER_SIZE = 5000
+DEFAULT_LOG_FILE_MAX_BYTES = 1024 * 1024
+DEFAULT_LOG_FILE_BACKUPS = 3
+
+
+class LogEntry:
+    """One message with its wall-clock time and its monotonic offset from the log's start"""
+
+    __slots__ = ("wall", "elapsed", "message")
+
+    def __init__(self, wall, elapsed, message):
+        self.wall = wall
+        self.elapsed = elapsed
+        self.message = message
+
+    def format(self, date=False):
+        stamp = time.strftime("%Y-%m-%d %H:%M:%S" if date else "%H:%M:%S", time.localtime(self.wall))
+        return f"[{stamp}.{int(self.wall % 1 * 1000):03d} +{self.elapsed:.3f}s] {self.message}"
+
+
+class ActivityLog:
+    """Ring buffer of the latest ``max_entries`` messages
+
+    append() is cheap and thread-safe. A view calls drain() to take
+    everything appended since its previous call, so it repaints once per
+    batch rather than once per message; if it falls more than
+    ``max_entries`` behind, the oldest pending entries are dropped. With a
+    ``path`` every message is also written to a file that rotates at
+    ``max_bytes``, keeping ``backups`` old files.
+    """
+
+    def __init__(self, max_entries=DEFAULT_LOG_BUFFER_SIZE, path=None, max_bytes=DEFAULT_LOG_FILE_MAX_BYTES,
+                 backups=DEFAULT_LOG_FILE_BACKUPS, clock=time.monotonic, wall_clock=time.time):
+        self.max_entries = max(1, max_entries)
+        self.entries = collections.deque(maxlen=self.max_entries)
+        self.dropped = 0
+        self._pending = collections.deque(maxlen=self.max_entries)
+        self._lock = threading.Lock()
+        self._clock = clock
+        self._wall_clock = wall_clock
+        self._started = clock()
+        self._file = None
+        if path:
+            self._file = RotatingFileHandler(path, maxBytes=max_bytes, backupCount=backups, encoding="utf-8",
+                                             delay=True)
+
+    def append(self, message):
+        entry = LogEntry(self._wall_clock(), self._clock() - self._started, message)
+        with self._lock:
+            if len(self._pending) == self.max_entries:
+                self.dropped += 1
+            self.entries.append(entry)
+            self._pending.append(entry)
+        if self._file is not None:
+            # handle() takes the handler's own lock and rotates the file when needed
+            self._file.handle(logging.makeLogRecord({"msg": entry.format(date=True)}))
+        return entry
+
+    def drain(self):
+        """Return the entries appended since the previous drain()"""
+        with self._lock:
+            batch = list(self._pending)
+            self._pending.clear()
+        return batch
+
+    def close(self):
+        if self._file is not None:
+            self._file.close()
@@ -0,0 +1,280 @@
+"""asyncio client for high fan-out Kamatera API operations
+
+Requires the optional ``aiohttp`` package. A single event loop thread can keep
+hundreds of requests in flight; ``max_in_flight`` caps them with a semaphore.
+
+Headless use::
+
+    async def main():
+        async with AsyncKamateraClient(api_key, api_secret) as client:
+            servers = await client.list_servers()
+            async for server_id, detail, error in client.iter_server_details(s["id"] for s in servers):
+                ...
+
+    asyncio.run(main())
+"""
+
+import asyncio
+import json
+import time
+
+try:
+    import aiohttp
+except ImportError:  # optional dependency
+    aiohttp = None
+
+from .client import (DEFAULT_BACKOFF_FACTOR, DEFAULT_BACKOFF_MAX, DEFAULT_BASE_URL,
+                     DEFAULT_CONNECT_TIMEOUT, DEFAULT_MAX_IN_FLIGHT, DEFAULT_MAX_RATE_LIMIT_WAITS,
+                     DEFAULT_MAX_RETRIES, DEFAULT_READ_TIMEOUT, IDEMPOTENT_METHODS, LISTING_FLIGHT_KEY,
+                     RATE_LIMIT_STATUS, RETRY_STATUSES, SUPPORTED_METHODS, backoff_delay, network_payload)
+from .listing import ListingPages, unwrap_envelope
+from .metrics import endpoint_template
+from .ratelimit import retry_after_seconds
+from .singleflight import AsyncSingleFlight, flight_key
+
+# Exceptions a failed request can raise; callers catch these like RequestException on the sync path
+REQUEST_ERRORS = (aiohttp.ClientError, asyncio.TimeoutError) if aiohttp else (asyncio.TimeoutError,)
+
+
+class AsyncKamateraClient:
+    """Coroutine counterpart of KamateraClient sharing one aiohttp connection pool"""
+
+    def __init__(self, api_key=None, api_secret=None, base_url=DEFAULT_BASE_URL,
+                 max_in_flight=DEFAULT_MAX_IN_FLIGHT, connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout=DEFAULT_READ_TIMEOUT, max_retries=DEFAULT_MAX_RETRIES,
+                 backoff_factor=DEFAULT_BACKOFF_FACTOR, backoff_max=DEFAULT_BACKOFF_MAX,
+                 detail_cache=None, rate_limiter=None, max_rate_limit_waits=DEFAULT_MAX_RATE_LIMIT_WAITS,
+                 metrics=None, coalesce=True):
+        if aiohttp is None:
+            raise ImportError("AsyncKamateraClient requires aiohttp: pip install aiohttp")
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.base_url = base_url
+        self.max_in_flight = max_in_flight
+        self.connect_timeout = connect_timeout
+        self.read_timeout = read_timeout
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        # May be shared with a KamateraClient; TTLCache is thread-safe
+        self.detail_cache = detail_cache
+        # A TokenBucket shared with the sync client keeps both under one request budget
+        self.rate_limiter = rate_limiter
+        self.max_rate_limit_waits = max_rate_limit_waits
+        # An ApiMetrics shared with the sync client gives one view of both
+        self.metrics = metrics
+        # Concurrent identical GETs share one request unless coalesce=False
+        self.single_flight = AsyncSingleFlight() if coalesce else None
+        # Both are bound to the running loop, so they are created on first use
+        self._session = None
+        self._semaphore = None
+
+    async def __aenter__(self):
+        return self
+
+    async def __aexit__(self, *exc):
+        await self.close()
+
+    def set_credentials(self, api_key, api_secret):
+        self.api_key = api_key
+        self.api_secret = api_secret
+        if self._session is not None:
+            self._session.headers.update(self._auth_headers())
+
+    def _auth_headers(self):
+        return {
+            "AuthClientId": self.api_key or "",
+            "AuthSecret": self.api_secret or "",
+            "Content-Type": "application/json",
+        }
+
+    def _ensure_session(self):
+        if self._session is None or self._session.closed:
+            connector = aiohttp.TCPConnector(limit=self.max_in_flight)
+            timeout = aiohttp.ClientTimeout(sock_connect=self.connect_timeout, sock_read=self.read_timeout)
+            self._session = aiohttp.ClientSession(headers=self._auth_headers(), connector=connector,
+                                                  timeout=timeout)
+            self._semaphore = asyncio.Semaphore(self.max_in_flight)
+        return self._session
+
+    async def close(self):
+        if self._session is not None and not self._session.closed:
+            await self._session.close()
+        self._session = None
+
+    def _record(self, method, endpoint, started, status=None, error=None):
+        if self.metrics is not None:
+            self.metrics.record(method, endpoint, time.perf_counter() - started, status, error)
+
+    def url(self, endpoint):
+        return endpoint if endpoint.startswith(("http://", "https://")) else f"{self.base_url}{endpoint}"
+
+    async def _shared(self, coro_fn, key, endpoint):
+        """coro_fn() through the single-flight layer, counting callers that joined a request in flight"""
+        if self.single_flight is None:
+            return await coro_fn()
+        value, shared = await self.single_flight.do(key, coro_fn)
+        if shared and self.metrics is not None:
+            self.metrics.record_deduplicated("GET", endpoint_template(self.url(endpoint), self.base_url))
+        return value
+
+    async def request(self, endpoint, method="GET", data=None):
+        """Send an API request and return the decoded JSON (or raw text)
+
+        A GET for a URL and parameters already being fetched awaits that
+        response instead of sending its own. Raises one of REQUEST_ERRORS when
+        the request ultimately fails.
+        """
+        if method.upper() == "GET":
+            return await self._shared(lambda: self._request(endpoint, method, data),
+                                      flight_key(self.url(endpoint), data), endpoint)
+        return await self._request(endpoint, method, data)
+
+    async def _request(self, endpoint, method, data):
+        text, _ = await self.send(endpoint, method, data)
+        # Try to parse as JSON, if fails return text
+        try:
+            return json.loads(text)
+        except ValueError:
+            return text
+
+    async def send(self, endpoint, method="GET", data=None):
+        """Send an API request with retries; return (body text, Link rel="next" URL or None)
+
+        ``endpoint`` is a path under base_url or an absolute URL (a pagination
+        link).
+        """
+        method = method.upper()
+        if method not in SUPPORTED_METHODS:
+            raise ValueError(f"Unsupported HTTP method: {method}")
+
+        session = self._ensure_session()
+        url = self.url(endpoint)
+        template = endpoint_template(url, self.base_url)
+        attempts = self.max_retries + 1 if method in IDEMPOTENT_METHODS else 1
+        kwargs = {"params": data} if method == "GET" else {"json": data}
+
+        attempt = 0
+        rate_limit_waits = 0
+        while True:
+            last_attempt = attempt == attempts - 1
+            if self.rate_limiter is not None:
+                await self.rate_limiter.acquire_async()
+            rate_limit_delay = None
+            try:
+                async with self._semaphore:
+                    started = time.perf_counter()
+                    try:
+                        response = await session.request(method, url, **kwargs)
+                    except REQUEST_ERRORS as e:
+                        self._record(method, template, started, error=e)
+                        raise
+                    self._record(method, template, started, status=response.status)
+                    async with response:
+                        if response.status == RATE_LIMIT_STATUS and rate_limit_waits < self.max_rate_limit_waits:
+                            retry = True
+                            rate_limit_waits += 1
+                            rate_limit_delay = retry_after_seconds(
+                                response.headers.get("Retry-After"),
+                                backoff_delay(rate_limit_waits, self.backoff_factor, self.backoff_max))
+                        elif response.status in RETRY_STATUSES and not last_attempt:
+                            retry = True
+                        else:
+                            retry = False
+                            response.raise_for_status()
+                            text = await response.text()
+                            link = response.links.get("next", {}).get("url")
+            except (aiohttp.ClientConnectionError, asyncio.TimeoutError):
+                if last_attempt:
+                    raise
+                retry = True
+
+            if not retry:
+                break
+            # Back off outside the semaphore so sleeping retries do not hold slots
+            if rate_limit_delay is not None:
+                if self.rate_limiter is not None:
+                    self.rate_limiter.pause(rate_limit_delay)
+                else:
+                    await asyncio.sleep(rate_limit_delay)
+                continue
+            await asyncio.sleep(backoff_delay(attempt, self.backoff_factor, self.backoff_max))
+            attempt += 1
+        return text, link
+
+    async def list_servers(self):
+        """Return the whole server list, following pagination like KamateraClient.iter_servers()
+
+        Concurrent calls share one listing. Raises aiohttp.ClientPayloadError
+        when a page is not a server list.
+        """
+        return await self._shared(self._list_servers, LISTING_FLIGHT_KEY, "/servers")
+
+    async def _list_servers(self):
+        servers = []
+        pages = ListingPages(f"{self.base_url}/servers")
+        for url, params in pages:
+            text, link = await self.send(url, "GET", params)
+            try:
+                page, envelope = unwrap_envelope(json.loads(text))
+            except ValueError as e:
+                raise aiohttp.ClientPayloadError(f"Unreadable /servers response: {e}")
+            if not isinstance(page, list):
+                raise aiohttp.ClientPayloadError("Unreadable /servers response: the listing holds no list of servers")
+            servers.extend(page)
+            pages.follow(envelope, link)
+        return servers
+
+    async def get_server(self, server_id, use_cache=True):
+        if self.detail_cache is not None and use_cache:
+            cached = self.detail_cache.get(server_id)
+            if cached is not None:
+                return cached
+        detail = await self.request(f"/server/{server_id}", "GET")
+        if self.detail_cache is not None and detail:
+            self.detail_cache.put(server_id, detail)
+        return detail
+
+    def invalidate_server(self, server_id):
+        """Drop what is known about a server after a write to it"""
+        if self.detail_cache is not None:
+            self.detail_cache.invalidate(server_id)
+        if self.single_flight is not None:
+            # Reads that started before the write must not be joined by the ones after it
+            self.single_flight.forget(flight_key(self.url(f"/server/{server_id}")))
+            self.single_flight.forget(LISTING_FLIGHT_KEY)
+
+    async def set_power(self, server_id, action):
+        try:
+            return await self.request(f"/server/{server_id}/power", "PUT", {"power": action})
+        finally:
+            self.invalidate_server(server_id)
+
+    async def update_server(self, server_id, data):
+        try:
+            return await self.request(f"/server/{server_id}", "PUT", data)
+        finally:
+            self.invalidate_server(server_id)
+
+    async def change_network(self, server_id, network_type):
+        """Attach a server to the public ("internet") or private ("local") network"""
+        await self.get_server(server_id)
+        return await self.update_server(server_id, network_payload(network_type))
+
+    async def iter_server_details(self, server_ids, use_cache=True):
+        """Yield (server_id, detail, error) for every id in completion order"""
+        async def fetch(server_id):
+            try:
+                return server_id, await self.get_server(server_id, use_cache), None
+            except REQUEST_ERRORS as e:
+                return server_id, None, e
+
+        for next_done in asyncio.as_completed([fetch(server_id) for server_id in server_ids]):
+            yield await next_done
+
+    async def set_power_many(self, server_ids, action):
+        """Send a power action to every id concurrently; returns {server_id: result or exception}"""
+        server_ids = list(server_ids)
+        results = await asyncio.gather(*(self.set_power(server_id, action) for server_id in server_ids),
+                                       return_exceptions=True)
+        return dict(zip(server_ids, results))
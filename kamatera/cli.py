@@ -0,0 +1,189 @@
+"""Headless command line interface; never imports PyQt5
+
+    python -m kamatera list --details
+    python -m kamatera info srv-1 srv-2
+    python -m kamatera power off srv-1 srv-2 --wait
+    python -m kamatera switch-network private srv-1 srv-2
+
+Credentials and tuning options come from config.json (see --config), or from
+--api-key/--api-secret. With an "accounts" list in the config every command
+covers all the accounts, or the ones named with --account. Results are printed as JSON on stdout; progress goes
+to stderr. The exit status is 1 when any server failed.
+"""
+
+import argparse
+import json
+import sys
+
+import requests
+
+from .accounts import FleetClient
+from .config import CONFIG_FILE, build_classifier, build_client, build_fleet, read_config
+from .converge import DEFAULT_CONVERGE_TIMEOUT, ConvergenceSummary, power_is, wait_for_servers
+from .details import DEFAULT_DETAIL_CONCURRENCY, extract_ip_and_network_info, fetch_server_details
+from .listing import LISTED, stream_inventory
+from .power import DEFAULT_POWER_CONCURRENCY, PowerSummary, set_power_many
+from .workflow import DEFAULT_WORKFLOW_CONCURRENCY, DONE, FINAL_STAGES, network_is, run_network_switch
+
+
+def progress(message):
+    print(message, file=sys.stderr, flush=True)
+
+
+def cmd_list(client, args):
+    servers = []
+    by_id = {}
+    failed = False
+    # Details for the first chunk are requested while the rest of the listing is still being read
+    for kind, payload in stream_inventory(client, args.concurrency, details=args.details):
+        if kind == LISTED:
+            servers.extend(payload)
+            by_id.update((server.id, server) for server in payload if server.id)
+            continue
+        server_id, detail, error = payload
+        if error is not None:
+            failed = True
+            progress(f"{server_id}: {error}")
+            continue
+        by_id[server_id].ip, by_id[server_id].network = args.classifier.classify(detail)
+    if isinstance(client, FleetClient):
+        # The accounts' listings arrive interleaved
+        servers = client.sort(servers)
+    return [server.as_dict() for server in servers], failed
+
+
+def cmd_info(client, args):
+    details = {}
+    failed = False
+    for server_id, detail, error in fetch_server_details(client, args.server_ids, args.concurrency):
+        if error is not None:
+            failed = True
+            details[server_id] = {"error": str(error)}
+        else:
+            details[server_id] = detail
+    return details, failed
+
+
+def cmd_power(client, args):
+    summary = PowerSummary(args.action, len(args.server_ids))
+    for server_id, result, error in set_power_many(client, args.server_ids, args.action, args.concurrency):
+        ok = summary.record(server_id, result, error)
+        progress(f"{server_id}: power {args.action} {'accepted' if ok else 'failed'}")
+    output = summary.as_dict()
+    failed = bool(summary.failed)
+
+    if args.wait and summary.succeeded:
+        state = "off" if args.action == "off" else "on"
+        convergence = ConvergenceSummary(len(summary.succeeded))
+        for server_id, converged, elapsed, _ in wait_for_servers(
+                client, summary.succeeded, power_is(state), args.timeout, args.concurrency):
+            convergence.record(server_id, converged, elapsed)
+            progress(f"{server_id}: {'power ' + state if converged else 'timed out'} after {elapsed:.1f}s")
+        output["convergence"] = convergence.as_dict()
+        failed = failed or bool(convergence.timed_out)
+    return output, failed
+
+
+def cmd_switch_network(client, args):
+    target = args.network
+    results = {}
+    for server_id, stage, info in run_network_switch(client, args.server_ids, target, args.concurrency,
+                                                     verify=network_is(target, args.classifier),
+                                                     timeout=args.timeout):
+        progress(f"{server_id}: {stage}")
+        if stage == DONE:
+            ip, network = extract_ip_and_network_info(info, args.classifier)
+            results[server_id] = {"stage": stage, "ip": ip, "network": network}
+        elif stage in FINAL_STAGES:
+            results[server_id] = {"stage": stage, "reason": info}
+    failed = any(result["stage"] != DONE for result in results.values())
+    return results, failed
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog="python -m kamatera", description="Manage Kamatera servers without the GUI")
+    parser.add_argument("--config", default=CONFIG_FILE, help="path to config.json (default: %(default)s)")
+    parser.add_argument("--api-key", help="overrides api_key from the config")
+    parser.add_argument("--api-secret", help="overrides api_secret from the config")
+    parser.add_argument("--base-url", help="overrides base_url from the config")
+    parser.add_argument("--account", action="append", metavar="NAME",
+                        help="only use this account from the config's accounts list (repeatable)")
+    parser.add_argument("--indent", type=int, default=2, help="JSON indentation, 0 for one line")
+    parser.add_argument("--metrics-textfile", metavar="PATH",
+                        help="write per-endpoint API metrics in the Prometheus text format when done")
+    commands = parser.add_subparsers(dest="command", required=True)
+
+    list_parser = commands.add_parser("list", help="list servers")
+    list_parser.add_argument("--details", action="store_true", help="also fetch each server's IP and network")
+    list_parser.add_argument("--concurrency", type=int, default=DEFAULT_DETAIL_CONCURRENCY)
+    list_parser.set_defaults(handler=cmd_list)
+
+    info_parser = commands.add_parser("info", help="show the full detail of servers")
+    info_parser.add_argument("server_ids", nargs="+", metavar="SERVER_ID")
+    info_parser.add_argument("--concurrency", type=int, default=DEFAULT_DETAIL_CONCURRENCY)
+    info_parser.set_defaults(handler=cmd_info)
+
+    power_parser = commands.add_parser("power", help="power servers on, off or reboot them")
+    power_parser.add_argument("action", choices=["on", "off", "reboot"])
+    power_parser.add_argument("server_ids", nargs="+", metavar="SERVER_ID")
+    power_parser.add_argument("--concurrency", type=int, default=DEFAULT_POWER_CONCURRENCY)
+    power_parser.add_argument("--wait", action="store_true", help="poll until the servers reach the power state")
+    power_parser.add_argument("--timeout", type=float, default=DEFAULT_CONVERGE_TIMEOUT)
+    power_parser.set_defaults(handler=cmd_power)
+
+    network_parser = commands.add_parser("switch-network", help="power off, switch network, power on and verify")
+    network_parser.add_argument("network", choices=["public", "private"])
+    network_parser.add_argument("server_ids", nargs="+", metavar="SERVER_ID")
+    network_parser.add_argument("--concurrency", type=int, default=DEFAULT_WORKFLOW_CONCURRENCY)
+    network_parser.add_argument("--timeout", type=float, default=DEFAULT_CONVERGE_TIMEOUT)
+    network_parser.set_defaults(handler=cmd_switch_network)
+    return parser
+
+
+def main(argv=None):
+    parser = build_parser()
+    args = parser.parse_args(argv)
+
+    try:
+        config = read_config(args.config)
+    except FileNotFoundError:
+        config = {}
+    except json.JSONDecodeError as e:
+        parser.error(f"invalid config file {args.config}: {e}")
+    if args.base_url:
+        config["base_url"] = args.base_url
+    try:
+        args.classifier = build_classifier(config)
+    except ValueError as e:
+        parser.error(f"invalid private_cidrs/public_cidrs in {args.config}: {e}")
+
+    if config.get("accounts") and not args.api_key:
+        try:
+            client = build_fleet(config, args.account)
+        except ValueError as e:
+            parser.error(f"invalid accounts in {args.config}: {e}")
+        if not client.has_credentials:
+            parser.error(f"no API credentials for the accounts {', '.join(client.missing_credentials())} "
+                         f"in {args.config}")
+    else:
+        if args.account:
+            parser.error(f"--account needs an accounts list in {args.config}")
+        client = build_client(config, args.api_key, args.api_secret)
+        if not client.has_credentials:
+            parser.error(f"no API credentials: log in once with the GUI, edit {args.config} "
+                         f"or pass --api-key/--api-secret")
+
+    try:
+        output, failed = args.handler(client, args)
+    except requests.exceptions.RequestException as e:
+        progress(f"API Error: {e}")
+        return 2
+    finally:
+        client.close()
+        if args.metrics_textfile:
+            # Failed runs are exported too; their errors are what the metrics are for
+            client.metrics.write_textfile(args.metrics_textfile)
+
+    json.dump(output, sys.stdout, indent=args.indent or None)
+    sys.stdout.write("\n")
+    return 1 if failed else 0
@@ -0,0 +1,287 @@
+"""Pooled HTTP client for the Kamatera console API"""
+
+import itertools
+import json
+import random
+import time
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from .listing import DEFAULT_LISTING_CHUNK, LISTING_READ_SIZE, ListingPages, iter_json_array, unwrap_envelope
+from .metrics import endpoint_template
+from .ratelimit import retry_after_seconds
+from .singleflight import SingleFlight, flight_key
+
+DEFAULT_BASE_URL = "https://console.kamatera.com/service"
+DEFAULT_POOL_SIZE = 20
+DEFAULT_CONNECT_TIMEOUT = 5.0
+DEFAULT_READ_TIMEOUT = 30.0
+DEFAULT_MAX_RETRIES = 3
+DEFAULT_BACKOFF_FACTOR = 0.5
+DEFAULT_BACKOFF_MAX = 10.0
+DEFAULT_MAX_RATE_LIMIT_WAITS = 10
+# Cap on concurrent requests of the asyncio client; kept here so reading it does not import aiohttp
+DEFAULT_MAX_IN_FLIGHT = 100
+
+# Only idempotent requests are retried; a repeated PUT could double a power action
+IDEMPOTENT_METHODS = frozenset({"GET"})
+RETRY_STATUSES = frozenset({500, 502, 503, 504})
+# A 429 means the request was not processed, so any method may be resent after waiting
+RATE_LIMIT_STATUS = 429
+SUPPORTED_METHODS = frozenset({"GET", "PUT", "POST"})
+# Single-flight key of list_servers(), which may span several GETs
+LISTING_FLIGHT_KEY = "list_servers"
+
+
+def backoff_delay(attempt, factor=DEFAULT_BACKOFF_FACTOR, maximum=DEFAULT_BACKOFF_MAX):
+    """Exponential backoff with full jitter for the given retry attempt"""
+    return random.uniform(0, min(maximum, factor * (2 ** attempt)))
+
+
+def network_payload(network_type):
+    """Build the PUT /server/{id} body that attaches a server to a network type"""
+    network_data = {"networks": []}
+    if network_type.lower() == "public":
+        network_data["networks"].append({"name": "internet"})
+    elif network_type.lower() == "private":
+        network_data["networks"].append({"name": "local"})
+    return network_data
+
+
+def unwrap_server_list(servers):
+    """Accept a bare list or a {"servers"|"items"|"data": [...]} envelope"""
+    return unwrap_envelope(servers)[0]
+
+
+class KamateraClient:
+    """Long-lived API client that reuses keep-alive connections from a shared pool"""
+
+    def __init__(self, api_key=None, api_secret=None, base_url=DEFAULT_BASE_URL,
+                 pool_size=DEFAULT_POOL_SIZE, connect_timeout=DEFAULT_CONNECT_TIMEOUT,
+                 read_timeout=DEFAULT_READ_TIMEOUT, max_retries=DEFAULT_MAX_RETRIES,
+                 backoff_factor=DEFAULT_BACKOFF_FACTOR, backoff_max=DEFAULT_BACKOFF_MAX,
+                 detail_cache=None, rate_limiter=None, max_rate_limit_waits=DEFAULT_MAX_RATE_LIMIT_WAITS,
+                 metrics=None, coalesce=True):
+        self.base_url = base_url
+        self.pool_size = pool_size
+        self.timeout = (connect_timeout, read_timeout)
+        self.max_retries = max_retries
+        self.backoff_factor = backoff_factor
+        self.backoff_max = backoff_max
+        # Optional TTLCache of GET /server/{id} payloads, dropped on every mutation
+        self.detail_cache = detail_cache
+        # Optional TokenBucket every request waits on; may be shared with the asyncio client
+        self.rate_limiter = rate_limiter
+        self.max_rate_limit_waits = max_rate_limit_waits
+        # Optional ApiMetrics recording every attempt; may be shared with the asyncio client
+        self.metrics = metrics
+        # Concurrent identical GETs share one request unless coalesce=False
+        self.single_flight = SingleFlight() if coalesce else None
+
+        self.session = requests.Session()
+        # Retries are handled in request() so that backoff and jitter stay under our control
+        adapter = HTTPAdapter(pool_connections=1, pool_maxsize=pool_size, max_retries=0)
+        self.session.mount("https://", adapter)
+        self.session.mount("http://", adapter)
+        self.session.headers["Content-Type"] = "application/json"
+        self.set_credentials(api_key, api_secret)
+
+    def set_credentials(self, api_key, api_secret):
+        """Update the authentication headers sent with every request"""
+        self.api_key = api_key
+        self.api_secret = api_secret
+        self.session.headers["AuthClientId"] = api_key or ""
+        self.session.headers["AuthSecret"] = api_secret or ""
+
+    @property
+    def has_credentials(self):
+        return bool(self.api_key and self.api_secret)
+
+    def close(self):
+        """Release all pooled connections"""
+        self.session.close()
+
+    def backoff_delay(self, attempt):
+        return backoff_delay(attempt, self.backoff_factor, self.backoff_max)
+
+    def _record(self, method, endpoint, started, status=None, error=None):
+        if self.metrics is not None:
+            self.metrics.record(method, endpoint, time.perf_counter() - started, status, error)
+
+    def url(self, endpoint):
+        return endpoint if endpoint.startswith(("http://", "https://")) else f"{self.base_url}{endpoint}"
+
+    def _shared(self, fn, key, endpoint):
+        """fn() through the single-flight layer, counting callers that joined a request in flight"""
+        if self.single_flight is None:
+            return fn()
+        value, shared = self.single_flight.do(key, fn)
+        if shared and self.metrics is not None:
+            self.metrics.record_deduplicated("GET", endpoint_template(self.url(endpoint), self.base_url))
+        return value
+
+    def request(self, endpoint, method="GET", data=None):
+        """Send an API request and return the decoded JSON (or raw text)
+
+        A GET for a URL and parameters already being fetched waits for that
+        response instead of sending its own. Raises
+        requests.exceptions.RequestException when the request ultimately fails.
+        """
+        if method.upper() == "GET":
+            return self._shared(lambda: self._request(endpoint, method, data), flight_key(self.url(endpoint), data),
+                                endpoint)
+        return self._request(endpoint, method, data)
+
+    def _request(self, endpoint, method, data):
+        response = self.send(endpoint, method, data)
+        # Try to parse as JSON, if fails return text
+        try:
+            return response.json()
+        except ValueError:
+            return response.text
+
+    def send(self, endpoint, method="GET", data=None, stream=False):
+        """Send an API request with retries and return the successful Response
+
+        ``endpoint`` is a path under base_url or an absolute URL (a pagination
+        link). With stream=True the body is left on the socket for the caller
+        to read and close.
+        """
+        method = method.upper()
+        if method not in SUPPORTED_METHODS:
+            raise ValueError(f"Unsupported HTTP method: {method}")
+
+        url = self.url(endpoint)
+        template = endpoint_template(url, self.base_url)
+        attempts = self.max_retries + 1 if method in IDEMPOTENT_METHODS else 1
+
+        attempt = 0
+        rate_limit_waits = 0
+        while True:
+            last_attempt = attempt == attempts - 1
+            if self.rate_limiter is not None:
+                self.rate_limiter.acquire()
+            started = time.perf_counter()
+            try:
+                if method == "GET":
+                    response = self.session.get(url, params=data, timeout=self.timeout, stream=stream)
+                else:
+                    response = self.session.request(method, url, json=data, timeout=self.timeout)
+            except requests.exceptions.RequestException as e:
+                self._record(method, template, started, error=e)
+                if last_attempt or not isinstance(e, (requests.exceptions.ConnectionError,
+                                                      requests.exceptions.Timeout)):
+                    raise
+                time.sleep(self.backoff_delay(attempt))
+                attempt += 1
+                continue
+            self._record(method, template, started, status=response.status_code)
+
+            if response.status_code == RATE_LIMIT_STATUS and rate_limit_waits < self.max_rate_limit_waits:
+                # Queue behind the server's Retry-After instead of failing the action
+                rate_limit_waits += 1
+                delay = retry_after_seconds(response.headers.get("Retry-After"), self.backoff_delay(rate_limit_waits))
+                response.close()
+                if self.rate_limiter is not None:
+                    self.rate_limiter.pause(delay)
+                else:
+                    time.sleep(delay)
+                continue
+
+            if response.status_code in RETRY_STATUSES and not last_attempt:
+                response.close()
+                time.sleep(self.backoff_delay(attempt))
+                attempt += 1
+                continue
+
+            if response.status_code >= 400:
+                response.close()
+            response.raise_for_status()
+            return response
+
+    def list_servers(self):
+        """Return the whole server list, unwrapped from whichever envelope the API used
+
+        Concurrent calls share one listing. The streamed iter_servers() is not
+        shared, since each caller reads the body as it arrives.
+        """
+        return self._shared(lambda: [server for chunk in self.iter_servers() for server in chunk],
+                            LISTING_FLIGHT_KEY, "/servers")
+
+    def iter_servers(self, chunk_size=DEFAULT_LISTING_CHUNK):
+        """Yield the server listing in lists of at most ``chunk_size`` as it is parsed
+
+        A bare JSON array is parsed off the socket element by element, so the
+        first rows are out before the body has finished arriving. Envelopes
+        are unwrapped like before, and further pages are requested while the
+        caller works on the current one: a Link rel="next" header, a next link
+        or cursor in the envelope, or page/total_pages counters are followed.
+        """
+        pages = ListingPages(f"{self.base_url}/servers")
+        for url, params in pages:
+            response = self.send(url, "GET", params, stream=True)
+            try:
+                chunks = response.iter_content(LISTING_READ_SIZE)
+                first = next((chunk for chunk in chunks if chunk.strip()), b"")
+                body = itertools.chain([first], chunks)
+                envelope = None
+                try:
+                    if first.lstrip().startswith(b"["):
+                        for items in iter_json_array(body):
+                            # Hand over what each read completed rather than wait for a full chunk
+                            for start in range(0, len(items), chunk_size):
+                                yield items[start:start + chunk_size]
+                    else:
+                        servers, envelope = unwrap_envelope(json.loads(b"".join(body)))
+                        if not isinstance(servers, list):
+                            raise ValueError("the listing holds no list of servers")
+                        for start in range(0, len(servers), chunk_size):
+                            yield servers[start:start + chunk_size]
+                except ValueError as e:
+                    raise requests.exceptions.InvalidJSONError(f"Unreadable /servers response: {e}",
+                                                               response=response)
+                pages.follow(envelope, response.links.get("next", {}).get("url"), response.url)
+            finally:
+                response.close()
+
+    def get_server(self, server_id, use_cache=True):
+        """Return one server's detail, from the detail cache while it is fresh
+
+        use_cache=False always asks the API but still refreshes the cache.
+        """
+        if self.detail_cache is not None and use_cache:
+            cached = self.detail_cache.get(server_id)
+            if cached is not None:
+                return cached
+        detail = self.request(f"/server/{server_id}", "GET")
+        if self.detail_cache is not None and detail:
+            self.detail_cache.put(server_id, detail)
+        return detail
+
+    def invalidate_server(self, server_id):
+        """Drop what is known about a server after a write to it"""
+        if self.detail_cache is not None:
+            self.detail_cache.invalidate(server_id)
+        if self.single_flight is not None:
+            # Reads that started before the write must not be joined by the ones after it
+            self.single_flight.forget(flight_key(self.url(f"/server/{server_id}")))
+            self.single_flight.forget(LISTING_FLIGHT_KEY)
+
+    def set_power(self, server_id, action):
+        try:
+            return self.request(f"/server/{server_id}/power", "PUT", {"power": action})
+        finally:
+            self.invalidate_server(server_id)
+
+    def update_server(self, server_id, data):
+        try:
+            return self.request(f"/server/{server_id}", "PUT", data)
+        finally:
+            self.invalidate_server(server_id)
+
+    def change_network(self, server_id, network_type):
+        """Attach a server to the public ("internet") or private ("local") network"""
+        # First make sure the server exists; raises if it does not
+        self.get_server(server_id)
+        return self.update_server(server_id, network_payload(network_type))
@@ -0,0 +1,99 @@
+"""config.json handling shared by the GUI and the command line"""
+
+import json
+
+from .accounts import FleetClient
+from .cache import DEFAULT_DETAIL_CACHE_SIZE, DEFAULT_DETAIL_TTL, TTLCache
+from .client import DEFAULT_BASE_URL, KamateraClient
+from .metrics import ApiMetrics
+from .networks import NetworkClassifier
+from .ratelimit import DEFAULT_RATE_LIMIT_BURST, DEFAULT_RATE_LIMIT_RPS, TokenBucket
+
+CONFIG_FILE = "config.json"
+
+# config.json keys passed straight through to KamateraClient
+CLIENT_OPTIONS = ("pool_size", "connect_timeout", "read_timeout", "max_retries", "backoff_factor")
+# Top-level keys an account profile does not inherit
+ACCOUNT_OWN_KEYS = ("accounts", "name", "api_key", "api_secret")
+
+
+def read_config(path=CONFIG_FILE):
+    """Read config.json; raises FileNotFoundError or json.JSONDecodeError"""
+    with open(path, "r") as f:
+        return json.load(f)
+
+
+def write_config(config, path=CONFIG_FILE):
+    with open(path, "w") as f:
+        json.dump(config, f)
+
+
+def build_client(config, api_key=None, api_secret=None, detail_cache=None, metrics=None):
+    """Build the pooled API client, its detail cache, rate limiter and metrics from config settings
+
+    Credentials default to the ones stored in the config; a detail cache or
+    metrics passed in are used instead of new ones.
+    """
+    options = {key: config[key] for key in CLIENT_OPTIONS if key in config}
+    if detail_cache is None:
+        detail_cache = build_detail_cache(config)
+    # One request budget per client; rate_limit_rps = 0 turns it off
+    rate = config.get("rate_limit_rps", DEFAULT_RATE_LIMIT_RPS)
+    rate_limiter = None
+    if rate:
+        rate_limiter = TokenBucket(rate, config.get("rate_limit_burst", DEFAULT_RATE_LIMIT_BURST))
+    return KamateraClient(api_key or config.get("api_key"), api_secret or config.get("api_secret"),
+                          base_url=config.get("base_url", DEFAULT_BASE_URL), detail_cache=detail_cache,
+                          rate_limiter=rate_limiter, metrics=metrics or ApiMetrics(),
+                          coalesce=config.get("coalesce_requests", True), **options)
+
+
+def build_detail_cache(config):
+    return TTLCache(ttl=config.get("detail_cache_ttl", DEFAULT_DETAIL_TTL),
+                    max_entries=config.get("detail_cache_size", DEFAULT_DETAIL_CACHE_SIZE))
+
+
+def account_profiles(config):
+    """(name, settings) for every entry of config["accounts"]
+
+    Each profile has its own name, api_key and api_secret and inherits every
+    other top-level setting unless it sets its own (base_url, rate_limit_rps,
+    pool_size, ...). Raises ValueError for a malformed list.
+    """
+    accounts = config.get("accounts")
+    if not isinstance(accounts, list) or not accounts:
+        raise ValueError('"accounts" must be a non-empty list of {"name", "api_key", "api_secret"} objects')
+    shared = {key: value for key, value in config.items() if key not in ACCOUNT_OWN_KEYS}
+    profiles = []
+    for position, profile in enumerate(accounts, 1):
+        name = profile.get("name") if isinstance(profile, dict) else None
+        if not name or not isinstance(name, str):
+            raise ValueError(f"account #{position} has no name")
+        if any(name == other for other, _ in profiles):
+            raise ValueError(f"account name {name!r} is used twice")
+        profiles.append((name, dict(shared, **profile)))
+    return profiles
+
+
+def build_fleet(config, names=None):
+    """Build a FleetClient with one client and request budget per account profile
+
+    ``names`` limits it to some of the accounts. The clients share one detail
+    cache and one ApiMetrics. Raises ValueError for a malformed accounts list
+    or an unknown name.
+    """
+    profiles = account_profiles(config)
+    if names:
+        unknown = sorted(set(names) - {name for name, _ in profiles})
+        if unknown:
+            raise ValueError(f"no account named {', '.join(unknown)}")
+        profiles = [(name, profile) for name, profile in profiles if name in names]
+    detail_cache = build_detail_cache(config)
+    metrics = ApiMetrics()
+    clients = {name: build_client(profile, detail_cache=detail_cache, metrics=metrics) for name, profile in profiles}
+    return FleetClient(clients, detail_cache, metrics)
+
+
+def build_classifier(config):
+    """Network classifier with the private_cidrs/public_cidrs from config; raises ValueError for a bad CIDR"""
+    return NetworkClassifier(config.get("private_cidrs", ()), config.get("public_cidrs", ()))
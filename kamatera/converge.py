@@ -0,0 +1,143 @@
+"""Polling servers until they reach a target state"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+DEFAULT_CONVERGE_TIMEOUT = 300.0
+DEFAULT_POLL_INTERVAL = 1.0
+DEFAULT_POLL_MAX_INTERVAL = 15.0
+DEFAULT_POLL_CONCURRENCY = 10
+
+
+def power_is(state):
+    """Predicate for wait_for_servers: the detail reports the given power state"""
+    state = state.lower()
+    return lambda detail: str(detail.get("power") or "").lower() == state
+
+
+class ConvergenceSummary:
+    """Time-to-converge metrics for one wait_for_servers run"""
+
+    def __init__(self, total):
+        self.total = total
+        self.converged = {}
+        self.timed_out = []
+
+    def record(self, server_id, converged, elapsed):
+        if converged:
+            self.converged[server_id] = elapsed
+        else:
+            self.timed_out.append(server_id)
+
+    @property
+    def done(self):
+        return len(self.converged) + len(self.timed_out)
+
+    def percentile(self, fraction):
+        times = sorted(self.converged.values())
+        if not times:
+            return None
+        return times[min(len(times) - 1, int(fraction * len(times)))]
+
+    def as_dict(self):
+        return {
+            "total": self.total,
+            "converged": len(self.converged),
+            "timed_out": list(self.timed_out),
+            "p50": self.percentile(0.5),
+            "p95": self.percentile(0.95),
+            "max": self.percentile(1.0),
+        }
+
+
+def _wait(seconds, stop, clock):
+    """Sleep in short slices so a stop request is noticed promptly"""
+    end = clock() + seconds
+    while not (stop and stop()):
+        remaining = end - clock()
+        if remaining <= 0:
+            return True
+        time.sleep(min(remaining, 0.25))
+    return False
+
+
+def poll_server(client, server_id, predicate, timeout=DEFAULT_CONVERGE_TIMEOUT, interval=DEFAULT_POLL_INTERVAL,
+                max_interval=DEFAULT_POLL_MAX_INTERVAL, stop=None, clock=time.monotonic):
+    """Poll one server with backoff until predicate(detail) holds
+
+    Returns the matching detail, or None once ``timeout`` passes or ``stop()``
+    becomes true.
+    """
+    deadline = clock() + timeout
+    while not (stop and stop()):
+        try:
+            detail = client.get_server(server_id, False)
+        except requests.exceptions.RequestException:
+            detail = None
+        if isinstance(detail, dict) and predicate(detail):
+            return detail
+        now = clock()
+        # The last sleep is cut short at the deadline, which gets one final poll
+        if now >= deadline or not _wait(min(interval, deadline - now), stop, clock):
+            return None
+        interval = min(interval * 2, max_interval)
+    return None
+
+
+def wait_for_servers(client, server_ids, predicate, timeout=DEFAULT_CONVERGE_TIMEOUT,
+                     max_workers=DEFAULT_POLL_CONCURRENCY, interval=DEFAULT_POLL_INTERVAL,
+                     max_interval=DEFAULT_POLL_MAX_INTERVAL, stop=None, clock=time.monotonic):
+    """Poll GET /server/{id} until predicate(detail) holds for every server
+
+    Each server backs off on its own schedule, doubling its polling interval
+    up to ``max_interval``, and at most ``max_workers`` requests run at once.
+    Yields (server_id, converged, elapsed, detail) as soon as a server reaches
+    the state, then (server_id, False, elapsed, last_detail) for the ones
+    still pending when ``timeout`` passes. Failed polls count as not yet
+    converged, since a server that is rebooting may not answer. ``stop`` is
+    an optional callable that ends the wait early.
+    """
+    started = clock()
+    deadline = started + timeout
+    # server_id -> [next poll time, current interval, last detail]
+    pending = {server_id: [started, interval, None] for server_id in server_ids}
+    if not pending:
+        return
+
+    executor = ThreadPoolExecutor(max_workers=max(1, min(max_workers, len(pending))),
+                                  thread_name_prefix="kamatera-poll")
+    try:
+        while pending and not (stop and stop()):
+            now = clock()
+            due = [server_id for server_id, state in pending.items() if state[0] <= now]
+            futures = {executor.submit(client.get_server, server_id, False): server_id for server_id in due}
+            for future in as_completed(futures):
+                server_id = futures[future]
+                state = pending[server_id]
+                try:
+                    detail = future.result()
+                except requests.exceptions.RequestException:
+                    detail = None
+                if isinstance(detail, dict):
+                    state[2] = detail
+                    if predicate(detail):
+                        del pending[server_id]
+                        yield server_id, True, clock() - started, detail
+                        continue
+                # No poll is put off past the deadline, which gets one final poll of every server
+                state[0] = min(clock() + state[1], deadline)
+                state[1] = min(state[1] * 2, max_interval)
+
+            if not pending or now >= deadline:
+                break
+            next_poll = min(state[0] for state in pending.values())
+            if not _wait(next_poll - clock(), stop, clock):
+                break
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
+
+    elapsed = clock() - started
+    for server_id, state in pending.items():
+        yield server_id, False, elapsed, state[2]
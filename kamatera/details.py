@@ -0,0 +1,201 @@
+"""Concurrent per-server detail fetching"""
+
+import collections
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+from .networks import DEFAULT_CLASSIFIER
+
+DEFAULT_DETAIL_CONCURRENCY = 10
+DEFAULT_BACKGROUND_CONCURRENCY = 2
+DEFAULT_DETAIL_RETRIES = 2
+
+
+def fetch_server_details(client, server_ids, max_workers=DEFAULT_DETAIL_CONCURRENCY, use_cache=True):
+    """Fetch GET /server/{id} for every id on a bounded worker pool
+
+    Yields (server_id, detail, error) tuples in completion order, so callers can
+    render each server as soon as its response arrives. ``error`` is None on
+    success and the raised RequestException otherwise. use_cache=False bypasses
+    fresh entries in the client's detail cache (the responses still refill it).
+    """
+    server_ids = list(server_ids)
+    if not server_ids:
+        return
+
+    workers = max(1, min(max_workers, len(server_ids)))
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kamatera-detail")
+    try:
+        futures = {executor.submit(client.get_server, server_id, use_cache): server_id
+                   for server_id in server_ids}
+        for future in as_completed(futures):
+            server_id = futures[future]
+            try:
+                yield server_id, future.result(), None
+            except requests.exceptions.RequestException as e:
+                yield server_id, None, e
+    finally:
+        # Closing the generator early (e.g. a cancelled job) drops the queued fetches
+        executor.shutdown(wait=True, cancel_futures=True)
+
+
+class PriorityDetailFetcher:
+    """Fetch server details on demand, the rows someone is looking at first
+
+    want() names the servers needed now, in the order to fetch them (the
+    visible rows, then a prefetch margin); it replaces the previous call's
+    list. Servers that drop out of it before their request started move to
+    background priority, or are cancelled when ``background_workers`` is 0.
+    fill() queues servers at background priority, which uses at
+    most ``background_workers`` of the ``max_workers`` threads so a wanted
+    server never waits behind a long fill. Every server is fetched once until
+    forget() or reset(); requests already on the wire are not interrupted.
+    A failed fetch goes back to the end of the background queue, at most
+    ``retries`` times in a row, and is tried again whenever want() names it.
+
+    results() yields (server_id, detail, error) tuples as fetches complete.
+    """
+
+    def __init__(self, client, max_workers=DEFAULT_DETAIL_CONCURRENCY,
+                 background_workers=DEFAULT_BACKGROUND_CONCURRENCY, use_cache=True, retries=DEFAULT_DETAIL_RETRIES):
+        self.client = client
+        self.max_workers = max(1, max_workers)
+        self.background_workers = max(0, min(background_workers, self.max_workers))
+        self.use_cache = use_cache
+        self.retries = retries
+        self._wanted = []
+        self._background = collections.OrderedDict()
+        self._in_flight = set()
+        self._done = set()
+        # Server id -> failed fetches since its last success
+        self._failures = {}
+        self._background_running = 0
+        self._results = queue.Queue()
+        self._cond = threading.Condition()
+        self._threads = []
+        self._closed = False
+
+    def want(self, server_ids):
+        with self._cond:
+            wanted = [server_id for server_id in dict.fromkeys(server_ids)
+                      if server_id not in self._done and server_id not in self._in_flight]
+            keep = set(wanted)
+            if self.background_workers:
+                for server_id in self._wanted:
+                    if server_id not in keep:
+                        self._background[server_id] = None
+            for server_id in wanted:
+                self._background.pop(server_id, None)
+            self._wanted = wanted
+            self._start()
+
+    def fill(self, server_ids):
+        if not self.background_workers:
+            return
+        with self._cond:
+            wanted = set(self._wanted)
+            for server_id in server_ids:
+                if server_id not in self._done and server_id not in self._in_flight and server_id not in wanted:
+                    self._background[server_id] = None
+            self._start()
+
+    def forget(self, server_ids):
+        """Let these servers be fetched again, e.g. after the listing reported a change"""
+        with self._cond:
+            for server_id in server_ids:
+                self._done.discard(server_id)
+                self._failures.pop(server_id, None)
+
+    def reset(self):
+        """Drop every queued request and forget what was fetched"""
+        with self._cond:
+            self._wanted = []
+            self._background.clear()
+            self._done.clear()
+            self._failures.clear()
+
+    def stats(self):
+        with self._cond:
+            return {
+                "fetched": len(self._done),
+                "wanted": len(self._wanted),
+                "background": len(self._background),
+                "in_flight": len(self._in_flight),
+                "failed": len(self._failures),
+            }
+
+    def results(self, stop=None):
+        """Yield completed fetches until close() or ``stop()``"""
+        while not (stop and stop()):
+            try:
+                result = self._results.get(timeout=0.25)
+            except queue.Empty:
+                if self._closed:
+                    return
+                continue
+            if result is None:
+                return
+            yield result
+
+    def close(self):
+        with self._cond:
+            self._closed = True
+            self._cond.notify_all()
+        self._results.put(None)
+
+    def _start(self):
+        # Called with the lock held; threads are only started once there is work
+        self._cond.notify_all()
+        while len(self._threads) < self.max_workers and not self._closed:
+            thread = threading.Thread(target=self._work, name="kamatera-detail", daemon=True)
+            self._threads.append(thread)
+            thread.start()
+
+    def _next(self):
+        if self._wanted:
+            return self._wanted.pop(0), False
+        if self._background and self._background_running < self.background_workers:
+            return self._background.popitem(last=False)[0], True
+        return None, False
+
+    def _work(self):
+        while True:
+            with self._cond:
+                server_id, background = self._next()
+                while server_id is None and not self._closed:
+                    self._cond.wait()
+                    server_id, background = self._next()
+                if self._closed:
+                    return
+                self._in_flight.add(server_id)
+                self._background_running += background
+            try:
+                result = (server_id, self.client.get_server(server_id, self.use_cache), None)
+            except requests.exceptions.RequestException as e:
+                result = (server_id, None, e)
+            with self._cond:
+                self._in_flight.discard(server_id)
+                if result[2] is None:
+                    self._done.add(server_id)
+                    self._failures.pop(server_id, None)
+                else:
+                    # Left out of _done so a transient error does not stick to the row
+                    failures = self._failures[server_id] = self._failures.get(server_id, 0) + 1
+                    if (failures <= self.retries and self.background_workers
+                            and server_id not in self._wanted):
+                        self._background[server_id] = None
+                self._background_running -= background
+                # A background slot came free
+                self._cond.notify_all()
+            self._results.put(result)
+
+
+def extract_ip_and_network_info(detailed_info, classifier=None):
+    """Extract IP address and network type from detailed server information
+
+    Uses ``classifier`` (a NetworkClassifier) or the built-in private ranges.
+    """
+    return (classifier or DEFAULT_CLASSIFIER).classify(detailed_info)
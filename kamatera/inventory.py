@@ -0,0 +1,102 @@
+"""Last-known server inventory persisted in SQLite for instant startup"""
+
+import hashlib
+import sqlite3
+import time
+
+from .records import ServerRecord
+
+INVENTORY_FILE = "inventory.db"
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS servers (
+    id TEXT PRIMARY KEY,
+    position INTEGER NOT NULL,
+    name TEXT,
+    status TEXT,
+    power TEXT,
+    ip TEXT,
+    network TEXT,
+    fetched_at REAL NOT NULL,
+    account TEXT
+);
+CREATE TABLE IF NOT EXISTS meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+"""
+
+
+def account_fingerprint(base_url, api_key):
+    """Identify the account a snapshot belongs to without storing the key itself"""
+    return hashlib.sha256(f"{base_url}|{api_key or ''}".encode()).hexdigest()
+
+
+class InventoryCache:
+    """Snapshot of the server table, one row per server id
+
+    Each call opens its own connection, so the cache can be used from any
+    thread. A snapshot taken for another account is ignored on load.
+    """
+
+    def __init__(self, path=INVENTORY_FILE, account=""):
+        self.path = path
+        self.account = account
+
+    def _connect(self):
+        connection = sqlite3.connect(self.path)
+        connection.executescript(SCHEMA)
+        columns = {row[1] for row in connection.execute("PRAGMA table_info(servers)")}
+        if "account" not in columns:
+            # Snapshots written before multi-account support
+            connection.execute("ALTER TABLE servers ADD COLUMN account TEXT")
+        return connection
+
+    def load(self):
+        """Return [(ServerRecord, fetched_at)] in table order; empty if missing or for another account"""
+        try:
+            connection = self._connect()
+        except sqlite3.Error:
+            return []
+        try:
+            row = connection.execute("SELECT value FROM meta WHERE key = 'account'").fetchone()
+            if row is None or row[0] != self.account:
+                return []
+            rows = connection.execute(
+                "SELECT id, name, status, power, ip, network, account, fetched_at FROM servers "
+                "ORDER BY position").fetchall()
+        except sqlite3.Error:
+            return []
+        finally:
+            connection.close()
+        return [(ServerRecord(server_id, name, status, power, ip, network, account), fetched_at)
+                for server_id, name, status, power, ip, network, account, fetched_at in rows]
+
+    def save(self, servers, fetched_at=None):
+        """Replace the snapshot with the given records in one transaction
+
+        ``fetched_at`` maps server ids to when their data was fetched, so a
+        restored row keeps its age; servers missing from it get the current time.
+        """
+        now = time.time()
+        fetched_at = fetched_at or {}
+        rows = [(server.id, position, server.name, server.status, server.power, server.ip, server.network,
+                 fetched_at.get(server.id, now), server.account)
+                for position, server in enumerate(servers) if server.id]
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute("DELETE FROM servers")
+                connection.executemany("INSERT OR REPLACE INTO servers VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?)", rows)
+                connection.execute("INSERT OR REPLACE INTO meta VALUES ('account', ?)", (self.account,))
+        finally:
+            connection.close()
+        return len(rows)
+
+    def clear(self):
+        connection = self._connect()
+        try:
+            with connection:
+                connection.execute("DELETE FROM servers")
+        finally:
+            connection.close()
@@ -0,0 +1,242 @@
+"""Incremental consumption of the GET /servers listing"""
+
+import codecs
+import json
+import queue
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import urljoin
+
+import requests
+
+from .details import DEFAULT_DETAIL_CONCURRENCY
+from .records import ServerRecord
+
+DEFAULT_LISTING_CHUNK = 200
+LISTING_READ_SIZE = 64 * 1024
+
+# Envelope keys the list of servers may be wrapped in, tried in order
+LIST_KEYS = ("servers", "items", "data")
+NEXT_LINK_KEYS = ("next", "next_url", "nextPage")
+NEXT_CURSOR_KEYS = ("next_cursor", "nextCursor")
+TOTAL_PAGES_KEYS = ("total_pages", "totalPages", "pages")
+
+# stream_inventory() event kinds
+LISTED = "listed"
+DETAIL = "detail"
+_LISTING_DONE = "listing done"
+_LISTING_FAILED = "listing failed"
+
+_WHITESPACE = " \t\r\n"
+_NUMBER_CHARS = "0123456789+-.eE"
+# iter_json_array() parser states
+_FIRST = "first"
+_ELEMENT = "element"
+_SEPARATOR = "separator"
+
+
+def iter_json_array(chunks):
+    """Parse a top-level JSON array incrementally from an iterable of bytes
+
+    Yields a list of the elements completed by each chunk (possibly empty), so
+    callers can render rows while the rest of the body is still on the wire.
+    Raises ValueError when the document is not an array, when a ',' between
+    elements is missing or repeated (naming the character offset), or when it
+    ends early.
+    """
+    decoder = json.JSONDecoder()
+    text = codecs.getincrementaldecoder("utf-8")()
+    buffer = ""
+    # Characters already dropped from the front of buffer, for error offsets
+    offset = 0
+    started = False
+    # What may come next: the first element or "]", an element after ",", or "," / "]" after an element
+    expect = _FIRST
+    for chunk in chunks:
+        buffer += text.decode(chunk)
+        items = []
+        pos = 0
+        while True:
+            while pos < len(buffer) and buffer[pos] in _WHITESPACE:
+                pos += 1
+            if pos >= len(buffer):
+                break
+            char = buffer[pos]
+            if not started:
+                if char != "[":
+                    raise ValueError("the listing is not a JSON array")
+                started = True
+                pos += 1
+            elif expect == _SEPARATOR:
+                if char == "]":
+                    yield items
+                    return
+                if char != ",":
+                    raise ValueError(f"missing ',' between elements at character {offset + pos}")
+                expect = _ELEMENT
+                pos += 1
+            elif char == "]" and expect == _FIRST:
+                yield items
+                return
+            elif char in ",]":
+                raise ValueError(f"expected an element, not {char!r}, at character {offset + pos}")
+            else:
+                try:
+                    item, end = decoder.raw_decode(buffer, pos)
+                except json.JSONDecodeError:
+                    # The element continues in the next chunk
+                    break
+                if isinstance(item, (int, float)) and not isinstance(item, bool):
+                    run = pos
+                    while run < len(buffer) and buffer[run] in _NUMBER_CHARS:
+                        run += 1
+                    if run >= len(buffer):
+                        # A number cut by the chunk boundary (e.g. "2." of "2.5") could still grow
+                        break
+                items.append(item)
+                expect = _SEPARATOR
+                pos = end
+        buffer = buffer[pos:]
+        offset += pos
+        yield items
+    raise ValueError("the listing ended before its closing bracket")
+
+
+def next_page(envelope, url, params):
+    """Return (url, params) for the page after ``envelope``, or None on the last page
+
+    Understands a next link, a next cursor and page/total_pages counters.
+    """
+    for key in NEXT_LINK_KEYS:
+        link = envelope.get(key)
+        if isinstance(link, str) and link:
+            return urljoin(url, link), None
+    for key in NEXT_CURSOR_KEYS:
+        cursor = envelope.get(key)
+        if cursor:
+            return url, dict(params or {}, cursor=cursor)
+    page = envelope.get("page")
+    total = next((envelope[key] for key in TOTAL_PAGES_KEYS if key in envelope), None)
+    if isinstance(page, int) and isinstance(total, int) and page < total:
+        return url, dict(params or {}, page=page + 1)
+    return None
+
+
+class ListingPages:
+    """The pages of one GET /servers listing, for the threaded and the asyncio client alike
+
+    Iterating yields the (url, params) of each page to request. After reading
+    a page, call follow() with its envelope and Link rel="next" target, or
+    the page is taken as the last one::
+
+        pages = ListingPages(f"{base_url}/servers")
+        for url, params in pages:
+            ...
+            pages.follow(envelope, link, response_url)
+    """
+
+    def __init__(self, url, params=None):
+        self._next = (url, params)
+        self._current = None
+        self._seen = set()
+
+    def __iter__(self):
+        while self._next is not None:
+            self._current, self._next = self._next, None
+            self._seen.add(_page_key(*self._current))
+            yield self._current
+
+    def follow(self, envelope=None, link=None, base=None):
+        """Queue the page after the current one, if ``link`` or ``envelope`` names one
+
+        A relative ``link`` is resolved against ``base`` (the URL the page
+        came from), else the requested URL; it wins over the envelope.
+        """
+        url, params = self._current
+        if link:
+            following = urljoin(base or url, str(link)), None
+        elif envelope is not None:
+            following = next_page(envelope, url, params)
+        else:
+            following = None
+        # A page pointing back at one already read would loop forever
+        if following is not None and _page_key(*following) not in self._seen:
+            self._next = following
+
+
+def _page_key(url, params):
+    return url, tuple(sorted((params or {}).items()))
+
+
+def unwrap_envelope(payload):
+    """Split a page into (servers, envelope); envelope is None for a bare list"""
+    if isinstance(payload, dict):
+        for key in LIST_KEYS:
+            if key in payload:
+                return payload[key], payload
+        return payload, None
+    return payload, None
+
+
+def stream_inventory(client, max_workers=DEFAULT_DETAIL_CONCURRENCY, chunk_size=DEFAULT_LISTING_CHUNK,
+                     use_cache=False, details=True, stop=None):
+    """List every server and fetch its detail in one overlapping pass
+
+    Yields (LISTED, [ServerRecord, ...]) for each chunk of the listing as soon
+    as it is parsed, then (DETAIL, (server_id, detail, error)) as the details
+    arrive. The details of a chunk are requested right after it is yielded,
+    while later chunks and pages are still being read, on at most
+    ``max_workers`` threads. details=False only streams the listing. A failed
+    listing raises its RequestException once the chunks read so far are out.
+    """
+    events = queue.Queue()
+    closed = threading.Event()
+    executor = ThreadPoolExecutor(max_workers=max(1, max_workers), thread_name_prefix="kamatera-detail")
+
+    def fetch(server_id):
+        if closed.is_set():
+            return
+        try:
+            events.put((DETAIL, (server_id, client.get_server(server_id, use_cache), None)))
+        except requests.exceptions.RequestException as e:
+            events.put((DETAIL, (server_id, None, e)))
+
+    def read_listing():
+        try:
+            for chunk in client.iter_servers(chunk_size):
+                if closed.is_set() or (stop and stop()):
+                    break
+                records = [ServerRecord.from_listing(server) for server in chunk]
+                events.put((LISTED, records))
+                if details:
+                    for record in records:
+                        if record.id:
+                            executor.submit(fetch, record.id)
+        except requests.exceptions.RequestException as e:
+            events.put((_LISTING_FAILED, e))
+        except RuntimeError:
+            # The executor was shut down because the caller stopped consuming
+            pass
+        finally:
+            events.put((_LISTING_DONE, None))
+
+    reader = threading.Thread(target=read_listing, name="kamatera-listing", daemon=True)
+    reader.start()
+    try:
+        listing_done = False
+        expected = received = 0
+        while not listing_done or received < expected:
+            kind, payload = events.get()
+            if kind == _LISTING_DONE:
+                listing_done = True
+                continue
+            if kind == _LISTING_FAILED:
+                raise payload
+            if kind == LISTED and details:
+                expected += sum(1 for record in payload if record.id)
+            elif kind == DETAIL:
+                received += 1
+            yield kind, payload
+    finally:
+        closed.set()
+        executor.shutdown(wait=True, cancel_futures=True)
@@ -0,0 +1,177 @@
+"""Per-endpoint request metrics with a Prometheus textfile export"""
+
+import bisect
+import collections
+import os
+import tempfile
+import threading
+from urllib.parse import urlsplit
+
+# Histogram bucket upper bounds in seconds, as exported to Prometheus
+LATENCY_BUCKETS = (0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+# Latest latencies kept per endpoint for the percentiles
+DEFAULT_LATENCY_SAMPLES = 2048
+DEFAULT_METRICS_TEXTFILE_INTERVAL = 15.0
+
+# Path segments followed by an identifier that varies per request
+ID_SEGMENTS = frozenset({"server"})
+
+
+def endpoint_template(url, base_url=""):
+    """Reduce a request URL to its endpoint template, e.g. /server/{id}/power"""
+    if base_url and url.startswith(base_url):
+        url = url[len(base_url):]
+    path = urlsplit(url).path
+    base_path = urlsplit(base_url).path.rstrip("/")
+    if base_path and path.startswith(base_path + "/"):
+        # Absolute pagination links carry the base path too
+        path = path[len(base_path):]
+    segments = path.split("/")
+    for i in range(1, len(segments)):
+        if segments[i - 1] in ID_SEGMENTS and segments[i]:
+            segments[i] = "{id}"
+    return "/".join(segments) or "/"
+
+
+class EndpointStats:
+    """Counters and latency distribution for one method and endpoint template"""
+
+    __slots__ = ("count", "statuses", "errors", "buckets", "total_seconds", "samples")
+
+    def __init__(self, samples):
+        self.count = 0
+        self.statuses = collections.Counter()
+        self.errors = collections.Counter()
+        # One count per bucket plus the +Inf overflow, not cumulative
+        self.buckets = [0] * (len(LATENCY_BUCKETS) + 1)
+        self.total_seconds = 0.0
+        self.samples = collections.deque(maxlen=samples)
+
+    def percentile(self, fraction):
+        times = sorted(self.samples)
+        if not times:
+            return None
+        return times[min(len(times) - 1, int(fraction * len(times)))]
+
+
+class ApiMetrics:
+    """Thread-safe request metrics keyed by (method, endpoint template)
+
+    Every HTTP attempt is recorded, retries included, with its status code
+    or, when no response came back, the class name of the error. Latency is
+    the time until the response headers arrived. Reads that joined an
+    identical request already in flight instead of sending their own are
+    counted separately as deduplicated.
+    """
+
+    def __init__(self, samples=DEFAULT_LATENCY_SAMPLES):
+        self.samples = samples
+        self._endpoints = {}
+        self._deduplicated = collections.Counter()
+        self._lock = threading.Lock()
+
+    def record(self, method, endpoint, seconds, status=None, error=None):
+        with self._lock:
+            stats = self._endpoints.get((method, endpoint))
+            if stats is None:
+                stats = self._endpoints[(method, endpoint)] = EndpointStats(self.samples)
+            stats.count += 1
+            if status is not None:
+                stats.statuses[status] += 1
+            if error is not None:
+                stats.errors[type(error).__name__] += 1
+            stats.buckets[bisect.bisect_left(LATENCY_BUCKETS, seconds)] += 1
+            stats.total_seconds += seconds
+            stats.samples.append(seconds)
+
+    def record_deduplicated(self, method, endpoint):
+        with self._lock:
+            self._deduplicated[(method, endpoint)] += 1
+
+    def reset(self):
+        with self._lock:
+            self._endpoints.clear()
+            self._deduplicated.clear()
+
+    def snapshot(self):
+        """One dict per endpoint, sorted by endpoint then method; latencies in seconds"""
+        with self._lock:
+            rows = []
+            for (method, endpoint), stats in sorted(self._endpoints.items(), key=lambda item: item[0][::-1]):
+                failed = sum(stats.errors.values()) + sum(n for status, n in stats.statuses.items() if status >= 400)
+                rows.append({
+                    "method": method,
+                    "endpoint": endpoint,
+                    "count": stats.count,
+                    "deduplicated": self._deduplicated[(method, endpoint)],
+                    "failed": failed,
+                    "statuses": dict(stats.statuses),
+                    "errors": dict(stats.errors),
+                    "mean": stats.total_seconds / stats.count,
+                    "p50": stats.percentile(0.5),
+                    "p95": stats.percentile(0.95),
+                    "p99": stats.percentile(0.99),
+                })
+            return rows
+
+    def prometheus(self):
+        """The metrics in the Prometheus text exposition format"""
+        with self._lock:
+            endpoints = sorted(self._endpoints.items())
+            lines = [
+                "# HELP kamatera_api_requests_total Kamatera API responses by endpoint template and status code.",
+                "# TYPE kamatera_api_requests_total counter",
+            ]
+            for (method, endpoint), stats in endpoints:
+                for status, count in sorted(stats.statuses.items()):
+                    lines.append(f"kamatera_api_requests_total{_labels(method, endpoint, status=status)} {count}")
+            lines += [
+                "# HELP kamatera_api_errors_total Kamatera API requests that got no response, by error class.",
+                "# TYPE kamatera_api_errors_total counter",
+            ]
+            for (method, endpoint), stats in endpoints:
+                for error, count in sorted(stats.errors.items()):
+                    lines.append(f"kamatera_api_errors_total{_labels(method, endpoint, error=error)} {count}")
+            lines += [
+                "# HELP kamatera_api_request_duration_seconds Time until the Kamatera API response headers arrived.",
+                "# TYPE kamatera_api_request_duration_seconds histogram",
+            ]
+            for (method, endpoint), stats in endpoints:
+                cumulative = 0
+                for bound, count in zip(LATENCY_BUCKETS + ("+Inf",), stats.buckets):
+                    cumulative += count
+                    lines.append(f"kamatera_api_request_duration_seconds_bucket{_labels(method, endpoint, le=bound)} "
+                                 f"{cumulative}")
+                labels = _labels(method, endpoint)
+                lines.append(f"kamatera_api_request_duration_seconds_sum{labels} {stats.total_seconds:.6f}")
+                lines.append(f"kamatera_api_request_duration_seconds_count{labels} {stats.count}")
+            lines += [
+                "# HELP kamatera_api_deduplicated_total Kamatera API reads served by an identical request in flight.",
+                "# TYPE kamatera_api_deduplicated_total counter",
+            ]
+            for (method, endpoint), count in sorted(self._deduplicated.items()):
+                lines.append(f"kamatera_api_deduplicated_total{_labels(method, endpoint)} {count}")
+        return "\n".join(lines) + "\n"
+
+    def write_textfile(self, path):
+        """Atomically replace ``path`` for the node exporter textfile collector"""
+        directory = os.path.dirname(os.path.abspath(path))
+        # Owns its descriptor from the start, so no failure path can leak it
+        tmp = tempfile.NamedTemporaryFile("w", prefix=".kamatera-metrics-", suffix=".tmp", dir=directory,
+                                          delete=False)
+        try:
+            with tmp:
+                tmp.write(self.prometheus())
+            os.replace(tmp.name, path)
+        except BaseException:
+            os.unlink(tmp.name)
+            raise
+
+
+def _labels(method, endpoint, **extra):
+    pairs = [("method", method), ("endpoint", endpoint)] + list(extra.items())
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in pairs) + "}"
+
+
+def _escape(value):
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
@@ -0,0 +1,173 @@
+"""Classifying server addresses as private or public against precomputed CIDR tables"""
+
+import ipaddress
+import socket
+
+PRIVATE = "Private"
+PUBLIC = "Public"
+UNKNOWN = "Unknown"
+
+# Address space that is not reachable from the internet
+PRIVATE_CIDRS = (
+    # RFC 1918
+    "10.0.0.0/8",
+    "172.16.0.0/12",
+    "192.168.0.0/16",
+    # RFC 6598 carrier-grade NAT
+    "100.64.0.0/10",
+    # RFC 4193 unique local IPv6
+    "fc00::/7",
+)
+
+# NIC name fragments that settle the type of every address on the NIC
+NAME_HINTS = (("private", PRIVATE), ("local", PRIVATE), ("public", PUBLIC), ("internet", PUBLIC))
+# Flat address fields tried, in order, when a payload has no usable networks
+IP_FIELDS = ("ip", "ipAddress", "primaryIP", "publicIP", "privateIP")
+
+DEFAULT_CLASSIFIER_MEMO_SIZE = 65536
+
+_MISSING = object()
+
+
+def name_hint(name):
+    """PRIVATE or PUBLIC when a NIC or field name says so, else None"""
+    name = str(name).lower()
+    for fragment, label in NAME_HINTS:
+        if fragment in name:
+            return label
+    return None
+
+
+def parse_ip(address):
+    """(IP version, address as an int), or None when the string is not an IP address
+
+    inet_pton is strict: no leading zeros, short forms or surrounding blanks.
+    """
+    try:
+        return 4, int.from_bytes(socket.inet_pton(socket.AF_INET, address), "big")
+    except OSError:
+        pass
+    try:
+        return 6, int.from_bytes(socket.inet_pton(socket.AF_INET6, address), "big")
+    except OSError:
+        return None
+
+
+class NetworkClassifier:
+    """Longest-prefix match of addresses against CIDR tables built once
+
+    The built-in PRIVATE_CIDRS plus ``private_cidrs`` are private and
+    ``public_cidrs`` are public; the most specific prefix wins, so a public
+    range can be carved out of 10.0.0.0/8. Addresses outside every range are
+    public. Each table holds one dict per prefix length keyed by the network
+    bits, so a lookup is a few dict probes. Results are memoized per address
+    string, up to ``memo_size`` addresses. Raises ValueError for an invalid
+    CIDR.
+    """
+
+    def __init__(self, private_cidrs=(), public_cidrs=(), memo_size=DEFAULT_CLASSIFIER_MEMO_SIZE):
+        # IP version -> {prefix length: {network bits: label}}
+        self._tables = {4: {}, 6: {}}
+        for cidr in PRIVATE_CIDRS + tuple(private_cidrs):
+            self._add(cidr, PRIVATE)
+        for cidr in public_cidrs:
+            self._add(cidr, PUBLIC)
+        # Probe the longest prefixes first
+        self._probes = {
+            version: [(max_bits - length, table[length]) for length in sorted(table, reverse=True)]
+            for version, max_bits, table in ((4, 32, self._tables[4]), (6, 128, self._tables[6]))
+        }
+        self.memo_size = memo_size
+        self._memo = {}
+        # NIC name -> name_hint(); a fleet has a handful of distinct names
+        self._hints = {}
+
+    def _add(self, cidr, label):
+        network = ipaddress.ip_network(str(cidr).strip(), strict=False)
+        host_bits = network.max_prefixlen - network.prefixlen
+        self._tables[network.version].setdefault(network.prefixlen, {})[
+            int(network.network_address) >> host_bits] = label
+
+    def classify_ip(self, address):
+        """PRIVATE or PUBLIC for an address string, None when it is not an IP address"""
+        label = self._memo.get(address, _MISSING)
+        if label is _MISSING:
+            label = self._lookup(address)
+            if len(self._memo) >= self.memo_size:
+                self._memo.clear()
+            self._memo[address] = label
+        return label
+
+    def _lookup(self, address):
+        parsed = parse_ip(address)
+        if parsed is None:
+            # An address may come with its prefix length, e.g. "10.0.0.5/24"
+            parsed = parse_ip(address.split("/", 1)[0].strip())
+            if parsed is None:
+                return None
+        version, value = parsed
+        for host_bits, table in self._probes[version]:
+            label = table.get(value >> host_bits)
+            if label is not None:
+                return label
+        return PUBLIC
+
+    def classify(self, detail):
+        """(ip, network type) of a GET /server/{id} payload, looking at every address on every NIC
+
+        A server is Public when any NIC has a public address and Private when
+        all its addresses are private; the ip is the first address of that
+        kind. A NIC whose name says private/local or public/internet decides
+        for all its addresses, the rest go through the CIDR tables. Payloads
+        without networks fall back to the flat ip fields. Returns
+        ("N/A", "Unknown") when there is no address at all.
+        """
+        if not isinstance(detail, dict):
+            return "N/A", UNKNOWN
+        private = unknown = None
+        memo = self._memo
+        hints = self._hints
+        networks = detail.get("networks")
+        if isinstance(networks, list):
+            for network in networks:
+                if not isinstance(network, dict):
+                    continue
+                ips = network.get("ips")
+                if not isinstance(ips, list):
+                    continue
+                name = network.get("name")
+                hint = None
+                if isinstance(name, str):
+                    hint = hints.get(name, _MISSING)
+                    if hint is _MISSING:
+                        hint = hints[name] = name_hint(name)
+                for address in ips:
+                    if not address or not isinstance(address, str):
+                        continue
+                    label = hint or memo.get(address) or self.classify_ip(address)
+                    if label is PUBLIC:
+                        # The first public address settles it
+                        return address, PUBLIC
+                    if label is PRIVATE:
+                        private = private or address
+                    else:
+                        unknown = unknown or address
+        if private is None and unknown is None:
+            for field in IP_FIELDS:
+                address = detail.get(field)
+                if address and isinstance(address, str):
+                    return address, name_hint(field) or self.classify_ip(address) or UNKNOWN
+            return "N/A", UNKNOWN
+        if private is not None:
+            return private, PRIVATE
+        return unknown, UNKNOWN
+
+    def classify_many(self, details):
+        """Classify a whole inventory: {server_id: detail} or (server_id, detail) pairs -> {server_id: (ip, type)}"""
+        items = details.items() if isinstance(details, dict) else details
+        classify = self.classify
+        return {server_id: classify(detail) for server_id, detail in items}
+
+
+# Built-in ranges only, for callers without a config
+DEFAULT_CLASSIFIER = NetworkClassifier()
@@ -0,0 +1,73 @@
+"""Concurrent bulk power actions"""
+
+import time
+from concurrent.futures import ThreadPoolExecutor, as_completed
+
+import requests
+
+DEFAULT_POWER_CONCURRENCY = 10
+
+
+class PowerSummary:
+    """Outcome of one bulk power action, filled in as results arrive"""
+
+    def __init__(self, action, total):
+        self.action = action
+        self.total = total
+        self.succeeded = []
+        self.failed = {}
+        self._started = time.monotonic()
+        self.elapsed = 0.0
+
+    def record(self, server_id, result, error):
+        """Count one server; returns True when its power command was accepted"""
+        self.elapsed = time.monotonic() - self._started
+        if error is None and result:
+            self.succeeded.append(server_id)
+            return True
+        self.failed[server_id] = str(error) if error is not None else "empty response"
+        return False
+
+    @property
+    def success_count(self):
+        return len(self.succeeded)
+
+    @property
+    def done(self):
+        return len(self.succeeded) + len(self.failed)
+
+    def as_dict(self):
+        return {
+            "action": self.action,
+            "total": self.total,
+            "succeeded": list(self.succeeded),
+            "failed": dict(self.failed),
+            "skipped": self.total - self.done,
+            "elapsed": self.elapsed,
+        }
+
+
+def set_power_many(client, server_ids, action, max_workers=DEFAULT_POWER_CONCURRENCY):
+    """Send PUT /server/{id}/power for every id on a bounded worker pool
+
+    Yields (server_id, result, error) tuples in completion order; ``error`` is
+    None on success and the raised RequestException otherwise. Closing the
+    generator early drops the commands that have not been sent yet.
+    """
+    server_ids = list(server_ids)
+    if not server_ids:
+        return
+
+    workers = max(1, min(max_workers, len(server_ids)))
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kamatera-power")
+    try:
+        futures = {executor.submit(client.set_power, server_id, action): server_id
+                   for server_id in server_ids}
+        for future in as_completed(futures):
+            server_id = futures[future]
+            try:
+                yield server_id, future.result(), None
+            except requests.exceptions.RequestException as e:
+                yield server_id, None, e
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)
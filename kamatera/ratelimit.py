@@ -0,0 +1,106 @@
+"""Client-wide token bucket that paces API requests and absorbs 429s"""
+
+import threading
+import time
+from email.utils import parsedate_to_datetime
+
+DEFAULT_RATE_LIMIT_RPS = 10.0
+DEFAULT_RATE_LIMIT_BURST = 20
+
+
+def retry_after_seconds(value, default):
+    """Seconds to wait from a Retry-After header (delta-seconds or HTTP date)"""
+    if not value:
+        return default
+    try:
+        return max(0.0, float(value))
+    except ValueError:
+        pass
+    try:
+        return max(0.0, parsedate_to_datetime(value).timestamp() - time.time())
+    except (TypeError, ValueError):
+        return default
+
+
+class TokenBucket:
+    """Thread-safe token bucket shared by every request of a client
+
+    Up to ``burst`` requests go out at once, after which they are spaced
+    ``1 / rate`` seconds apart. Callers that would exceed the budget are
+    queued (they sleep) rather than failed. ``pause()`` holds every caller
+    back until a server-imposed Retry-After has passed.
+    """
+
+    def __init__(self, rate=DEFAULT_RATE_LIMIT_RPS, burst=DEFAULT_RATE_LIMIT_BURST, clock=time.monotonic):
+        self.rate = rate
+        self.burst = max(1, burst)
+        self._clock = clock
+        self._interval = 1.0 / rate
+        # Virtual scheduling: how far ahead of "now" the next request may be booked
+        self._tolerance = (self.burst - 1) * self._interval
+        self._next_slot = clock()
+        self._paused_until = 0.0
+        self._lock = threading.Lock()
+        self.queued = 0
+        self.throttled = 0
+        self.throttle_time = 0.0
+        self.rate_limited = 0
+
+    def reserve(self):
+        """Book the next request slot and return how long to wait for it"""
+        with self._lock:
+            now = self._clock()
+            slot = max(self._next_slot, now, self._paused_until)
+            start = max(now, slot - self._tolerance, self._paused_until)
+            self._next_slot = slot + self._interval
+            delay = start - now
+            if delay > 0:
+                self.throttled += 1
+                self.throttle_time += delay
+            return delay
+
+    def _enter_queue(self):
+        with self._lock:
+            self.queued += 1
+
+    def _leave_queue(self):
+        with self._lock:
+            self.queued -= 1
+
+    def acquire(self):
+        """Block the calling thread until a request may be sent"""
+        delay = self.reserve()
+        if delay > 0:
+            self._enter_queue()
+            try:
+                time.sleep(delay)
+            finally:
+                self._leave_queue()
+
+    async def acquire_async(self):
+        """Coroutine version of acquire() for the asyncio client"""
+        # Imported here so the threaded client and the CLI do not pay for asyncio
+        import asyncio
+        delay = self.reserve()
+        if delay > 0:
+            self._enter_queue()
+            try:
+                await asyncio.sleep(delay)
+            finally:
+                self._leave_queue()
+
+    def pause(self, seconds):
+        """Hold back every request for ``seconds`` after a 429 response"""
+        with self._lock:
+            self.rate_limited += 1
+            self._paused_until = max(self._paused_until, self._clock() + seconds)
+
+    def stats(self):
+        with self._lock:
+            return {
+                "queued": self.queued,
+                "throttled": self.throttled,
+                "throttle_time": self.throttle_time,
+                "rate_limited": self.rate_limited,
+                "paused_for": max(0.0, self._paused_until - self._clock()),
+            }
@@ -0,0 +1,58 @@
+"""Compact server records used in place of raw API dicts"""
+
+import sys
+
+# Listing key under which FleetClient names the account an entry came from; not an API field
+ACCOUNT_KEY = "_account"
+
+
+class ServerRecord:
+    """The handful of server fields the app shows or acts on
+
+    ``__slots__`` keeps each record far smaller than the listing dict it is
+    built from. The full GET /server/{id} payload is never stored on the
+    record; ``detail()`` fetches it on demand through the client, whose detail
+    cache keeps recent payloads bounded. ``account`` is the configured
+    account the server belongs to, None with a single account.
+    """
+    __slots__ = ("id", "name", "status", "power", "ip", "network", "account")
+
+    def __init__(self, server_id, name="Unnamed", status="unknown", power="unknown", ip=None, network=None,
+                 account=None):
+        self.id = server_id
+        self.name = name
+        self.status = status
+        self.power = power
+        # None until the detail payload has been fetched
+        self.ip = ip
+        self.network = network
+        self.account = account
+
+    @classmethod
+    def from_listing(cls, server):
+        """Build a record from one entry of the GET /servers listing"""
+        return cls(
+            server.get("id") or None,
+            server.get("name") or "Unnamed",
+            # A handful of distinct values shared by every server
+            sys.intern(server.get("status") or "unknown"),
+            sys.intern(server.get("power") or "unknown"),
+            account=server.get(ACCOUNT_KEY),
+        )
+
+    def __repr__(self):
+        return (f"ServerRecord(id={self.id!r}, name={self.name!r}, status={self.status!r}, "
+                f"power={self.power!r}, ip={self.ip!r}, network={self.network!r}, account={self.account!r})")
+
+    def as_dict(self):
+        """The record's fields; ``account`` only when the server belongs to a named account"""
+        fields = {slot: getattr(self, slot) for slot in self.__slots__}
+        if fields["account"] is None:
+            del fields["account"]
+        return fields
+
+    def detail(self, client, use_cache=True):
+        """Raw detail payload, loaded lazily (and cached) by the client"""
+        if self.id is None:
+            return None
+        return client.get_server(self.id, use_cache)
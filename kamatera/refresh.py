@@ -0,0 +1,77 @@
+"""Adaptive background refresh: poll the listing, fetch details only for what changed"""
+
+from .details import DEFAULT_DETAIL_CONCURRENCY, fetch_server_details
+from .listing import DETAIL, LISTED
+from .records import ServerRecord
+
+DEFAULT_REFRESH_MIN_INTERVAL = 5.0
+DEFAULT_REFRESH_MAX_INTERVAL = 300.0
+
+# Status or power values of a server that is about to change on its own
+TRANSITIONAL_STATES = frozenset({
+    "pending", "starting", "stopping", "restarting", "rebooting", "booting", "shutting down",
+    "provisioning", "creating", "building", "deleting", "migrating", "resizing",
+})
+
+
+def server_fingerprint(server):
+    """The listing fields whose change warrants a detail fetch and a repaint"""
+    return server.name, server.status, server.power
+
+
+def is_transitional(server):
+    return (str(server.status).lower() in TRANSITIONAL_STATES
+            or str(server.power).lower() in TRANSITIONAL_STATES)
+
+
+def changed_servers(fingerprints, servers):
+    """Ids in a fresh listing that are new or whose fingerprint differs from ``fingerprints``"""
+    return [server.id for server in servers
+            if server.id and fingerprints.get(server.id) != server_fingerprint(server)]
+
+
+class RefreshSchedule:
+    """Polling interval that follows how settled the fleet is
+
+    While any server is in a transitional state, or the last poll found a
+    change, the next poll comes after ``min_interval``. Each quiet poll
+    doubles the interval up to ``max_interval``, so an idle fleet costs one
+    listing request every few minutes.
+    """
+
+    def __init__(self, min_interval=DEFAULT_REFRESH_MIN_INTERVAL, max_interval=DEFAULT_REFRESH_MAX_INTERVAL):
+        self.min_interval = max(0.1, min_interval)
+        self.max_interval = max(self.min_interval, max_interval)
+        self.interval = self.min_interval
+
+    def update(self, changed, transitional):
+        """Record the outcome of a poll and return the delay before the next one"""
+        if changed or transitional:
+            self.interval = self.min_interval
+        else:
+            self.interval = min(self.interval * 2, self.max_interval)
+        return self.interval
+
+    def reset(self):
+        self.interval = self.min_interval
+
+
+def refresh_inventory(client, fingerprints, max_workers=DEFAULT_DETAIL_CONCURRENCY, details=True, stop=None):
+    """List the servers and fetch fresh details only for the ones that changed
+
+    ``fingerprints`` maps server id to server_fingerprint() for every server
+    whose details are already known; any other server counts as changed.
+    Yields (LISTED, ([ServerRecord, ...], changed_ids)) once, then
+    (DETAIL, (server_id, detail, error)) for each changed server in
+    completion order. details=False only reports which servers changed.
+    Listing errors propagate.
+    """
+    servers = [ServerRecord.from_listing(server) for server in client.list_servers()]
+    changed = changed_servers(fingerprints, servers)
+    yield LISTED, (servers, changed)
+    if not details or (stop and stop()):
+        return
+    for result in fetch_server_details(client, changed, max_workers, use_cache=False):
+        yield DETAIL, result
+        if stop and stop():
+            return
@@ -0,0 +1,128 @@
+"""Collapsing concurrent identical reads into one request"""
+
+import json
+import threading
+
+
+def flight_key(url, params=None):
+    """Identity of a GET: requests with the same key get the same response"""
+    return url, json.dumps(params, sort_keys=True, default=str) if params else ""
+
+
+def _cancelling():
+    """Whether the current task itself was asked to cancel (Python 3.11+; assumed not before)"""
+    import asyncio
+    task = asyncio.current_task()
+    return bool(task is not None and hasattr(task, "cancelling") and task.cancelling())
+
+
+class _Call:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self):
+        self.done = threading.Event()
+        self.value = None
+        self.error = None
+
+
+class SingleFlight:
+    """One call per key at a time; callers that arrive meanwhile share its outcome
+
+    do(key, fn) runs fn() unless a call for ``key`` is already in flight, in
+    which case it waits for that call and returns its value or raises its
+    exception. forget(key) lets the next caller start a fresh call while the
+    current one is still running, e.g. after a write made its result stale.
+    ``calls`` counts the calls that ran, ``shared`` the callers that joined one.
+    """
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._flights = {}
+        self._lock = threading.Lock()
+
+    def do(self, key, fn):
+        """Return (value, shared) where shared tells whether another caller's call was joined"""
+        with self._lock:
+            call = self._flights.get(key)
+            leader = call is None
+            if leader:
+                call = self._flights[key] = _Call()
+                self.calls += 1
+            else:
+                self.shared += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value, True
+
+        try:
+            call.value = fn()
+        except BaseException as e:
+            call.error = e
+            raise
+        finally:
+            with self._lock:
+                if self._flights.get(key) is call:
+                    del self._flights[key]
+            call.done.set()
+        return call.value, False
+
+    def forget(self, key):
+        with self._lock:
+            self._flights.pop(key, None)
+
+    def stats(self):
+        with self._lock:
+            return {"calls": self.calls, "shared": self.shared, "in_flight": len(self._flights)}
+
+
+class AsyncSingleFlight:
+    """SingleFlight for coroutines running on one event loop"""
+
+    def __init__(self):
+        self.calls = 0
+        self.shared = 0
+        self._flights = {}
+
+    async def do(self, key, coro_fn):
+        """Return (value, shared); coro_fn() is only awaited when no call for ``key`` is in flight"""
+        # Imported here so the threaded client and the CLI do not pay for asyncio
+        import asyncio
+        future = self._flights.get(key)
+        while future is not None:
+            self.shared += 1
+            try:
+                # A cancelled waiter must not cancel the call the others are waiting on
+                return await asyncio.shield(future), True
+            except asyncio.CancelledError:
+                if not future.cancelled() or _cancelling():
+                    raise
+            # The caller that made the call was cancelled; make or join a fresh one
+            future = self._flights.get(key)
+
+        future = self._flights[key] = asyncio.get_running_loop().create_future()
+        self.calls += 1
+        try:
+            value = await coro_fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as e:
+            future.set_exception(e)
+            # Retrieved here, so a failure nobody else waited for is not reported as unhandled
+            future.exception()
+            raise
+        else:
+            future.set_result(value)
+        finally:
+            if self._flights.get(key) is future:
+                del self._flights[key]
+        return value, False
+
+    def forget(self, key):
+        self._flights.pop(key, None)
+
+    def stats(self):
+        return {"calls": self.calls, "shared": self.shared, "in_flight": len(self._flights)}
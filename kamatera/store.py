@@ -0,0 +1,115 @@
+"""Ordered server inventory with id indexes and a selection set"""
+
+
+class ServerStore:
+    """Holds the servers in display order with O(1) lookups by key
+
+    ``keys`` and ``servers`` are parallel lists in row order; ``by_key`` maps a
+    key to its record and ``rows`` maps it to its row. The selection is a set
+    of keys, or everything minus an exclusion set after ``select_all()``, so
+    selecting or clearing all is O(1) and reading the selection is O(selected).
+    """
+
+    def __init__(self):
+        self.keys = []
+        self.servers = []
+        self.by_key = {}
+        self.rows = {}
+        self._selected = set()
+        self._all_selected = False
+        self._excluded = set()
+
+    def __len__(self):
+        return len(self.keys)
+
+    def __contains__(self, key):
+        return key in self.by_key
+
+    def get(self, key, default=None):
+        return self.by_key.get(key, default)
+
+    def row_of(self, key):
+        return self.rows.get(key)
+
+    # Structural changes; callers run reindex() once they are done
+
+    def remove_rows(self, first, last):
+        for key in self.keys[first:last + 1]:
+            del self.by_key[key]
+            self._selected.discard(key)
+            self._excluded.discard(key)
+        del self.keys[first:last + 1]
+        del self.servers[first:last + 1]
+
+    def insert_rows(self, first, keys, servers):
+        self.keys[first:first] = keys
+        self.servers[first:first] = servers
+        self.by_key.update(zip(keys, servers))
+        if self._all_selected:
+            # New rows start unselected even while "select all" is active
+            self._excluded.update(keys)
+
+    def append_rows(self, keys, servers):
+        """Add rows at the end, keeping the row index current without a full reindex()"""
+        first = len(self.keys)
+        self.insert_rows(first, keys, servers)
+        self.rows.update((key, row) for row, key in enumerate(keys, first))
+
+    def reorder(self, keys):
+        """Put the existing keys into a new order"""
+        self.keys = list(keys)
+        self.servers = [self.by_key[key] for key in self.keys]
+
+    def replace(self, row, server):
+        self.servers[row] = server
+        self.by_key[self.keys[row]] = server
+
+    def reindex(self):
+        self.rows = {key: row for row, key in enumerate(self.keys)}
+
+    # Selection
+
+    def is_selected(self, key):
+        if self._all_selected:
+            return key not in self._excluded
+        return key in self._selected
+
+    def set_selected(self, key, selected):
+        if key not in self.by_key:
+            return
+        if self._all_selected:
+            if selected:
+                self._excluded.discard(key)
+            else:
+                self._excluded.add(key)
+        elif selected:
+            self._selected.add(key)
+        else:
+            self._selected.discard(key)
+
+    def select_all(self):
+        self._all_selected = True
+        self._excluded = set()
+        self._selected = set()
+
+    def clear_selection(self):
+        self._all_selected = False
+        self._excluded = set()
+        self._selected = set()
+
+    @property
+    def selection_count(self):
+        if self._all_selected:
+            return len(self.keys) - len(self._excluded)
+        return len(self._selected)
+
+    def selected_keys(self):
+        """Selected keys in row order"""
+        if self._all_selected:
+            if not self._excluded:
+                return list(self.keys)
+            return [key for key in self.keys if key not in self._excluded]
+        return sorted(self._selected, key=self.rows.__getitem__)
+
+    def selected_servers(self):
+        return [self.by_key[key] for key in self.selected_keys()]
@@ -0,0 +1,132 @@
+"""Per-server network switch pipeline"""
+
+import queue
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+
+from .converge import DEFAULT_CONVERGE_TIMEOUT, poll_server, power_is
+from .networks import DEFAULT_CLASSIFIER
+
+DEFAULT_WORKFLOW_CONCURRENCY = 5
+
+POWERING_OFF = "Powering off"
+WAITING_OFF = "Waiting for off"
+SWITCHING_NETWORK = "Switching network"
+POWERING_ON = "Powering on"
+WAITING_ON = "Waiting for on"
+VERIFYING = "Verifying"
+STAGES = (POWERING_OFF, WAITING_OFF, SWITCHING_NETWORK, POWERING_ON, WAITING_ON, VERIFYING)
+
+DONE = "Done"
+FAILED = "Failed"
+NEEDS_MANUAL = "Needs manual network change"
+CANCELLED = "Cancelled"
+FINAL_STAGES = (DONE, FAILED, NEEDS_MANUAL, CANCELLED)
+
+
+class WorkflowError(Exception):
+    """A server could not complete a stage"""
+
+
+def network_is(target_network, classifier=None):
+    """Verify predicate for run_network_switch: the detail classifies as ``target_network``
+
+    Uses ``classifier`` (a NetworkClassifier) or the built-in private ranges.
+    """
+    target = target_network.lower()
+    classifier = classifier or DEFAULT_CLASSIFIER
+    return lambda detail: classifier.classify(detail)[1].lower() == target
+
+
+def _run_server(client, server_id, target_network, start, verify, timeout, stop, emit):
+    """Drive one server through the stages from ``start`` onwards"""
+    detail = None
+    for stage in STAGES[STAGES.index(start):]:
+        if stop and stop():
+            emit(server_id, CANCELLED, None)
+            return
+        emit(server_id, stage, None)
+        if stage in (POWERING_OFF, POWERING_ON):
+            action = "off" if stage == POWERING_OFF else "on"
+            if not client.set_power(server_id, action):
+                raise WorkflowError(f"power {action} was not accepted")
+        elif stage in (WAITING_OFF, WAITING_ON):
+            state = "off" if stage == WAITING_OFF else "on"
+            detail = poll_server(client, server_id, power_is(state), timeout, stop=stop)
+            if detail is None:
+                if stop and stop():
+                    # The poll ended because of the stop, not the timeout
+                    emit(server_id, CANCELLED, None)
+                    return
+                raise WorkflowError(f"did not power {state} within {timeout:.0f}s")
+        elif stage == SWITCHING_NETWORK:
+            try:
+                accepted = client.change_network(server_id, target_network)
+                reason = "network change was not accepted"
+            except requests.exceptions.RequestException as e:
+                accepted, reason = False, str(e)
+            if not accepted:
+                # Leave the server off so the network can be changed in the console
+                emit(server_id, NEEDS_MANUAL, reason)
+                return
+        elif stage == VERIFYING:
+            if verify is None:
+                detail = client.get_server(server_id, False)
+                continue
+            # The new network may take a while to show up in the detail
+            detail = poll_server(client, server_id, verify, timeout, stop=stop)
+            if detail is None:
+                if stop and stop():
+                    emit(server_id, CANCELLED, None)
+                    return
+                raise WorkflowError(f"network is not {target_network} within {timeout:.0f}s of the switch")
+    emit(server_id, DONE, detail)
+
+
+def _run_guarded(client, server_id, target_network, start, verify, timeout, stop, emit):
+    try:
+        _run_server(client, server_id, target_network, start, verify, timeout, stop, emit)
+    except (WorkflowError, requests.exceptions.RequestException) as e:
+        emit(server_id, FAILED, str(e))
+    except Exception as e:
+        # Every server must end in a final stage or the consumer would wait forever
+        emit(server_id, FAILED, f"unexpected error: {e}")
+
+
+def run_network_switch(client, server_ids, target_network, max_workers=DEFAULT_WORKFLOW_CONCURRENCY,
+                       start=POWERING_OFF, verify=None, timeout=DEFAULT_CONVERGE_TIMEOUT, stop=None):
+    """Switch servers to ``target_network``, each through its own pipeline
+
+    Every server goes power off, wait for off, network change, power on, wait
+    for on, verify, moving to its next stage as soon as its previous one is
+    done, without waiting for the rest of the fleet. At most ``max_workers``
+    servers are in the pipeline at once. ``start`` resumes from a later stage
+    (e.g. POWERING_ON once a manual network change is done) and ``verify`` is
+    an optional predicate on the detail payload, polled for until it holds or
+    ``timeout`` passes.
+
+    Yields (server_id, stage, info) for every stage a server enters. Each
+    server ends with DONE (info is the final detail), FAILED (info is the
+    reason), NEEDS_MANUAL (the API refused the network change; the server is
+    left powered off) or CANCELLED.
+    """
+    server_ids = list(server_ids)
+    if not server_ids:
+        return
+
+    events = queue.Queue()
+    emit = lambda *event: events.put(event)
+    workers = max(1, min(max_workers, len(server_ids)))
+    executor = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="kamatera-workflow")
+    try:
+        for server_id in server_ids:
+            executor.submit(_run_guarded, client, server_id, target_network, start, verify, timeout, stop, emit)
+        finished = 0
+        while finished < len(server_ids):
+            event = events.get()
+            if event[1] in FINAL_STAGES:
+                finished += 1
+            yield event
+    finally:
+        executor.shutdown(wait=True, cancel_futures=True)